@@ -1,22 +1,19 @@
-import cmath
+import sys
+from quadratic import solve_quadratic, main
 
 def root(a,b,c):
-    d= b**2-4*a*c
-    if(d>0 or d<0):
-        sol1=(-b+cmath.sqrt(d))/(2*a)
-        sol2=(-b-cmath.sqrt(d))/(2*a)
-        x1=a*sol1**2+b*sol1+c
-        x2=a*sol2**2+b*sol2+c
-        return (sol1,sol2,x1,x2)
-    if(d==0):
-        sol1=(-b)/(2*a)
-        x1=a*sol1**2+b*sol1+c
-        return (sol1,x1)
+    # 使用 quadratic.solve_quadratic 的穩定公式，d == 0 時同樣回傳兩個(相同的)根
+    roots, residuals = solve_quadratic(a, b, c)
+    sol1, sol2 = roots[0]
+    x1, x2 = residuals[0]
+    return (sol1,sol2,x1,x2)
 
-a = int(input())
-b = int(input())
-c = int(input())
-x1=0
-x2=0
-result = root(a,b,c)
-print(result)
+if len(sys.argv) > 1:
+    # 批次模式: python 2.py coeffs.txt [-o out.txt] [--chunk N]
+    main(sys.argv[1:])
+else:
+    a = int(input())
+    b = int(input())
+    c = int(input())
+    result = root(a,b,c)
+    print(result)
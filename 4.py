@@ -1,4 +1,5 @@
 import numpy as np
+from polyroots import batch_roots
 
 # 根據 P(x) = 2x^5 + 4x^4 - 2x^3 - 4x^2 - 10x + 10
 # 
@@ -22,3 +23,8 @@ print("方法一的解:\n", roots_1)
 # 我們可以使用 [::-1] 語法來反轉陣列
 roots_2 = np.roots(c_user_order[::-1])
 print("\n方法二的解 (與方法一相同):\n", roots_2)
+
+# 方法三：批次求根 (polyroots.batch_roots)
+# 直接接受升冪係數，多個同次數多項式疊成 (N, d+1) 一次求解
+roots_3 = batch_roots([c_user_order, c_numpy_order[::-1]], order="ascending")
+print("\n方法三的解 (批次，每列一個多項式):\n", roots_3)
@@ -1,4 +1,6 @@
-from group_axioms import check_commutative_group, NUM_TEST_CASES
+import numpy as np
+from group_axioms import (check_commutative_group, check_commutative_group_fast, run_parallel,
+                          operation_table, EXHAUSTIVE_MAX_ORDER, NUM_TEST_CASES)
 from field_finite import FiniteField
 
 def check_distributivity(f):
@@ -37,18 +39,88 @@ def check_distributivity(f):
         
     print("  分配律驗證通過！")
 
-def check_field_axioms(f):
-    print(f"=== 開始檢驗有限體 GF({f.p}) ===")
-    
+def _field_order(f):
+    return getattr(f, "order", f.p)
+
+def check_distributivity_exhaustive(f):
+    """窮舉所有 (a, b, c) 檢驗分配律，以加法表與乘法表 (含 0) 廣播計算"""
+    elems = np.asarray(f.add_group.elements())
+    n = elems.size
+    print(f"--- 窮舉檢驗分配律 ({n}^3 組) ---")
+    _, add = operation_table(f.add_group, elems)
+    _, mul = operation_table(f.mul_group, elems)
+    for i in range(n):
+        # 左分配律 a*(b+c) == a*b + a*c
+        lhs = mul[i][add]
+        rhs = add[mul[i][:, None], mul[i][None, :]]
+        bad = np.argwhere(lhs != rhs)
+        assert bad.size == 0, \
+            f"Left distributivity failed: a={elems[i]}, b={elems[bad[0][0]]}, c={elems[bad[0][1]]}"
+        # 右分配律 (a+b)*c == a*c + b*c，此處 i 代表 c
+        lhs = mul[add, i]
+        rhs = add[mul[:, i][:, None], mul[:, i][None, :]]
+        bad = np.argwhere(lhs != rhs)
+        assert bad.size == 0, \
+            f"Right distributivity failed: a={elems[bad[0][0]]}, b={elems[bad[0][1]]}, c={elems[i]}"
+    print("  分配律驗證通過！")
+
+def _random_distributivity_worker(f, seed, count, batch=100_000):
+    """子行程：以獨立亂數流向量化檢驗分配律，回傳第一個反例或 None"""
+    rng = np.random.default_rng(seed)
+    add, mul = f.add_group.operation, f.mul_group.operation
+    done = 0
+    while done < count:
+        m = min(batch, count - done)
+        done += m
+        a, b, c = (f.add_group.sample(rng, m) for _ in range(3))
+        bad = np.flatnonzero(mul(a, add(b, c)) != add(mul(a, b), mul(a, c)))
+        if bad.size:
+            i = bad[0]
+            return f"Left distributivity failed: a={a[i]}, b={b[i]}, c={c[i]}"
+        bad = np.flatnonzero(mul(add(a, b), c) != add(mul(a, c), mul(b, c)))
+        if bad.size:
+            i = bad[0]
+            return f"Right distributivity failed: a={a[i]}, b={b[i]}, c={c[i]}"
+    return None
+
+def check_distributivity_parallel(f, num_samples=1_000_000, workers=None, seed=None):
+    print(f"--- 平行隨機檢驗分配律 ({num_samples} 次) ---")
+    failure = run_parallel(_random_distributivity_worker, f, num_samples, workers, seed)
+    assert failure is None, failure
+    print("  分配律驗證通過！")
+
+def check_field_axioms(f, mode="sample", num_samples=1_000_000, workers=None, seed=None):
+    """
+    mode="sample"：每項公理各抽 NUM_TEST_CASES 組 (原本的做法)
+    mode="fast"：元素不超過 EXHAUSTIVE_MAX_ORDER 個時窮舉所有組合，
+                 否則把 num_samples 組隨機樣本分給行程池檢驗
+    """
+    print(f"=== 開始檢驗有限體 {f} ===")
+    fast = mode == "fast"
+    exhaustive = fast and _field_order(f) <= EXHAUSTIVE_MAX_ORDER
+    # 加法群、乘法群與分配律各用獨立的亂數子流，避免三者抽到相關的樣本
+    add_seed, mul_seed, dist_seed = np.random.SeedSequence(seed).spawn(3)
+
     print("\n[1. 加法群檢驗]")
-    check_commutative_group(f.add_group)
-    
+    if fast:
+        check_commutative_group_fast(f.add_group, num_samples, workers, add_seed)
+    else:
+        check_commutative_group(f.add_group)
+
     print("\n[2. 乘法群檢驗 (排除0)]")
-    check_commutative_group(f.mul_group)
-    
+    if fast:
+        check_commutative_group_fast(f.mul_group, num_samples, workers, mul_seed)
+    else:
+        check_commutative_group(f.mul_group)
+
     print("\n[3. 分配律檢驗]")
-    check_distributivity(f)
-    
+    if exhaustive:
+        check_distributivity_exhaustive(f)
+    elif fast:
+        check_distributivity_parallel(f, num_samples, workers, dist_seed)
+    else:
+        check_distributivity(f)
+
     print("\n=== 所有公理檢驗成功！ ===")
 
 if __name__ == "__main__":
@@ -58,6 +130,10 @@ if __name__ == "__main__":
     
     # 1. 執行公理檢查
     check_field_axioms(F)
+
+    # 1b. 小體窮舉、大體平行隨機檢驗
+    check_field_axioms(F, mode="fast")
+    check_field_axioms(FiniteField(1_000_003), mode="fast", num_samples=2_000_000, seed=0)
     
     # 2. 額外展示：使用物件導向寫法 (類似 rational_number.py 的用法)
     print("\n--- 程式物件使用範例 ---")
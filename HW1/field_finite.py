@@ -1,5 +1,15 @@
 import random
+import numpy as np
 from finite_field_element import FiniteFieldElement
+from gf_array import GFArray, INT64_MAX_P, inverse_mod
+from field_tables import get_tables
+
+def sample_range(rng, low, high, size):
+    """產生 size 個 [low, high) 的隨機整數；範圍超過 int64 安全運算時改用 Python 大整數"""
+    if high <= INT64_MAX_P:
+        return rng.integers(low, high, size, dtype=np.int64)
+    r = random.Random(int(rng.integers(1 << 62)))
+    return np.array([r.randrange(low, high) for _ in range(size)], dtype=object)
 
 # 若您有定義 Group base class 可以在此繼承，若無則依 Duck Typing 實作即可
 class FiniteFieldAddGroup:
@@ -21,14 +31,28 @@ class FiniteFieldAddGroup:
     def include(self, element):
         return isinstance(element, int) and 0 <= element < self.p
 
+    def include_many(self, values):
+        """include 的向量化版本：整數陣列 -> 布林陣列"""
+        values = np.asarray(values)
+        return np.asarray((values >= 0) & (values < self.p), dtype=bool)
+
     def random_generate(self):
         return random.randint(0, self.p - 1)
 
+    def elements(self):
+        """所有元素 (窮舉檢驗用)"""
+        return np.arange(self.p, dtype=np.int64)
+
+    def sample(self, rng, size):
+        """一次產生 size 個隨機元素 (NumPy 陣列)"""
+        return sample_range(rng, 0, self.p, size)
+
 class FiniteFieldMulGroup:
-    """有限體乘法群 (GF(p)*, x)"""
-    def __init__(self, p):
+    """有限體乘法群 (GF(p)*, x)；給定 tables 時反元素改為查表"""
+    def __init__(self, p, tables=None):
         self.p = p
         self._identity = 1
+        self.tables = tables
 
     @property
     def identity(self):
@@ -41,26 +65,53 @@ class FiniteFieldMulGroup:
         # 使用 pow(val, -1, p) 計算模逆元
         if val % self.p == 0:
             raise ValueError("0 沒有乘法逆元")
+        if self.tables is not None:
+            return int(self.tables.inv[val % self.p])
         return pow(val, -1, self.p)
 
     def include(self, element):
         # 乘法群不包含 0
         return isinstance(element, int) and 1 <= element < self.p
-        
+
+    def include_many(self, values):
+        """include 的向量化版本：整數陣列 -> 布林陣列"""
+        values = np.asarray(values)
+        return np.asarray((values >= 1) & (values < self.p), dtype=bool)
+
     def random_generate(self):
         return random.randint(1, self.p - 1)
 
+    def elements(self):
+        """所有元素 (窮舉檢驗用)"""
+        return np.arange(1, self.p, dtype=np.int64)
+
+    def sample(self, rng, size):
+        """一次產生 size 個隨機元素 (NumPy 陣列)"""
+        return sample_range(rng, 1, self.p, size)
+
 class FiniteField:
-    """有限體主類別"""
-    def __init__(self, p=11):
+    """
+    有限體主類別。
+    use_tables=True 時以原根建立 log/antilog/反元素表 (依 p 快取)，
+    乘法、除法、反元素與次方都改為查表，GFArray 的運算也會使用同一組表。
+    """
+    def __init__(self, p=11, use_tables=False):
         self.p = p
+        self.tables = get_tables(p) if use_tables else None
         self.add_group = FiniteFieldAddGroup(p)
-        self.mul_group = FiniteFieldMulGroup(p)
+        self.mul_group = FiniteFieldMulGroup(p, self.tables)
+
+    def __repr__(self):
+        return f"GF({self.p})"
 
     def element(self, value):
         """工廠方法：產生一個有限體元素物件"""
         return FiniteFieldElement(self, value)
 
+    def array(self, values):
+        """工廠方法：產生 GF(p) 元素陣列 (GFArray)，大量運算時使用"""
+        return GFArray(self, values)
+
     def add(self, a, b):
         val = self.add_group.operation(a.value, b.value)
         return self.element(val)
@@ -73,6 +124,8 @@ class FiniteField:
         # 注意：multiply 處理的是 Element 物件
         if a.value == 0 or b.value == 0:
             return self.element(0)
+        if self.tables is not None:
+            return self.element(self.tables.multiply(a.value, b.value))
         val = self.mul_group.operation(a.value, b.value)
         return self.element(val)
     
@@ -81,5 +134,60 @@ class FiniteField:
             raise ZeroDivisionError("Cannot divide by zero in Finite Field")
         if a.value == 0:
             return self.element(0)
+        if self.tables is not None:
+            return self.element(self.tables.divide(a.value, b.value))
         val = self.mul_group.operation(a.value, self.mul_group.inverse(b.value))
         return self.element(val)
+
+    def batch_inverse(self, values):
+        """
+        一次求 N 個非零元素的反元素 (Montgomery 技巧：1 次模反元素 + 3(N-1) 次乘法)。
+        values 為 FiniteFieldElement 的 list 時回傳 list，為 GFArray / NumPy 陣列時回傳 GFArray。
+        有元素為 0 時丟出 ZeroDivisionError 並指出索引。
+        """
+        if isinstance(values, np.ndarray):
+            values = self.array(values)
+        if isinstance(values, GFArray):
+            return values.inverse()
+        p = self.p
+        vals = [v.value if isinstance(v, FiniteFieldElement) else v % p for v in values]
+        n = len(vals)
+        if n == 0:
+            return []
+        if p <= INT64_MAX_P:
+            # 轉成 int64 陣列走向量化的乘積樹，只有最後包裝成元素物件是逐個進行
+            inv = inverse_mod(np.array(vals, dtype=np.int64), p)
+            return [FiniteFieldElement._make(self, v) for v in inv.tolist()]
+        # 前綴乘積 prefix[i] = v0 * v1 * ... * vi
+        prefix = [0] * n
+        acc = 1
+        for i, v in enumerate(vals):
+            if v == 0:
+                raise ZeroDivisionError(f"Cannot divide by zero in Finite Field (index {i})")
+            acc = acc * v % p
+            prefix[i] = acc
+        inv_acc = pow(acc, -1, p)
+        result = [None] * n
+        for i in range(n - 1, 0, -1):
+            result[i] = FiniteFieldElement._make(self, inv_acc * prefix[i - 1] % p)
+            inv_acc = inv_acc * vals[i] % p
+        result[0] = FiniteFieldElement._make(self, inv_acc)
+        return result
+
+    def batch_divide(self, a, b):
+        """逐元素 a[i] / b[i]，b 的反元素以 batch_inverse 一次求出"""
+        if isinstance(a, (GFArray, np.ndarray)) or isinstance(b, (GFArray, np.ndarray)):
+            a = a if isinstance(a, GFArray) else self.array(a)
+            b = b if isinstance(b, GFArray) else self.array(b)
+            return a * self.batch_inverse(b)
+        if len(a) != len(b):
+            raise ValueError("a 與 b 的長度必須相同")
+        p = self.p
+        if p <= INT64_MAX_P:
+            a_vals = np.array([x.value if isinstance(x, FiniteFieldElement) else x % p for x in a], dtype=np.int64)
+            b_vals = np.array([y.value if isinstance(y, FiniteFieldElement) else y % p for y in b], dtype=np.int64)
+            quotient = a_vals * inverse_mod(b_vals, p) % p
+            return [FiniteFieldElement._make(self, v) for v in quotient.tolist()]
+        inv = self.batch_inverse(b)
+        return [FiniteFieldElement._make(self, (x.value if isinstance(x, FiniteFieldElement) else x) * y.value % p)
+                for x, y in zip(a, inv)]
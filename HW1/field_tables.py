@@ -0,0 +1,165 @@
+from collections import OrderedDict
+import numpy as np
+
+# 建表的模數上限 (每張表約 p 個 int64) 與快取的表數上限
+MAX_TABLE_P = 1 << 22
+TABLE_CACHE_SIZE = 8
+
+_cache = OrderedDict()
+
+
+def _prime_factors(n):
+    """試除法分解質因數，回傳不重複的質因數"""
+    factors = []
+    d = 2
+    while d * d <= n:
+        if n % d == 0:
+            factors.append(d)
+            while n % d == 0:
+                n //= d
+        d += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def primitive_root(p):
+    """找出 GF(p)* 的最小生成元 g：對 p-1 的每個質因數 q 都有 g^((p-1)/q) != 1"""
+    if p == 2:
+        return 1
+    factors = _prime_factors(p - 1)
+    for g in range(2, p):
+        if all(pow(g, (p - 1) // q, p) != 1 for q in factors):
+            return g
+    raise ValueError(f"{p} 不是質數，找不到原根")
+
+
+class FieldTables:
+    """
+    GF(p) 的離散對數 / 反對數表與反元素表。
+        exp[i] = g^i            (長度 2(p-1)，讓 log a + log b 不用再取模)
+        log[a] = i, g^i = a     (log[0] 不使用)
+        inv[a] = a^-1           (inv[0] 不使用)
+    所有方法都接受 int 或 NumPy 整數陣列，陣列時就是一次 gather。
+    """
+    def __init__(self, p):
+        self.p = p
+        self.order = p - 1
+        self.generator = primitive_root(p)
+
+        # 倍增建表：已知 g^0..g^(n-1)，則 g^n..g^(2n-1) = 前半段 * g^n
+        powers = np.ones(1, dtype=np.int64)
+        while powers.size < self.order:
+            step = pow(self.generator, powers.size, p)
+            powers = np.concatenate([powers, powers * step % p])
+        powers = powers[:self.order]
+        exp = np.concatenate([powers, powers])
+
+        log = np.zeros(p, dtype=np.int64)
+        log[exp[:self.order]] = np.arange(self.order)
+
+        inv = np.zeros(p, dtype=np.int64)
+        # a^-1 = g^(p-1 - log a)
+        inv[1:] = exp[(self.order - log[1:]) % self.order]
+
+        self.exp = exp
+        self.log = log
+        self.inv = inv
+
+    @staticmethod
+    def _is_scalar(*xs):
+        return all(isinstance(x, (int, np.integer)) for x in xs)
+
+    def multiply(self, a, b):
+        if self._is_scalar(a, b):
+            if a == 0 or b == 0:
+                return 0
+            return int(self.exp[self.log[a] + self.log[b]])
+        a = np.asarray(a)
+        b = np.asarray(b)
+        out = self.exp[self.log[a] + self.log[b]]
+        return np.where((a == 0) | (b == 0), 0, out)
+
+    def inverse(self, a):
+        if self._is_scalar(a):
+            if a == 0:
+                raise ZeroDivisionError("Cannot divide by zero in Finite Field")
+            return int(self.inv[a])
+        a = np.asarray(a)
+        if np.any(a == 0):
+            raise ZeroDivisionError("Cannot divide by zero in Finite Field")
+        return self.inv[a]
+
+    def divide(self, a, b):
+        if self._is_scalar(a, b):
+            if b == 0:
+                raise ZeroDivisionError("Cannot divide by zero in Finite Field")
+            if a == 0:
+                return 0
+            return int(self.exp[self.log[a] - self.log[b] + self.order])
+        a = np.asarray(a)
+        b = np.asarray(b)
+        if np.any(b == 0):
+            raise ZeroDivisionError("Cannot divide by zero in Finite Field")
+        out = self.exp[self.log[a] - self.log[b] + self.order]
+        return np.where(a == 0, 0, out)
+
+    def power(self, a, e):
+        e = int(e)
+        if e < 0:
+            a = self.inverse(a)
+            e = -e
+        if self._is_scalar(a):
+            if a == 0:
+                return 1 if e == 0 else 0
+            return int(self.exp[self.log[a] * (e % self.order) % self.order])
+        a = np.asarray(a)
+        out = self.exp[self.log[a] * (e % self.order) % self.order]
+        # 0^0 = 1，0^e = 0 (e > 0)
+        return np.where(a == 0, 1 if e == 0 else 0, out)
+
+
+def get_tables(p):
+    """取得 GF(p) 的表；以 LRU 快取，最多保留 TABLE_CACHE_SIZE 個模數的表"""
+    tables = _cache.get(p)
+    if tables is not None:
+        _cache.move_to_end(p)
+        return tables
+    if p > MAX_TABLE_P:
+        raise ValueError(f"p = {p} 太大，查表模式只支援 p <= {MAX_TABLE_P}")
+    tables = FieldTables(p)
+    _cache[p] = tables
+    while len(_cache) > TABLE_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return tables
+
+
+def clear_tables():
+    _cache.clear()
+
+
+if __name__ == "__main__":
+    import time
+    from field_finite import FiniteField
+
+    p = 65521
+    n = 200_000
+    rng = np.random.default_rng(0)
+    a_vals = rng.integers(0, p, n).tolist()
+    b_vals = rng.integers(1, p, n).tolist()
+
+    for use_tables in (False, True):
+        F = FiniteField(p, use_tables=use_tables)
+        a_elems = [F.element(v) for v in a_vals]
+        b_elems = [F.element(v) for v in b_vals]
+        t0 = time.perf_counter()
+        for x, y in zip(a_elems, b_elems):
+            x / y
+        t_scalar = time.perf_counter() - t0
+
+        A, B = F.array(a_vals), F.array(b_vals)
+        t0 = time.perf_counter()
+        A / B
+        t_array = time.perf_counter() - t0
+        mode = "查表" if use_tables else "pow(b, -1, p)"
+        print(f"{mode:>14}: 逐個除法 {t_scalar:.3f}s, GFArray 除法 {t_array:.4f}s")
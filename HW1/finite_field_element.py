@@ -1,8 +1,12 @@
 class FiniteFieldElement:
     """
     表示有限體 GF(p) 中的一個元素。
-    重載了運算子，讓運算會自動呼叫所屬 Field 的邏輯。
+    重載了運算子，運算結果直接以模 p 算出，不經過 Field / Group 的多層呼叫。
+    使用 __slots__ 省去每個物件的 __dict__；大量元素請改用 gf_array.GFArray。
+    所屬的體開啟查表模式 (field.tables) 時，除法與次方改為查表。
     """
+    __slots__ = ("field", "value")
+
     def __init__(self, field, value):
         self.field = field
         if not isinstance(value, int):
@@ -10,6 +14,14 @@ class FiniteFieldElement:
         # 確保數值在 [0, p-1]
         self.value = value % field.p
 
+    @classmethod
+    def _make(cls, field, value):
+        """內部用的快速建構：value 已確定是 [0, p-1] 的整數，略過型別檢查"""
+        obj = object.__new__(cls)
+        obj.field = field
+        obj.value = value
+        return obj
+
     def __repr__(self):
         return f"{self.value}"
 
@@ -24,50 +36,80 @@ class FiniteFieldElement:
         if self.field.p != other.field.p:
             raise ValueError("無法對不同模數的有限體元素進行運算")
 
-    # --- 加法 ---
-    def __add__(self, other):
+    def _other_value(self, other):
+        """取出另一個運算元的值 (已取模)；不支援的型別回傳 None"""
         if isinstance(other, FiniteFieldElement):
             self._check_same_field(other)
-            return self.field.add(self, other)
-        elif isinstance(other, int):
-            return self.field.add(self, self.field.element(other))
-        return NotImplemented
+            return other.value
+        if isinstance(other, int):
+            return other % self.field.p
+        return None
+
+    # --- 加法 ---
+    def __add__(self, other):
+        v = self._other_value(other)
+        if v is None:
+            return NotImplemented
+        return FiniteFieldElement._make(self.field, (self.value + v) % self.field.p)
 
     def __radd__(self, other):
         return self + other
 
     # --- 減法 ---
     def __sub__(self, other):
-        if isinstance(other, FiniteFieldElement):
-            self._check_same_field(other)
-            return self.field.subtract(self, other)
-        elif isinstance(other, int):
-            return self.field.subtract(self, self.field.element(other))
-        return NotImplemented
+        v = self._other_value(other)
+        if v is None:
+            return NotImplemented
+        return FiniteFieldElement._make(self.field, (self.value - v) % self.field.p)
 
     def __rsub__(self, other):
-        return self.field.subtract(self.field.element(other), self)
+        v = self._other_value(other)
+        if v is None:
+            return NotImplemented
+        return FiniteFieldElement._make(self.field, (v - self.value) % self.field.p)
+
+    def __neg__(self):
+        return FiniteFieldElement._make(self.field, (-self.value) % self.field.p)
 
     # --- 乘法 ---
     def __mul__(self, other):
-        if isinstance(other, FiniteFieldElement):
-            self._check_same_field(other)
-            return self.field.multiply(self, other)
-        elif isinstance(other, int):
-            return self.field.multiply(self, self.field.element(other))
-        return NotImplemented
+        v = self._other_value(other)
+        if v is None:
+            return NotImplemented
+        return FiniteFieldElement._make(self.field, self.value * v % self.field.p)
 
     def __rmul__(self, other):
         return self * other
 
     # --- 除法 ---
     def __truediv__(self, other):
-        if isinstance(other, FiniteFieldElement):
-            self._check_same_field(other)
-            return self.field.divide(self, other)
-        elif isinstance(other, int):
-            return self.field.divide(self, self.field.element(other))
-        return NotImplemented
+        v = self._other_value(other)
+        if v is None:
+            return NotImplemented
+        if v == 0:
+            raise ZeroDivisionError("Cannot divide by zero in Finite Field")
+        p = self.field.p
+        tables = self.field.tables
+        inv = int(tables.inv[v]) if tables is not None else pow(v, -1, p)
+        return FiniteFieldElement._make(self.field, self.value * inv % p)
 
     def __rtruediv__(self, other):
-        return self.field.divide(self.field.element(other), self)
+        v = self._other_value(other)
+        if v is None:
+            return NotImplemented
+        if self.value == 0:
+            raise ZeroDivisionError("Cannot divide by zero in Finite Field")
+        p = self.field.p
+        tables = self.field.tables
+        inv = int(tables.inv[self.value]) if tables is not None else pow(self.value, -1, p)
+        return FiniteFieldElement._make(self.field, v * inv % p)
+
+    # --- 次方 ---
+    def __pow__(self, e):
+        if not isinstance(e, int):
+            return NotImplemented
+        if e < 0 and self.value == 0:
+            raise ZeroDivisionError("Cannot divide by zero in Finite Field")
+        if self.field.tables is not None:
+            return FiniteFieldElement._make(self.field, self.field.tables.power(self.value, e))
+        return FiniteFieldElement._make(self.field, pow(self.value, e, self.field.p))
@@ -0,0 +1,370 @@
+import numpy as np
+from finite_field_element import FiniteFieldElement
+
+# (p-1)^2 必須放得進 int64，否則改用 Python 大整數 (object 陣列)
+INT64_MAX_P = 3037000499
+
+
+def storage_dtype(p):
+    """依模數大小選擇底層陣列的 dtype"""
+    return np.int64 if p <= INT64_MAX_P else object
+
+
+def sum_mod(x, p, axis=None):
+    """
+    沿 axis 加總後取模。int64 時依 p 決定每段最多能加幾個數不溢位，分段加總。
+    """
+    x = np.asarray(x)
+    if x.dtype == object:
+        return np.sum(x, axis=axis) % p
+    if axis is None:
+        x = x.ravel()
+        axis = 0
+    block = max(1, np.iinfo(np.int64).max // max(p - 1, 1))
+    n = x.shape[axis]
+    if n <= block:
+        return np.sum(x, axis=axis) % p
+    total = np.zeros(np.delete(x.shape, axis), dtype=np.int64)
+    for start in range(0, n, block):
+        part = np.take(x, range(start, min(start + block, n)), axis=axis)
+        total = (total + np.sum(part, axis=axis) % p) % p
+    return total
+
+
+def matmul_mod(a, b, p):
+    """
+    (a @ b) mod p。int64 時把內積維度切成不會溢位的小段，每段乘完先取模再累加。
+    支援 NumPy matmul 的所有形狀 (含疊起來的批次矩陣)。
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.dtype == object or b.dtype == object:
+        return np.matmul(a.astype(object), b.astype(object)) % p
+    k = a.shape[-1]
+    block = max(1, (np.iinfo(np.int64).max - p) // max((p - 1) ** 2, 1))
+    if k <= block:
+        return np.matmul(a, b) % p
+    result = None
+    for start in range(0, k, block):
+        stop = min(start + block, k)
+        part = np.matmul(a[..., start:stop], b[..., start:stop, :] if b.ndim > 1 else b[start:stop]) % p
+        result = part if result is None else (result + part) % p
+    return result
+
+
+def pow_mod(x, e, p):
+    """逐元素 x^e mod p (e >= 0)，以平方乘法向量化計算"""
+    x = np.asarray(x)
+    result = np.ones_like(x)
+    base = x % p
+    e = int(e)
+    while e:
+        if e & 1:
+            result = result * base % p
+        base = base * base % p
+        e >>= 1
+    return result
+
+
+def _zero_error(x, p):
+    """若 x 中有 0，丟出指出第一個 0 位置的 ZeroDivisionError"""
+    zeros = np.flatnonzero(x.ravel() % p == 0)
+    if zeros.size:
+        index = tuple(int(i) for i in np.unravel_index(zeros[0], x.shape)) if x.ndim > 1 else int(zeros[0])
+        raise ZeroDivisionError(f"Cannot divide by zero in Finite Field (index {index})")
+
+
+def inverse_mod(x, p):
+    """
+    逐元素乘法反元素，使用 Montgomery 批次反元素技巧：
+    先兩兩相乘建出乘積樹 (約 N 次乘法)，只對樹根做一次模反元素，
+    再由上往下 inv(a) = inv(ab) * b、inv(b) = inv(ab) * a (約 2N 次乘法)。
+    每一層都是向量化運算。遇到 0 時丟出 ZeroDivisionError 並指出其索引。
+    """
+    x = np.asarray(x)
+    _zero_error(x, p)
+    flat = x.ravel() % p
+    if flat.size == 0:
+        return x.copy()
+
+    levels = [flat]
+    while levels[-1].size > 1:
+        level = levels[-1]
+        if level.size % 2:
+            level = np.concatenate([level, np.ones(1, dtype=level.dtype)])
+        levels.append(level[0::2] * level[1::2] % p)
+
+    inv = np.array([pow(int(levels[-1][0]), -1, p)], dtype=flat.dtype)
+    for level in reversed(levels[:-1]):
+        left = level[0::2]
+        right = level[1::2]
+        children = np.empty(level.size, dtype=flat.dtype)
+        children[0::2] = inv[:left.size] * (np.concatenate([right, np.ones(1, dtype=level.dtype)])
+                                            if right.size < left.size else right) % p
+        children[1::2] = inv[:right.size] * left[:right.size] % p
+        inv = children
+    return inv.reshape(x.shape)
+
+
+class GFArray:
+    """
+    GF(p) 元素的陣列，底層為 NumPy 陣列 (p 夠小時為 int64，否則為 Python 大整數)。
+    所有運算逐元素一次完成，不會為每個元素建立 FiniteFieldElement 物件。
+    所屬的體開啟查表模式時，除法、反元素與次方改為對 log/antilog 表做 gather。
+    可與 int、FiniteFieldElement 及同一個體的 GFArray 混合運算 (依 NumPy 規則廣播)。
+    """
+    __slots__ = ("field", "data")
+    # 讓 ndarray 與 GFArray 運算時交給 GFArray 的反向運算子處理
+    __array_ufunc__ = None
+
+    def __init__(self, field, values):
+        self.field = field
+        if isinstance(values, (list, tuple)):
+            values = [v.value if isinstance(v, FiniteFieldElement) else v for v in values]
+        dtype = storage_dtype(field.p)
+        data = np.array(values, dtype=dtype)
+        if data.dtype == object:
+            data = np.vectorize(int, otypes=[object])(data) if data.size else data
+        self.data = data % field.p
+
+    @classmethod
+    def _wrap(cls, field, data):
+        """直接包裝已經在 [0, p-1] 之內的陣列，不再複製與取模"""
+        obj = object.__new__(cls)
+        obj.field = field
+        obj.data = data
+        return obj
+
+    @property
+    def p(self):
+        return self.field.p
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def ndim(self):
+        return self.data.ndim
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"GFArray(p={self.p}, {self.data.tolist()})"
+
+    def _operand(self, other):
+        """把另一個運算元轉成底層陣列；不支援的型別回傳 None"""
+        if isinstance(other, GFArray):
+            if other.field.p != self.field.p:
+                raise ValueError("無法對不同模數的有限體元素進行運算")
+            return other.data
+        if isinstance(other, FiniteFieldElement):
+            if other.field.p != self.field.p:
+                raise ValueError("無法對不同模數的有限體元素進行運算")
+            return other.value
+        if isinstance(other, (int, np.integer)):
+            return int(other) % self.p
+        if isinstance(other, (list, tuple, np.ndarray)):
+            return GFArray(self.field, other).data
+        return None
+
+    # --- 元素存取 ---
+    def __getitem__(self, index):
+        item = self.data[index]
+        if isinstance(item, np.ndarray):
+            return GFArray._wrap(self.field, item)
+        return self.field.element(int(item))
+
+    def __setitem__(self, index, value):
+        self.data[index] = self._operand(value)
+
+    def __iter__(self):
+        for i in range(len(self.data)):
+            yield self[i]
+
+    def __eq__(self, other):
+        data = self._operand(other)
+        if data is None:
+            return NotImplemented
+        return self.data == data
+
+    def __ne__(self, other):
+        data = self._operand(other)
+        if data is None:
+            return NotImplemented
+        return self.data != data
+
+    def to_elements(self):
+        """轉回 FiniteFieldElement 的 list (僅限一維)"""
+        return [self.field.element(int(v)) for v in self.data]
+
+    def copy(self):
+        return GFArray._wrap(self.field, self.data.copy())
+
+    def reshape(self, *shape):
+        return GFArray._wrap(self.field, self.data.reshape(*shape))
+
+    # --- 加減法 ---
+    def __add__(self, other):
+        data = self._operand(other)
+        if data is None:
+            return NotImplemented
+        return GFArray._wrap(self.field, (self.data + data) % self.p)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        data = self._operand(other)
+        if data is None:
+            return NotImplemented
+        return GFArray._wrap(self.field, (self.data - data) % self.p)
+
+    def __rsub__(self, other):
+        data = self._operand(other)
+        if data is None:
+            return NotImplemented
+        return GFArray._wrap(self.field, (data - self.data) % self.p)
+
+    def __neg__(self):
+        return GFArray._wrap(self.field, (-self.data) % self.p)
+
+    # --- 乘除法 ---
+    def __mul__(self, other):
+        data = self._operand(other)
+        if data is None:
+            return NotImplemented
+        # 乘法直接 a*b % p 比查 log/antilog 表 (兩次 gather + 一次 gather) 還快，不走查表
+        return GFArray._wrap(self.field, self.data * data % self.p)
+
+    __rmul__ = __mul__
+
+    def _inverse_data(self, data):
+        tables = self.field.tables
+        if tables is not None:
+            data = np.asarray(data)
+            _zero_error(data, self.p)
+            return tables.inverse(data)
+        return inverse_mod(data, self.p)
+
+    def inverse(self):
+        """逐元素乘法反元素"""
+        return GFArray._wrap(self.field, self._inverse_data(self.data))
+
+    def __truediv__(self, other):
+        data = self._operand(other)
+        if data is None:
+            return NotImplemented
+        tables = self.field.tables
+        if tables is not None:
+            data = np.asarray(data)
+            _zero_error(data, self.p)
+            return GFArray._wrap(self.field, tables.divide(self.data, data))
+        return GFArray._wrap(self.field, self.data * inverse_mod(data, self.p) % self.p)
+
+    def __rtruediv__(self, other):
+        data = self._operand(other)
+        if data is None:
+            return NotImplemented
+        return GFArray._wrap(self.field, data * self._inverse_data(self.data) % self.p)
+
+    def __pow__(self, e):
+        e = int(e)
+        tables = self.field.tables
+        if tables is not None:
+            return GFArray._wrap(self.field, tables.power(self.data, e))
+        if e < 0:
+            return self.inverse() ** (-e)
+        return GFArray._wrap(self.field, pow_mod(self.data, e, self.p))
+
+    # --- 內積與歸約 ---
+    def dot(self, other):
+        """內積 / 矩陣乘積 (mod p)；一維對一維時回傳 FiniteFieldElement"""
+        data = self._operand(other)
+        if self.data.ndim == 1 and np.ndim(data) == 1:
+            return self.field.element(int(sum_mod(self.data * data % self.p, self.p)))
+        return GFArray._wrap(self.field, matmul_mod(self.data, data, self.p))
+
+    __matmul__ = dot
+
+    def sum(self, axis=None):
+        total = sum_mod(self.data, self.p, axis)
+        if np.ndim(total) == 0:
+            return self.field.element(int(total))
+        return GFArray._wrap(self.field, total)
+
+    def prod(self, axis=None):
+        """連乘 (mod p)，以兩兩相乘的樹狀歸約進行，避免溢位"""
+        data = self.data
+        if axis is None:
+            data = data.ravel()
+            axis = 0
+        data = np.moveaxis(data, axis, 0)
+        while data.shape[0] > 1:
+            if data.shape[0] % 2:
+                data = np.concatenate([data, np.ones_like(data[:1])])
+            data = data[0::2] * data[1::2] % self.p
+        result = data[0] if data.shape[0] else np.ones(data.shape[1:], dtype=data.dtype)
+        if np.ndim(result) == 0:
+            return self.field.element(int(result))
+        return GFArray._wrap(self.field, result)
+
+
+if __name__ == "__main__":
+    import time
+    from field_finite import FiniteField
+
+    F = FiniteField(1_000_003)
+    n = 1_000_000
+    rng = np.random.default_rng(0)
+    a_vals = rng.integers(0, F.p, n).tolist()
+    b_vals = rng.integers(1, F.p, n).tolist()
+
+    m = n // 10
+    a_elems = [F.element(v) for v in a_vals[:m]]
+    b_elems = [F.element(v) for v in b_vals[:m]]
+    t0 = time.perf_counter()
+    slow = [(x * y + x) / y for x, y in zip(a_elems, b_elems)]
+    t_obj = (time.perf_counter() - t0) * (n / m)
+
+    A = F.array(a_vals)
+    B = F.array(b_vals)
+    t0 = time.perf_counter()
+    fast = (A * B + A) / B
+    t_arr = time.perf_counter() - t0
+
+    print(f"FiniteFieldElement 逐個運算 (估計): {t_obj:.3f}s")
+    print(f"GFArray 整批運算:                  {t_arr:.3f}s")
+    print(f"結果一致: {[e.value for e in slow] == fast.data[:m].tolist()}")
+    print(f"內積 A·B = {A.dot(B)}, 連乘 prod(B[:10]) = {B[:10].prod()}")
+
+    print("\n=== 批次反元素 (Montgomery) vs 逐個 a / b ===")
+    m = 200_000
+    a_elems = [F.element(v) for v in a_vals[:m]]
+    b_elems = [F.element(v) for v in b_vals[:m]]
+    t0 = time.perf_counter()
+    naive = [x / y for x, y in zip(a_elems, b_elems)]
+    t_naive = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batched = F.batch_divide(a_elems, b_elems)
+    t_list = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batched_arr = F.batch_divide(A[:m], B[:m])
+    t_batch_arr = time.perf_counter() - t0
+    print(f"逐個 a / b ({m} 次):       {t_naive:.3f}s")
+    print(f"batch_divide (list):       {t_list:.3f}s")
+    print(f"batch_divide (GFArray):    {t_batch_arr:.4f}s")
+    print(f"結果一致: {[e.value for e in naive] == [e.value for e in batched] == batched_arr.data.tolist()}")
+
+    # p 很大時 pow(b, -1, p) 變貴，批次反元素只做一次，優勢明顯
+    import random
+    G = FiniteField(2 ** 61 - 1)
+    r = random.Random(0)
+    xs = [G.element(r.randrange(1, G.p)) for _ in range(m)]
+    t0 = time.perf_counter()
+    [1 / x for x in xs]
+    t_naive = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    G.batch_inverse(xs)
+    t_list = time.perf_counter() - t0
+    print(f"GF(2^61-1): 逐個 1 / x {t_naive:.3f}s, batch_inverse (list) {t_list:.3f}s")
@@ -0,0 +1,224 @@
+import numpy as np
+from gf_array import GFArray, inverse_mod, matmul_mod
+
+
+def _as_data(field, A):
+    """把 GFArray / list / ndarray 轉為底層陣列 (int64 或 Python 大整數)"""
+    if isinstance(A, GFArray):
+        if A.field.p != field.p:
+            raise ValueError("無法對不同模數的有限體元素進行運算")
+        return A.data.copy()
+    return GFArray(field, A).data
+
+
+def _inverse(field, x):
+    """逐元素反元素；有查表時直接 gather"""
+    if field.tables is not None and x.dtype != object:
+        return field.tables.inv[x]
+    return inverse_mod(x, field.p)
+
+
+def _eliminate(field, data, ncols=None, full=True):
+    """
+    對疊起來的矩陣 data (k, m, n) 同時做高斯消去，原地修改。
+    每個批次的樞紐列位置各自不同，以 fancy indexing 向量化處理。
+    只對前 ncols 欄找樞紐 (其餘為增廣欄)；full=True 時消去樞紐上下所有列 (RREF)，否則只消去下方。
+    回傳 (pivot_mask (k, ncols), rank (k,), det_factor (k,))，
+    det_factor 為所有樞紐的乘積乘上列交換的正負號 (mod p)。
+    """
+    p = field.p
+    k, m, n = data.shape
+    ncols = n if ncols is None else ncols
+    batch = np.arange(k)
+    row = np.zeros(k, dtype=np.int64)
+    pivots = np.zeros((k, ncols), dtype=bool)
+    det_factor = np.ones(k, dtype=data.dtype)
+    rows = np.arange(m)
+
+    for c in range(ncols):
+        active = row < m
+        if not active.any():
+            break
+        # 找出每個批次在 row 以下、第 c 欄第一個非零的列
+        col = data[:, :, c]
+        candidate = (col != 0) & (rows[None, :] >= row[:, None])
+        has = candidate.any(axis=1) & active
+        if not has.any():
+            continue
+        piv = np.argmax(candidate, axis=1)
+
+        b = batch[has]
+        r, pr = row[has], piv[has]
+        # 交換列 r 與 pr
+        swapped = r != pr
+        if swapped.any():
+            bs, rs, ps = b[swapped], r[swapped], pr[swapped]
+            tmp = data[bs, rs, c:].copy()
+            data[bs, rs, c:] = data[bs, ps, c:]
+            data[bs, ps, c:] = tmp
+            det_factor[bs] = (-det_factor[bs]) % p
+
+        # 樞紐列正規化為 1
+        pivot_val = data[b, r, c]
+        det_factor[b] = det_factor[b] * pivot_val % p
+        pivot_row = data[b, r, c:] * _inverse(field, pivot_val)[:, None] % p
+        data[b, r, c:] = pivot_row
+
+        # 消去其他列：row_i -= a_ic * pivot_row
+        # 只消去下方時，各批次樞紐列以上的列不必更新
+        lo = int(r.min()) if not full else 0
+        factor = data[b, lo:, c].copy()
+        factor[np.arange(b.size), r - lo] = 0
+        if not full:
+            factor[rows[None, lo:] < r[:, None]] = 0
+        sub = data[b, lo:, c:]
+        data[b, lo:, c:] = (sub - factor[:, :, None] * pivot_row[:, None, :]) % p
+
+        pivots[b, c] = True
+        row[b] += 1
+    return pivots, row, det_factor
+
+
+def _batched(field, A):
+    """轉成 (k, m, n) 並回傳是否原本為單一矩陣"""
+    data = _as_data(field, A)
+    if data.ndim == 2:
+        return data[None], True
+    if data.ndim != 3:
+        raise ValueError(f"矩陣必須是 2 維或 3 維 (批次)，實際為 {data.ndim} 維")
+    return data, False
+
+
+def rref(field, A):
+    """
+    簡化列梯形 (RREF)。回傳 (R, pivot_columns)；
+    批次輸入 (k, m, n) 時 pivot_columns 為形狀 (k, n) 的布林陣列。
+    """
+    data, single = _batched(field, A)
+    pivots, _, _ = _eliminate(field, data)
+    if single:
+        return GFArray._wrap(field, data[0]), np.flatnonzero(pivots[0]).tolist()
+    return GFArray._wrap(field, data), pivots
+
+
+def rank(field, A):
+    data, single = _batched(field, A)
+    _, r, _ = _eliminate(field, data, full=False)
+    return int(r[0]) if single else r
+
+
+def det(field, A):
+    """行列式 (mod p)，O(n^3) 消去法；批次輸入回傳 GFArray"""
+    data, single = _batched(field, A)
+    if data.shape[1] != data.shape[2]:
+        raise ValueError("行列式只定義於方陣")
+    _, r, factor = _eliminate(field, data, full=False)
+    result = np.where(r == data.shape[1], factor, 0)
+    if single:
+        return field.element(int(result[0]))
+    return GFArray._wrap(field, result)
+
+
+def _check_invertible(r, n):
+    singular = np.flatnonzero(r < n)
+    if singular.size:
+        raise ValueError(f"矩陣不可逆 (批次索引 {singular[:10].tolist()})")
+
+
+def solve(field, A, b):
+    """
+    解 A x = b (A 為可逆方陣)。b 可為向量 (n,) 或矩陣 (n, r)，批次時為 (k, n) / (k, n, r)。
+    A 不可逆時丟出 ValueError。
+    """
+    data, single = _batched(field, A)
+    k, n, m = data.shape
+    if n != m:
+        raise ValueError("solve 只支援方陣；一般情形請使用 rref")
+    rhs = _as_data(field, b)
+    if single:
+        rhs = rhs[None]
+    vector = rhs.ndim == 2
+    if vector:
+        rhs = rhs[:, :, None]
+    aug = np.concatenate([data, rhs.astype(data.dtype)], axis=2)
+    _, r, _ = _eliminate(field, aug, ncols=n)
+    _check_invertible(r, n)
+    x = aug[:, :, n:]
+    if vector:
+        x = x[:, :, 0]
+    return GFArray._wrap(field, x[0] if single else x)
+
+
+def inverse(field, A):
+    """反矩陣，以 [A | I] 做 RREF；不可逆時丟出 ValueError"""
+    data, single = _batched(field, A)
+    k, n, m = data.shape
+    if n != m:
+        raise ValueError("只有方陣才有反矩陣")
+    eye = np.broadcast_to(np.eye(n, dtype=np.int64).astype(data.dtype), (k, n, n))
+    aug = np.concatenate([data, eye], axis=2)
+    _, r, _ = _eliminate(field, aug, ncols=n)
+    _check_invertible(r, n)
+    inv = aug[:, :, n:]
+    return GFArray._wrap(field, inv[0] if single else inv)
+
+
+def nullspace(field, A):
+    """
+    零空間的一組基底，回傳形狀 (n - rank, n) 的 GFArray，每一列是一個基底向量。
+    只支援單一矩陣 (各批次的零空間維度可能不同)。
+    """
+    R, pivot_cols = rref(field, A)
+    R = R.data
+    n = R.shape[1]
+    pivot_set = set(pivot_cols)
+    free = [j for j in range(n) if j not in pivot_set]
+    basis = np.zeros((len(free), n), dtype=R.dtype)
+    for i, j in enumerate(free):
+        basis[i, j] = 1
+        # x_pivot = -R[row, j]
+        for row, pc in enumerate(pivot_cols):
+            basis[i, pc] = (-R[row, j]) % field.p
+    return GFArray._wrap(field, basis)
+
+
+def matmul(field, A, B):
+    """矩陣乘法 (mod p)，支援批次"""
+    return GFArray._wrap(field, matmul_mod(_as_data(field, A), _as_data(field, B), field.p))
+
+
+if __name__ == "__main__":
+    import time
+    from field_finite import FiniteField
+
+    F = FiniteField(7)
+    A = F.array([[1, 2, 3], [4, 5, 6], [7, 8, 10]])
+    print(f"A =\n{A.data}")
+    print(f"rank(A) = {rank(F, A)}, det(A) = {det(F, A)}")
+    A_inv = inverse(F, A)
+    print(f"A^-1 =\n{A_inv.data}\nA @ A^-1 =\n{(A @ A_inv).data}")
+    x = solve(F, A, [1, 2, 3])
+    print(f"solve(A, [1, 2, 3]) = {x.data}, A @ x = {(A @ x).data}")
+
+    B = F.array([[1, 2, 3, 4], [2, 4, 6, 8], [0, 1, 1, 1]])
+    N = nullspace(F, B)
+    print(f"nullspace(B) =\n{N.data}\nB @ N^T =\n{(B @ N.data.T).data}")
+
+    print("\n=== 1000 x 1000, GF(65521) ===")
+    F = FiniteField(65521, use_tables=True)
+    rng = np.random.default_rng(0)
+    M = F.array(rng.integers(0, F.p, (1000, 1000)))
+    rhs = F.array(rng.integers(0, F.p, 1000))
+    t0 = time.perf_counter()
+    x = solve(F, M, rhs)
+    print(f"solve: {time.perf_counter() - t0:.2f}s, 殘差為 0: {bool(np.all((M @ x).data == rhs.data))}")
+    t0 = time.perf_counter()
+    d = det(F, M)
+    print(f"det:   {time.perf_counter() - t0:.2f}s, det = {d}")
+
+    print("\n=== 批次 500 個 20 x 20 ===")
+    S = F.array(rng.integers(0, F.p, (500, 20, 20)))
+    t0 = time.perf_counter()
+    S_inv = inverse(F, S)
+    ok = np.all((S @ S_inv).data == np.eye(20, dtype=np.int64))
+    print(f"inverse: {time.perf_counter() - t0:.3f}s, S @ S^-1 == I: {bool(ok)}")
@@ -1,4 +1,7 @@
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
 NUM_TEST_CASES = 100
 
@@ -77,3 +80,162 @@ def check_commutative_group(g):
     check_inverse_element(g)
     check_commutativity(g)
     print(f"  {type(g).__name__}: 交換群公理全部通過！")
+
+# --- 窮舉與平行隨機檢驗 ---
+
+# 元素個數不超過此值時可窮舉 (結合律需檢查 n^3 組)
+EXHAUSTIVE_MAX_ORDER = 512
+
+def operation_table(g, elems):
+    """
+    以廣播一次算出運算表 T[i, j] = elems[i] op elems[j]，
+    並回傳 (T 的值, T 的索引)；索引為 -1 表示結果不在集合中。
+    """
+    values = np.asarray(g.operation(elems[:, None], elems[None, :]), dtype=np.int64)
+    lookup = np.full(int(max(elems.max(), values.max())) + 1, -1, dtype=np.int64)
+    lookup[elems] = np.arange(elems.size)
+    index = np.where(values >= 0, lookup[np.clip(values, 0, lookup.size - 1)], -1)
+    return values, index
+
+def check_group_exhaustive(g, commutative=True):
+    """
+    對小階群窮舉所有 (a, b) 與 (a, b, c)，以運算表的 NumPy 廣播一次檢驗。
+    失敗時丟出 AssertionError，訊息中包含第一個反例。
+    """
+    elems = np.asarray(g.elements())
+    n = elems.size
+    T, idx = operation_table(g, elems)
+
+    # 1. 封閉性
+    bad = np.argwhere(idx < 0)
+    assert bad.size == 0, \
+        f"Closure failed: {elems[bad[0][0]]} op {elems[bad[0][1]]} = {T[tuple(bad[0])]} is not in G"
+
+    # 2. 結合性：T[T[a,b], c] == T[a, T[b,c]]，逐列處理以控制記憶體用量
+    for i in range(n):
+        lhs = idx[idx[i]]                # (a op b) op c，形狀 (n_b, n_c)
+        rhs = idx[i][idx]                # a op (b op c)
+        bad = np.argwhere(lhs != rhs)
+        assert bad.size == 0, \
+            f"Associativity failed: ({elems[i]} op {elems[bad[0][0]]}) op {elems[bad[0][1]]} != " \
+            f"{elems[i]} op ({elems[bad[0][0]]} op {elems[bad[0][1]]})"
+
+    # 3. 單位元素
+    e = g.identity
+    e_pos = np.flatnonzero(elems == e)
+    assert e_pos.size == 1, f"Identity {e} is not in G"
+    e_pos = e_pos[0]
+    bad = np.flatnonzero(T[e_pos] != elems)
+    assert bad.size == 0, f"Left identity failed: {e} op {elems[bad[0]]} != {elems[bad[0]]}"
+    bad = np.flatnonzero(T[:, e_pos] != elems)
+    assert bad.size == 0, f"Right identity failed: {elems[bad[0]]} op {e} != {elems[bad[0]]}"
+
+    # 4. 反元素：g.inverse 逐一計算 (n 次)，再查表驗證
+    inv = np.array([g.inverse(int(a)) for a in elems], dtype=np.int64)
+    inv_idx = np.searchsorted(elems, inv)
+    inv_idx = np.clip(inv_idx, 0, n - 1)
+    bad = np.flatnonzero(elems[inv_idx] != inv)
+    assert bad.size == 0, f"Inverse {inv[bad[0]]} for {elems[bad[0]]} is not in G"
+    rows = np.arange(n)
+    bad = np.flatnonzero(T[inv_idx, rows] != e)
+    assert bad.size == 0, \
+        f"Left inverse failed: {inv[bad[0]]} op {elems[bad[0]]} = {T[inv_idx[bad[0]], bad[0]]} != {e}"
+    bad = np.flatnonzero(T[rows, inv_idx] != e)
+    assert bad.size == 0, \
+        f"Right inverse failed: {elems[bad[0]]} op {inv[bad[0]]} = {T[bad[0], inv_idx[bad[0]]]} != {e}"
+
+    # 5. 交換性
+    if commutative:
+        bad = np.argwhere(T != T.T)
+        assert bad.size == 0, \
+            f"Commutativity failed: {elems[bad[0][0]]} op {elems[bad[0][1]]} != {elems[bad[0][1]]} op {elems[bad[0][0]]}"
+
+    kind = "交換群" if commutative else "一般群"
+    print(f"  {type(g).__name__}: {kind}公理窮舉 {n}^3 組全部通過！")
+
+def _include_mask(g, values):
+    """values 中每個值是否在群中；群沒有提供 include_many 時逐一呼叫 include"""
+    include_many = getattr(g, "include_many", None)
+    if include_many is not None:
+        return include_many(values)
+    return np.fromiter((g.include(v) for v in values.tolist()), dtype=bool, count=values.size)
+
+def _random_group_worker(g, seed, count, commutative, batch=100_000):
+    """
+    子行程：以獨立的亂數流產生 count 組樣本並向量化檢驗。
+    回傳第一個反例的說明字串，全部通過則回傳 None。
+    """
+    rng = np.random.default_rng(seed)
+    e = g.identity
+    done = 0
+    while done < count:
+        m = min(batch, count - done)
+        done += m
+        a, b, c = g.sample(rng, m), g.sample(rng, m), g.sample(rng, m)
+        ab = g.operation(a, b)
+
+        bad = np.flatnonzero(~_include_mask(g, ab))
+        if bad.size:
+            i = bad[0]
+            return f"Closure failed: {a[i]} op {b[i]} = {ab[i]} is not in G"
+
+        lhs = g.operation(ab, c)
+        rhs = g.operation(a, g.operation(b, c))
+        bad = np.flatnonzero(lhs != rhs)
+        if bad.size:
+            i = bad[0]
+            return f"Associativity failed: ({a[i]} op {b[i]}) op {c[i]} != {a[i]} op ({b[i]} op {c[i]})"
+
+        bad = np.flatnonzero((g.operation(e, a) != a) | (g.operation(a, e) != a))
+        if bad.size:
+            return f"Identity failed for {a[bad[0]]}"
+
+        # 反元素只檢驗前 1/10 的樣本 (g.inverse 為逐元素呼叫)
+        for x in a[:max(1, m // 10)].tolist():
+            x_inv = g.inverse(x)
+            if not g.include(x_inv) or g.operation(x_inv, x) != e or g.operation(x, x_inv) != e:
+                return f"Inverse failed: {x_inv} for {x}"
+
+        if commutative:
+            bad = np.flatnonzero(ab != g.operation(b, a))
+            if bad.size:
+                return f"Commutativity failed: {a[bad[0]]} op {b[bad[0]]} != {b[bad[0]]} op {a[bad[0]]}"
+    return None
+
+def run_parallel(worker, obj, num_samples, workers=None, seed=None, *args):
+    """
+    把 num_samples 組樣本平均分給 workers 個行程，每個行程使用獨立的 SeedSequence 子流。
+    seed 可以是整數、None 或 SeedSequence (例如由上層 spawn 出來的子流)。
+    """
+    workers = workers or os.cpu_count() or 1
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(workers)
+    counts = [num_samples // workers + (i < num_samples % workers) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(worker, obj, s, n, *args) for s, n in zip(seeds, counts) if n]
+        for future in futures:
+            failure = future.result()
+            if failure is not None:
+                return failure
+    return None
+
+def check_group_parallel(g, num_samples=1_000_000, commutative=True, workers=None, seed=None):
+    """大階群：把大量隨機樣本分給行程池向量化檢驗，失敗時丟出含反例的 AssertionError"""
+    failure = run_parallel(_random_group_worker, g, num_samples, workers, seed, commutative)
+    assert failure is None, failure
+    print(f"  {type(g).__name__}: {num_samples} 組隨機樣本 (平行) 全部通過！")
+
+def _order(g):
+    """群所在的體的元素個數 (不需要列舉元素)"""
+    if hasattr(g, "field"):
+        return g.field.order
+    return g.p
+
+def check_commutative_group_fast(g, num_samples=1_000_000, workers=None, seed=None):
+    """小階群窮舉，大階群改為平行隨機檢驗"""
+    elements = getattr(g, "elements", None)
+    if elements is not None and _order(g) <= EXHAUSTIVE_MAX_ORDER:
+        check_group_exhaustive(g, commutative=True)
+    else:
+        check_group_parallel(g, num_samples, True, workers, seed)
@@ -1,4 +1,6 @@
 import math
+import numpy as np
+from logprob import log_product, logsumexp, to_bits
 
 def probability_demo():
     print("--- 習題 1 & 2: 機率與對數機率 ---")
@@ -24,4 +26,17 @@ def probability_demo():
     print(f"   以 10 為底: {log_prob_base10}")
     print(f"   (這代表機率約為 10 的 {log_prob_base10:.2f} 次方)")
 
+    # 一般情形: 每一步機率不同時，log P = sum log p_i，以 logprob.log_product 向量化並以補償求和累加
+    rng = np.random.default_rng(0)
+    probs = rng.uniform(0.3, 0.9, 1_000_000)
+    print(f"\n3. 一百萬個不同機率的乘積:")
+    print(f"   直接相乘: {np.prod(probs)}")
+    print(f"   log_product (bits): {to_bits(log_product(probs)):.4f}")
+
+    # 兩個序列的機率相加 P1 + P2 (例如混合模型)：在 log 空間以 logsumexp 計算，不必先還原成機率
+    log_p1 = n * math.log(0.5)
+    log_p2 = n * math.log(0.49)
+    print(f"4. 直接計算 0.5^{n} + 0.49^{n}: {0.5 ** n + 0.49 ** n}")
+    print(f"   logsumexp 計算 log(0.5^{n} + 0.49^{n}): {logsumexp([log_p1, log_p2]):.4f}")
+
 probability_demo()
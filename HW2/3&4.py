@@ -1,28 +1,13 @@
 import numpy as np
+from info_theory import entropy, cross_entropy, kl_divergence
+from entropy_stream import StreamingEntropy
 
 def info_theory_metrics():
     print("\n--- 習題 3 & 4: 熵、交叉熵、KL散度 ---")
 
-    # 為了避免 log(0) 錯誤，我們加上一個極小值 epsilon
-    epsilon = 1e-10
-
-    def entropy(p):
-        """熵 H(P)"""
-        p = np.array(p)
-        return -np.sum(p * np.log2(p + epsilon))
-
-    def cross_entropy(p, q):
-        """交叉熵 H(P, Q)"""
-        p = np.array(p)
-        q = np.array(q)
-        return -np.sum(p * np.log2(q + epsilon))
-
-    def kl_divergence(p, q):
-        """KL 散度 D_KL(P || Q)"""
-        p = np.array(p)
-        q = np.array(q)
-        # 公式: sum(p(x) * log(p(x)/q(x)))
-        return np.sum(p * np.log2((p + epsilon) / (q + epsilon)))
+    # 熵、交叉熵、KL 散度使用 info_theory 模組中的向量化函數：
+    # 以 0 log 0 = 0 的精確定義處理 0 機率，不必在 log 裡加上 epsilon (那會讓結果產生偏差)
+    # 也可以一次傳入 (N, K) 的分佈矩陣，逐列算出結果
 
     # 設定兩個機率分佈
     p = np.array([0.8, 0.1, 0.1]) # 真實分佈
@@ -56,3 +41,29 @@ def info_theory_metrics():
         print("結果符合題目敘述 (但在標準定義下極少見)。")
 
 info_theory_metrics()
+
+def streaming_demo():
+    print("\n--- 串流估計: 從資料流逐段累積直方圖 ---")
+    p = np.array([0.8, 0.1, 0.1])
+    q = np.array([0.2, 0.4, 0.4])
+    rng = np.random.default_rng(0)
+
+    # 依 P 產生 1000 萬個符號，分 100 段送進估計器；記憶體只保留 3 個計數
+    est = StreamingEntropy(alphabet=3, q=q)
+    for _ in range(100):
+        est.update(rng.choice(3, 100_000, p=p))
+    print(f"估計的 P: {np.round(est.probabilities(), 4)}")
+    print(f"H(P) ≈ {est.entropy:.4f}, H(P, Q) ≈ {est.cross_entropy:.4f}, D_KL ≈ {est.kl_divergence:.4f}")
+
+def batch_demo():
+    print("\n--- 批次計算: 一次處理 (N, K) 的分佈矩陣 ---")
+    rng = np.random.default_rng(0)
+    P = rng.dirichlet(np.ones(3), 5)
+    Q = np.tile([0.2, 0.4, 0.4], (5, 1))
+    P[0] = [1.0, 0.0, 0.0]   # 含 0 機率的分佈，0 log 0 = 0
+    out = np.empty(5)
+    print(f"H(P_i):         {np.round(entropy(P, out=out), 4)}")
+    print(f"D_KL(P_i || Q): {np.round(kl_divergence(P, Q), 4)}")
+
+streaming_demo()
+batch_demo()
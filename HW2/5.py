@@ -1,24 +1,15 @@
 import numpy as np
+from hamming import HammingCode, encode_bytes, decode_bytes
 
 def hamming_74_demo():
     print("\n--- 習題 5: 7-4 漢明碼編碼與解碼 ---")
 
-    # 定義生成矩陣 G (4x7)
-    # 結構為 [I_4 | P]，其中 I_4 是單位矩陣，P 是奇偶校驗部分
-    G = np.array([
-        [1, 0, 0, 0, 1, 1, 0],
-        [0, 1, 0, 0, 1, 0, 1],
-        [0, 0, 1, 0, 0, 1, 1],
-        [0, 0, 0, 1, 1, 1, 1]
-    ])
-
-    # 定義校驗矩陣 H (3x7)
-    # 結構為 [P^T | I_3]
-    H = np.array([
-        [1, 1, 0, 1, 1, 0, 0],
-        [1, 0, 1, 1, 0, 1, 0],
-        [0, 1, 1, 1, 0, 0, 1]
-    ])
+    # 生成矩陣 G (4x7) 結構為 [I_4 | P]，其中 I_4 是單位矩陣，P 是奇偶校驗部分
+    # 校驗矩陣 H (3x7) 結構為 [P^T | I_3]
+    # 由 HammingCode(r) 依 r 產生 (r = 3 即 7-4 漢明碼)，同時建好校驗子表
+    code = HammingCode(3)
+    G, H = code.G, code.H
+    print(f"G =\n{G}\nH =\n{H}")
 
     # 1. 輸入資料 (4 bits)
     data = np.array([1, 0, 1, 1]) 
@@ -38,18 +29,10 @@ def hamming_74_demo():
     syndrome = np.dot(received, H.T) % 2
     print(f"校驗子 (Syndrome): {syndrome}")
     
-    # 將二進位 [s0, s1, s2] 轉為十進位整數以找出錯誤位置
-    # 注意: 這裡的 syndrome 排列順序對應 H 的行向量
-    # 對於這個特定的 H 矩陣，Syndrome (轉十進位) 直接對應錯誤的位置 (由大到小排列位元)
-    # s 向量通常讀作 [z1, z2, z3] 或類似順序，需根據 H 矩陣構造解析
-    
-    error_index = -1
-    # 比對 Syndrome 與 H 的每一個行向量(Column)
-    for i in range(7):
-        if np.array_equal(syndrome, H[:, i]):
-            error_index = i
-            break
-            
+    # 將 Syndrome [s0, s1, s2] 視為二進位整數 (s0 為最高位)，直接查校驗子表得到錯誤位置
+    # 不必逐一比對 H 的每一個行向量 (Column)；-1 表示沒有錯誤
+    error_index = int(code.syndrome_table[int(syndrome @ [4, 2, 1])])
+
     if error_index != -1:
         print(f"偵測到錯誤在索引: {error_index} (第 {error_index+1} 位)")
         # 更正錯誤
@@ -63,4 +46,38 @@ def hamming_74_demo():
     else:
         print("未偵測到錯誤。")
 
+def hamming_bytes_demo():
+    print("\n--- 整段資料的 (7,4) 漢明碼保護 (查表 + 向量化) ---")
+    message = "漢明碼可以更正每個碼字中的一個錯誤位元。".encode("utf-8") * 1000
+    encoded = bytearray(encode_bytes(message))
+    print(f"原始 {len(message)} bytes -> 編碼後 {len(encoded)} bytes (碼率 4/7)")
+
+    # 每 7 個 byte (8 個碼字) 翻轉第一個碼字中的一個位元
+    rng = np.random.default_rng(0)
+    for start in range(0, len(encoded) - 6, 7):
+        encoded[start] ^= 1 << int(rng.integers(1, 8))
+
+    decoded, corrected = decode_bytes(encoded)
+    print(f"更正的碼字數: {corrected}")
+    print(f"是否與原始資料相符: {decoded == message}")
+
+def hamming_family_demo():
+    print("\n--- 一般漢明碼 (2^r-1, 2^r-r-1) 與 SECDED ---")
+    for r in (3, 4, 5, 6):
+        code = HammingCode(r)
+        print(f"r = {r}: {code}, 碼率 {code.rate:.3f}")
+
+    # SECDED: 單一錯誤會被更正，兩個錯誤會被偵測出來 (一般漢明碼則會誤更正)
+    rng = np.random.default_rng(1)
+    for code in (HammingCode(4), HammingCode(4, extended=True)):
+        data = rng.integers(0, 2, (1000, code.k))
+        received = code.encode(data)
+        received[:, 0] ^= 1
+        received[:, 5] ^= 1
+        decoded, corrected, detected = code.decode(received)
+        wrong = np.count_nonzero(np.any(decoded != data, axis=1))
+        print(f"{code}: 1000 個碼字各錯 2 位 -> 更正 {corrected}, 偵測到雙錯誤 {detected}, 解碼錯誤 {wrong}")
+
 hamming_74_demo()
+hamming_bytes_demo()
+hamming_family_demo()
@@ -0,0 +1,133 @@
+import argparse
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from hamming import hamming_code
+
+
+def binary_entropy(p):
+    """二元熵 H_2(p) (bits)，H_2(0) = H_2(1) = 0"""
+    if p <= 0 or p >= 1:
+        return 0.0
+    return -p * math.log2(p) - (1 - p) * math.log2(1 - p)
+
+
+def bsc_capacity(p):
+    """二元對稱信道 (BSC) 的容量 C = 1 - H_2(p)"""
+    return 1 - binary_entropy(p)
+
+
+def awgn_crossover(snr_db):
+    """BPSK 經 AWGN 後做硬判決的等效翻轉機率 Q(sqrt(2 Es/N0))"""
+    snr = 10 ** (snr_db / 10)
+    return 0.5 * math.erfc(math.sqrt(snr))
+
+
+def bsc(bits, p, rng):
+    """每個位元獨立以機率 p 翻轉"""
+    return bits ^ (rng.random(bits.shape) < p).astype(np.uint8)
+
+
+def awgn_hard(bits, snr_db, rng):
+    """BPSK 調變 (0 -> +1, 1 -> -1)，加上高斯雜訊後以正負號做硬判決"""
+    snr = 10 ** (snr_db / 10)
+    sigma = math.sqrt(1 / (2 * snr))
+    received = (1.0 - 2.0 * bits) + sigma * rng.standard_normal(bits.shape)
+    return (received < 0).astype(np.uint8)
+
+
+CHANNELS = {"bsc": bsc, "awgn": awgn_hard}
+
+
+def _simulate_worker(code, channel, param, seed, frames, chunk):
+    """
+    送 frames 個訊框 (每個訊框為一個碼字，含 k 個資訊位元) 經過信道並解碼。
+    同時把同樣的資訊位元不編碼直接送過信道，作為未編碼的對照。
+    回傳 [位元錯誤, 訊框錯誤, 未編碼位元錯誤, 未編碼訊框錯誤, 更正數, 偵測數]。
+    """
+    rng = np.random.default_rng(seed)
+    noise = CHANNELS[channel]
+    counts = np.zeros(6, dtype=np.int64)
+    for start in range(0, frames, chunk):
+        m = min(chunk, frames - start)
+        data = rng.integers(0, 2, (m, code.k), dtype=np.uint8)
+        decoded, corrected, detected = code.decode(noise(code.encode(data), param, rng))
+        errors = decoded != data
+        raw_errors = noise(data, param, rng) != data
+        counts += [errors.sum(), errors.any(axis=1).sum(),
+                   raw_errors.sum(), raw_errors.any(axis=1).sum(), corrected, detected]
+    return counts
+
+
+def simulate(code, points, frames=1_000_000, channel="bsc", workers=None, seed=None, chunk=1 << 15):
+    """
+    對每個信道參數做 Monte Carlo 模擬，回傳每個點一個 dict。
+    channel="bsc" 時 points 為翻轉機率 p；channel="awgn" 時為每個通道位元的 Es/N0 (dB)，
+    並以硬判決的等效翻轉機率計算容量。
+    訊框平均分給 workers 個行程，每個 (點, 行程) 使用獨立的 SeedSequence 子流。
+    """
+    if channel not in CHANNELS:
+        raise ValueError(f"未知的信道 {channel!r}，可用: {sorted(CHANNELS)}")
+    workers = workers or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed).spawn(len(points) * workers)
+    counts = [frames // workers + (i < frames % workers) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [[pool.submit(_simulate_worker, code, channel, param, seeds[i * workers + j], n, chunk)
+                    for j, n in enumerate(counts) if n]
+                   for i, param in enumerate(points)]
+        totals = [sum(f.result() for f in row) for row in futures]
+
+    results = []
+    info_bits = frames * code.k
+    for param, t in zip(points, totals):
+        p = param if channel == "bsc" else awgn_crossover(param)
+        results.append({
+            "param": param,
+            "p": p,
+            "capacity": bsc_capacity(p),
+            "rate": code.rate,
+            "ber": t[0] / info_bits,
+            "fer": t[1] / frames,
+            "uncoded_ber": t[2] / info_bits,
+            "uncoded_fer": t[3] / frames,
+            "corrected": int(t[4]),
+            "detected": int(t[5]),
+        })
+    return results
+
+
+def print_results(code, channel, results):
+    print(f"{code} (碼率 R = {code.rate:.3f})，信道: {channel}")
+    head = "" if channel == "bsc" else f"{'Es/N0(dB)':>10} "
+    print(f"{head}{'p':>9} {'C':>7} {'uncoded BER':>12} {'BER':>11} {'uncoded FER':>12} {'FER':>11}")
+    for r in results:
+        head = "" if channel == "bsc" else f"{r['param']:10.2f} "
+        mark = "" if r["rate"] < r["capacity"] else "  (R >= C)"
+        print(f"{head}{r['p']:9.3g} {r['capacity']:7.4f} {r['uncoded_ber']:12.3e} {r['ber']:11.3e} "
+              f"{r['uncoded_fer']:12.3e} {r['fer']:11.3e}{mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="漢明碼在 BSC / AWGN (硬判決) 信道上的 BER / FER 模擬")
+    parser.add_argument("-r", type=int, default=3, help="漢明碼參數 r，碼長 2^r - 1 (預設 3，即 (7,4))")
+    parser.add_argument("--secded", action="store_true", help="使用延伸的 SECDED 碼")
+    parser.add_argument("--channel", choices=sorted(CHANNELS), default="bsc")
+    parser.add_argument("--points", type=float, nargs="+",
+                        help="BSC 為翻轉機率 p，AWGN 為 Es/N0 (dB)")
+    parser.add_argument("--frames", type=int, default=1_000_000, help="每個點的訊框數")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    points = args.points
+    if points is None:
+        points = [0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.001] if args.channel == "bsc" else [0, 2, 4, 6, 8, 10]
+    code = hamming_code(args.r, args.secded)
+    results = simulate(code, points, args.frames, args.channel, args.workers, args.seed)
+    print_results(code, args.channel, results)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,252 @@
+import os
+import sys
+import numpy as np
+
+# 分段讀取時每段的大小 (bytes)
+CHUNK_BYTES = 1 << 22
+# 滑動視窗每次最多一起處理的 (區塊 x 符號) 直方圖格數，限制暫存陣列的大小
+SLIDING_CELLS = 1 << 16
+
+
+def _xlogx(x):
+    """x log2 x，0 log 0 = 0"""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.zeros_like(x)
+    np.multiply(x, np.log2(x, out=np.ones_like(x), where=x > 0), out=out, where=x > 0)
+    return out
+
+
+def iter_chunks(source, chunk=CHUNK_BYTES):
+    """
+    把各種來源統一成一段一段的符號陣列：
+    檔案路徑 (以記憶體映射讀取)、bytes / bytearray / memoryview、NumPy 陣列，
+    或是逐段產生 bytes / 陣列的 iterable (例如 generator、socket 讀取迴圈)。
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if os.path.getsize(source) == 0:
+            return
+        data = np.memmap(source, dtype=np.uint8, mode="r")
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        data = np.frombuffer(source, dtype=np.uint8)
+    elif isinstance(source, np.ndarray):
+        data = source.ravel()
+    else:
+        for block in source:
+            if isinstance(block, (bytes, bytearray, memoryview)):
+                block = np.frombuffer(block, dtype=np.uint8)
+            yield np.asarray(block).ravel()
+        return
+    for start in range(0, data.size, chunk):
+        yield data[start:start + chunk]
+
+
+def _check_symbols(symbols, alphabet):
+    if symbols.size and (symbols.min() < 0 or symbols.max() >= alphabet):
+        raise ValueError(f"符號必須在 [0, {alphabet}) 之內")
+
+
+def _histogram(symbols, alphabet):
+    _check_symbols(symbols, alphabet)
+    return np.bincount(symbols, minlength=alphabet)
+
+
+class StreamingEntropy:
+    """
+    逐段累積符號直方圖並即時更新 H(P)、H(P, Q)、D_KL(P || Q) (單位 bits)。
+    只保存長度為 alphabet 的計數，記憶體與輸入長度無關。
+    令 N 為總符號數、c_i 為計數：
+        H(P)    = log N - (sum c_i log c_i) / N
+        H(P, Q) = -(sum c_i log q_i) / N
+    兩個總和在每段資料進來時只針對出現過的符號增量更新。
+    q 為參考分佈 (長度 alphabet)，不給時只計算 H(P)。
+    """
+    def __init__(self, alphabet=256, q=None):
+        self.alphabet = alphabet
+        self.counts = np.zeros(alphabet, dtype=np.int64)
+        self.total = 0
+        self._sum_clogc = 0.0
+        self.set_reference(q)
+
+    def set_reference(self, q):
+        """更換參考分佈 Q；以目前的計數重算 sum c_i log q_i (O(alphabet))"""
+        if q is None:
+            self.q = None
+            self._log_q = None
+            self._sum_clogq = 0.0
+            return
+        q = np.asarray(q, dtype=np.float64)
+        if q.shape != (self.alphabet,):
+            raise ValueError(f"參考分佈的長度必須是 {self.alphabet}")
+        self.q = q / q.sum()
+        with np.errstate(divide="ignore"):
+            self._log_q = np.log2(self.q)
+        self._sum_clogq = self._dot_log_q(self.counts)
+
+    def _dot_log_q(self, counts):
+        # c_i > 0 但 q_i = 0 時為 -inf (交叉熵與 KL 為無窮大)；c_i = 0 的項不計
+        used = counts > 0
+        return float(np.sum(counts[used] * self._log_q[used]))
+
+    def update(self, symbols):
+        """加入一段符號 (bytes 或整數陣列)"""
+        if isinstance(symbols, (bytes, bytearray, memoryview)):
+            symbols = np.frombuffer(symbols, dtype=np.uint8)
+        symbols = np.asarray(symbols).ravel()
+        if symbols.size == 0:
+            return self
+        hist = _histogram(symbols, self.alphabet)
+        touched = np.flatnonzero(hist)
+        old = self.counts[touched]
+        new = old + hist[touched]
+        self._sum_clogc += float(np.sum(_xlogx(new) - _xlogx(old)))
+        self.counts[touched] = new
+        self.total += int(symbols.size)
+        if self._log_q is not None:
+            self._sum_clogq += self._dot_log_q(hist)
+        return self
+
+    def consume(self, source, chunk=CHUNK_BYTES):
+        """讀完整個來源 (見 iter_chunks)，回傳 self"""
+        for block in iter_chunks(source, chunk):
+            self.update(block)
+        return self
+
+    def probabilities(self):
+        if self.total == 0:
+            return np.zeros(self.alphabet)
+        return self.counts / self.total
+
+    @property
+    def entropy(self):
+        if self.total == 0:
+            return 0.0
+        return max(0.0, np.log2(self.total) - self._sum_clogc / self.total)
+
+    @property
+    def cross_entropy(self):
+        if self._log_q is None:
+            raise ValueError("沒有設定參考分佈 Q")
+        if self.total == 0:
+            return 0.0
+        return -self._sum_clogq / self.total
+
+    @property
+    def kl_divergence(self):
+        return self.cross_entropy - self.entropy
+
+
+class SlidingWindowEntropy:
+    """
+    滑動視窗熵：每前進 step 個符號回報最近 window 個符號的熵 (bits)，可用來偵測資料分佈的漂移。
+    window 必須是 step 的倍數；內部只保存最近 window / step 個區塊的直方圖
+    (O(alphabet * window / step))，與輸入總長度無關。
+    每段資料分批處理 (每批 SLIDING_CELLS / alphabet 個區塊)，一批中的所有視窗以區塊直方圖的累加和一次算出，
+    不逐個符號處理；暫存的直方圖因此是 O(alphabet * window / step + SLIDING_CELLS)，與每段的長度無關。
+    """
+    def __init__(self, window, step=None, alphabet=256):
+        step = step or window
+        if window % step:
+            raise ValueError("window 必須是 step 的倍數")
+        self.window = window
+        self.step = step
+        self.alphabet = alphabet
+        self._blocks = np.zeros((window // step, alphabet), dtype=np.int64)
+        self._pending = np.zeros(0, dtype=np.int64)
+        self._num_blocks = 0
+        # 每批處理的區塊數：暫存的直方圖約 (window / step + batch) * alphabet 格
+        self._batch = max(1, SLIDING_CELLS // alphabet)
+
+    def update(self, symbols):
+        """
+        加入一段符號，回傳 (ends, entropies)：
+        ends 為這段資料中每個完整視窗的結束位置 (從串流開頭算起的符號數)，entropies 為對應的熵。
+        """
+        if isinstance(symbols, (bytes, bytearray, memoryview)):
+            symbols = np.frombuffer(symbols, dtype=np.uint8)
+        symbols = np.concatenate([self._pending, np.asarray(symbols, dtype=np.int64).ravel()])
+        s = self.step
+        nb = symbols.size // s
+        self._pending = symbols[nb * s:]
+        body = symbols[:nb * s]
+        _check_symbols(body, self.alphabet)
+        # 分批處理，每批最多 self._batch 個區塊，self._blocks 在批次之間延續
+        results = [self._update_blocks(body[start * s:(start + self._batch) * s])
+                   for start in range(0, nb, self._batch)]
+        if not results:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+    def _update_blocks(self, body):
+        """body 的長度為 step 的倍數，回傳以其中每個區塊結尾的視窗的 (ends, entropies)"""
+        s, k, m = self.step, self.alphabet, self._blocks.shape[0]
+        nb = body.size // s
+        # 每個區塊的直方圖：把 (區塊編號, 符號) 攤平成一維後一次 bincount
+        new = np.bincount(np.repeat(np.arange(nb) * k, s) + body, minlength=nb * k).reshape(nb, k)
+        blocks = np.vstack([self._blocks, new])
+        cum = np.zeros((blocks.shape[0] + 1, k), dtype=np.int64)
+        np.cumsum(blocks, axis=0, out=cum[1:])
+        # 以第 t 個區塊結尾的視窗計數 = cum[t+1] - cum[t+1-m]
+        windows = cum[m + 1:] - cum[1:nb + 1]
+        entropies = np.log2(self.window) - _xlogx(windows).sum(axis=1) / self.window
+
+        ends = (self._num_blocks + np.arange(1, nb + 1)) * s
+        # 還沒累積滿一個視窗之前的結果不回報
+        full = ends >= self.window
+        self._blocks = blocks[-m:]
+        self._num_blocks += nb
+        return ends[full], np.maximum(entropies[full], 0.0)
+
+    def consume(self, source, chunk=CHUNK_BYTES):
+        """讀完整個來源，回傳所有視窗的 (ends, entropies)"""
+        results = [self.update(block) for block in iter_chunks(source, chunk)]
+        if not results:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+
+def drift_points(ends, entropies, threshold):
+    """相鄰兩個視窗的熵變化超過 threshold (bits) 的位置"""
+    jumps = np.abs(np.diff(entropies)) > threshold
+    return ends[1:][jumps]
+
+
+def file_entropy(path, chunk=CHUNK_BYTES):
+    """檔案的逐 byte 熵 (bits / byte)"""
+    return StreamingEntropy(256).consume(path, chunk).entropy
+
+
+if __name__ == "__main__":
+    import time
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            t0 = time.perf_counter()
+            h = file_entropy(path)
+            dt = time.perf_counter() - t0
+            print(f"{path}: {h:.4f} bits/byte ({os.path.getsize(path) / 1e6 / max(dt, 1e-9):.0f} MB/s)")
+        sys.exit()
+
+    rng = np.random.default_rng(0)
+
+    # 以 generator 模擬資料流：前半段接近均勻，後半段集中在少數符號
+    def stream(num_chunks=64, size=1 << 20):
+        for i in range(num_chunks):
+            if i < num_chunks // 2:
+                yield rng.integers(0, 256, size, dtype=np.uint8).tobytes()
+            else:
+                yield rng.choice(16, size).astype(np.uint8).tobytes()
+
+    uniform = np.full(256, 1 / 256)
+    est = StreamingEntropy(256, q=uniform)
+    t0 = time.perf_counter()
+    est.consume(stream())
+    dt = time.perf_counter() - t0
+    print(f"64 MB 資料流: {64 / dt:.0f} MB/s")
+    print(f"H(P) = {est.entropy:.4f}, H(P, U) = {est.cross_entropy:.4f}, D_KL(P || U) = {est.kl_divergence:.4f}")
+    p = est.probabilities()
+    direct = -np.sum(p[p > 0] * np.log2(p[p > 0]))
+    print(f"直接由直方圖計算的 H(P) = {direct:.4f}")
+
+    sliding = SlidingWindowEntropy(window=1 << 20, step=1 << 18)
+    ends, ent = sliding.consume(stream(), chunk=1 << 20)
+    print(f"滑動視窗: {ends.size} 個視窗，熵由 {ent[0]:.3f} 降到 {ent[-1]:.3f} bits")
+    print(f"漂移位置 (熵變化 > 0.5 bits): {drift_points(ends, ent, 0.5).tolist()}")
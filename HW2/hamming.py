@@ -0,0 +1,320 @@
+import os
+from functools import lru_cache
+import numpy as np
+
+# 與 5.py 相同的 (7,4) 漢明碼：G = [I_4 | P]，H = [P^T | I_3]
+G = np.array([
+    [1, 0, 0, 0, 1, 1, 0],
+    [0, 1, 0, 0, 1, 0, 1],
+    [0, 0, 1, 0, 0, 1, 1],
+    [0, 0, 0, 1, 1, 1, 1]
+], dtype=np.uint8)
+
+H = np.array([
+    [1, 1, 0, 1, 1, 0, 0],
+    [1, 0, 1, 1, 0, 1, 0],
+    [0, 1, 1, 1, 0, 0, 1]
+], dtype=np.uint8)
+
+# 位元與整數的對應：碼字第 i 位 (c_0..c_6) 放在整數的第 6-i 個位元 (c_0 為最高位)，
+# 與 np.unpackbits / np.packbits 的大端順序一致；資料 nibble 同理 (d_0 為最高位)。
+_CODE_WEIGHTS = 1 << np.arange(6, -1, -1)
+
+
+def _build_tables():
+    # 編碼表：16 個 nibble -> 7 位元碼字
+    nibbles = (np.arange(16)[:, None] >> np.arange(3, -1, -1)) & 1
+    encode = (nibbles @ G % 2) @ _CODE_WEIGHTS
+
+    # 校驗子 s = H c^T，以 3 位元整數表示 (s_0 為最高位)；對 128 個可能的碼字先算好
+    codewords = (np.arange(128)[:, None] >> np.arange(6, -1, -1)) & 1
+    syndrome = (codewords @ H.T % 2) @ np.array([4, 2, 1])
+
+    # 校驗子表：syndrome (3 位元) -> 要翻轉的位元遮罩；0 表示沒有錯誤
+    correction = np.zeros(8, dtype=np.int64)
+    for i in range(7):
+        s = int(H[:, i] @ np.array([4, 2, 1]))
+        correction[s] = 1 << (6 - i)
+    return encode.astype(np.uint8), syndrome.astype(np.uint8), correction.astype(np.uint8)
+
+
+# ENCODE_TABLE[d]      nibble d 的碼字 (16 項)
+# SYNDROME_TABLE[c]    碼字 c 的校驗子 (128 項)
+# CORRECTION_TABLE[s]  校驗子 s 對應要翻轉的位元 (8 項)
+# 以下兩張由小表衍生，讓整段 bytes 每個 byte 只需一次 gather：
+# BYTE_ENCODE_TABLE[b] 一個 byte 的高、低 nibble 各自編碼後接成的 14 位元 (256 項)
+# PAIR_DECODE_TABLE[w] 14 位元 (兩個碼字) 更正後還原的 byte；PAIR_ERROR_TABLE[w] 為其中更正的碼字數 (16384 項)
+ENCODE_TABLE, SYNDROME_TABLE, CORRECTION_TABLE = _build_tables()
+BYTE_ENCODE_TABLE = (ENCODE_TABLE.astype(np.uint16)[np.arange(256) >> 4] << 7) | ENCODE_TABLE[np.arange(256) & 0x0F]
+
+_pair = np.arange(1 << 14)
+_high, _low = _pair >> 7, _pair & 0x7F
+PAIR_DECODE_TABLE = (((_high ^ CORRECTION_TABLE[SYNDROME_TABLE[_high]]) >> 3) << 4
+                     | ((_low ^ CORRECTION_TABLE[SYNDROME_TABLE[_low]]) >> 3)).astype(np.uint8)
+PAIR_ERROR_TABLE = ((SYNDROME_TABLE[_high] != 0).astype(np.uint8) + (SYNDROME_TABLE[_low] != 0))
+
+
+def encode_codewords(nibbles):
+    """4 位元資料 (uint8 陣列) -> 7 位元碼字 (uint8 陣列)，一次查表"""
+    return ENCODE_TABLE[np.asarray(nibbles, dtype=np.uint8)]
+
+
+def decode_codewords(codewords):
+    """
+    7 位元碼字 -> (4 位元資料, 更正的碼字數)。
+    每個碼字最多更正 1 個位元；兩個以上的錯誤會被誤判 (漢明碼的極限)。
+    """
+    codewords = np.asarray(codewords, dtype=np.uint8)
+    s = SYNDROME_TABLE[codewords]
+    corrected = codewords ^ CORRECTION_TABLE[s]
+    # 系統碼：前 4 位就是資料
+    return corrected >> 3, int(np.count_nonzero(s))
+
+
+# 打包格式：每 4 個輸入 byte = 8 個碼字 = 56 位元 = 7 個輸出 byte (大端，第一個碼字在最高位)
+_SHIFTS = np.arange(42, -1, -14, dtype=np.uint64)
+
+
+def encoded_size(n):
+    """n bytes 編碼後的長度：2n 個 7 位元碼字"""
+    return (14 * n + 7) // 8
+
+
+def decoded_size(n):
+    """encoded_size 的反函數"""
+    return 4 * n // 7
+
+
+def _as_uint8(data):
+    if isinstance(data, np.ndarray):
+        return data.reshape(-1).view(np.uint8)
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def encode_bytes(data):
+    """
+    把 bytes (或 bytearray / memoryview / uint8 陣列) 以 (7,4) 漢明碼編碼。
+    每個 byte 拆成高、低兩個 nibble，各編成 7 位元，結果緊密打包成 bytes。
+    """
+    data = _as_uint8(data)
+    n = data.size
+    groups = -(-n // 4)
+    padded = np.zeros(groups * 4, dtype=np.uint8)
+    padded[:n] = data
+    # 每組 4 個 byte 的 14 位元編碼接成一個 56 位元整數
+    words = BYTE_ENCODE_TABLE[padded].astype(np.uint64).reshape(groups, 4)
+    packed = np.bitwise_or.reduce(words << _SHIFTS, axis=1)
+    out = packed.astype(">u8").view(np.uint8).reshape(groups, 8)[:, 1:]
+    return out.tobytes()[:encoded_size(n)]
+
+
+def decode_bytes(data):
+    """encode_bytes 的反運算，回傳 (原始 bytes, 更正的碼字數)"""
+    data = _as_uint8(data)
+    n = decoded_size(data.size)
+    groups = -(-data.size // 7)
+    padded = np.zeros(groups * 7, dtype=np.uint8)
+    padded[:data.size] = data
+    buf = np.zeros((groups, 8), dtype=np.uint8)
+    buf[:, 1:] = padded.reshape(groups, 7)
+    packed = buf.view(">u8").ravel().astype(np.uint64)
+    # 拆回 4 個 14 位元單位 (每個單位是原本一個 byte 的兩個碼字)，再各查一次表
+    pairs = ((packed[:, None] >> _SHIFTS) & 0x3FFF).astype(np.intp).ravel()[:n]
+    corrected = int(np.sum(PAIR_ERROR_TABLE[pairs], dtype=np.int64))
+    return PAIR_DECODE_TABLE[pairs].tobytes(), corrected
+
+
+# 分段處理檔案時每段的大小：編碼端為 4 的倍數 (-> 7 bytes 對齊)，解碼端為 7 的倍數
+CHUNK_BYTES = 1 << 22
+
+
+def _map_file(path):
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r")
+
+
+def encode_file(src, dst, chunk=CHUNK_BYTES):
+    """以記憶體映射逐段讀取 src 並把編碼結果寫到 dst，回傳寫入的 bytes 數"""
+    chunk -= chunk % 4
+    data = _map_file(src)
+    written = 0
+    with open(dst, "wb") as out:
+        for start in range(0, data.size, chunk):
+            block = encode_bytes(data[start:start + chunk])
+            out.write(block)
+            written += len(block)
+    return written
+
+
+def decode_file(src, dst, chunk=CHUNK_BYTES):
+    """decode_file(src, dst) -> (寫入的 bytes 數, 更正的碼字數)"""
+    chunk = max(7, chunk - chunk % 7)
+    data = _map_file(src)
+    written = corrected = 0
+    with open(dst, "wb") as out:
+        for start in range(0, data.size, chunk):
+            block, c = decode_bytes(data[start:start + chunk])
+            out.write(block)
+            written += len(block)
+            corrected += c
+    return written, corrected
+
+
+class HammingCode:
+    """
+    漢明碼 (2^r-1, 2^r-r-1)；extended=True 時再加一個整體奇偶位元成為 SECDED (2^r, 2^r-r-1)，
+    可更正 1 個錯誤並偵測 (不更正) 2 個錯誤。
+    碼字為系統碼 [資料 k 位 | 校驗 r 位 | (整體奇偶 1 位)]，G = [I_k | P]，H = [P^T | I_r]。
+    P^T 的各行是所有權重 >= 2 的 r 位元向量 (依權重、再依數值由大到小排列)，r = 3 時與 5.py 的 G、H 相同。
+    校驗子表在建構時算好一次：syndrome (整數) -> 錯誤位置，解碼時每個碼字只查一次表。
+    encode / decode 接受形狀 (N, k) / (N, n) 的 0/1 陣列 (或長度為 k / n 倍數的一維陣列)。
+    """
+    def __init__(self, r, extended=False):
+        if r < 2:
+            raise ValueError("漢明碼需要 r >= 2")
+        self.r = r
+        self.extended = extended
+        self.k = 2 ** r - r - 1
+        self.n = 2 ** r - 1 + (1 if extended else 0)
+
+        # 校驗子以整數表示時 s_0 為最高位
+        self._weights = 1 << np.arange(r - 1, -1, -1)
+        columns = [v for v in range(1, 2 ** r) if v & (v - 1)]
+        columns.sort(key=lambda v: (bin(v).count("1"), -v))
+        P = ((np.array(columns)[:, None] >> np.arange(r - 1, -1, -1)) & 1).astype(np.uint8)  # (k, r)
+        self.P = P
+        self.G = np.hstack([np.eye(self.k, dtype=np.uint8), P])
+        self.H = np.hstack([P.T, np.eye(r, dtype=np.uint8)])
+        if extended:
+            # 整體奇偶位元讓每個碼字的 1 的個數為偶數
+            parity = self.G.sum(axis=1, keepdims=True) % 2
+            self.G = np.hstack([self.G, parity])
+
+        # 校驗子表：syndrome -> 錯誤位置 (-1 表示沒有錯誤)；漢明碼是完美碼，每個非零 syndrome 都對應一個位置
+        table = np.full(2 ** r, -1, dtype=np.intp)
+        table[self.H.T.astype(np.intp) @ self._weights] = np.arange(2 ** r - 1)
+        self.syndrome_table = table
+
+    def __repr__(self):
+        name = "SECDED" if self.extended else "Hamming"
+        return f"{name}({self.n},{self.k})"
+
+    @property
+    def rate(self):
+        return self.k / self.n
+
+    @property
+    def min_distance(self):
+        return 4 if self.extended else 3
+
+    @staticmethod
+    def _as_words(bits, width):
+        bits = np.asarray(bits, dtype=np.uint8)
+        if bits.ndim == 1:
+            if bits.size % width:
+                raise ValueError(f"一維輸入的長度必須是 {width} 的倍數，實際為 {bits.size}")
+            bits = bits.reshape(-1, width)
+        if bits.shape[-1] != width:
+            raise ValueError(f"最後一維必須是 {width}，實際為 {bits.shape[-1]}")
+        return bits.reshape(-1, width)
+
+    @staticmethod
+    def _mod2_matmul(a, b):
+        # 以 float32 做矩陣乘法 (走 BLAS)，和不超過 2^24 時結果是精確的整數
+        return (a.astype(np.float32) @ b.astype(np.float32)).astype(np.int64) & 1
+
+    def encode(self, data):
+        """(N, k) 資料位元 -> (N, n) 碼字"""
+        data = self._as_words(data, self.k)
+        parity = self._mod2_matmul(data, self.G[:, self.k:]).astype(np.uint8)
+        return np.hstack([data, parity])
+
+    def syndromes(self, codewords):
+        """(N, n) 碼字 -> 每個碼字的校驗子 (整數)，只看前 2^r-1 位"""
+        codewords = self._as_words(codewords, self.n)
+        return self._mod2_matmul(codewords[:, :2 ** self.r - 1], self.H.T) @ self._weights
+
+    def decode(self, codewords):
+        """
+        (N, n) 碼字 -> (資料 (N, k), 更正的碼字數, 偵測到但無法更正的碼字數)。
+        一般漢明碼無法偵測雙錯誤 (會被誤更正)，第三個值恆為 0；
+        SECDED 偵測到雙錯誤時不更動該碼字。
+        """
+        received = self._as_words(codewords, self.n)
+        s = self.syndromes(received)
+        position = self.syndrome_table[s]
+        detected = 0
+        if self.extended:
+            overall = received.sum(axis=1, dtype=np.int64) & 1
+            # 整體奇偶錯但 syndrome 為 0：錯在整體奇偶位元本身，不影響資料
+            # syndrome 非 0 但整體奇偶正確：雙錯誤
+            double = (s != 0) & (overall == 0)
+            detected = int(np.count_nonzero(double))
+            corrected = int(np.count_nonzero(overall))
+            position = np.where(double, -1, position)
+        else:
+            corrected = int(np.count_nonzero(s))
+        rows = np.flatnonzero((position >= 0) & (position < self.k))
+        data = received[:, :self.k].copy()
+        data[rows, position[rows]] ^= 1
+        return data, corrected, detected
+
+
+@lru_cache(maxsize=None)
+def hamming_code(r, extended=False):
+    """取得 (快取的) HammingCode 實例，同樣的參數不會重建矩陣與校驗子表"""
+    return HammingCode(r, extended)
+
+
+def benchmark(size=1 << 24, seed=0):
+    """對 size bytes 的隨機資料量測編碼 / 解碼速度，並在部分碼字翻轉 1 個位元"""
+    import time
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 256, size, dtype=np.uint8).tobytes()
+
+    t0 = time.perf_counter()
+    encoded = encode_bytes(data)
+    t_enc = time.perf_counter() - t0
+
+    # 每 8 個碼字 (7 bytes) 一組，隨機挑一半的組翻轉其中第一個碼字的某一位元
+    noisy = np.frombuffer(encoded, dtype=np.uint8).copy()
+    groups = noisy.size // 7
+    hit = np.flatnonzero(rng.random(groups) < 0.5)
+    noisy[hit * 7] ^= (1 << rng.integers(1, 8, hit.size)).astype(np.uint8)
+
+    t0 = time.perf_counter()
+    decoded, corrected = decode_bytes(noisy)
+    t_dec = time.perf_counter() - t0
+
+    mb = size / 1e6
+    print(f"資料 {mb:.1f} MB -> 編碼後 {len(encoded) / 1e6:.1f} MB")
+    print(f"編碼: {mb / t_enc:.1f} MB/s, 解碼: {mb / t_dec:.1f} MB/s")
+    print(f"注入錯誤 {hit.size} 個, 更正 {corrected} 個, 還原正確: {decoded == data}")
+
+
+def benchmark_codes(num_bits=1 << 22, seed=0):
+    """比較不同 r 的漢明碼 / SECDED 的碼率與整批編碼、解碼速度 (每個碼字翻轉 1 個位元)"""
+    import time
+    rng = np.random.default_rng(seed)
+    for r in (3, 4, 5, 6):
+        for extended in (False, True):
+            code = hamming_code(r, extended)
+            words = num_bits // code.k
+            data = rng.integers(0, 2, (words, code.k), dtype=np.uint8)
+            t0 = time.perf_counter()
+            cw = code.encode(data)
+            t_enc = time.perf_counter() - t0
+            cw[np.arange(words), rng.integers(0, code.n, words)] ^= 1
+            t0 = time.perf_counter()
+            decoded, corrected, _ = code.decode(cw)
+            t_dec = time.perf_counter() - t0
+            mbit = words * code.k / 1e6
+            print(f"{str(code):>16}: 碼率 {code.rate:.3f}, 編碼 {mbit / t_enc:6.1f} Mbit/s, "
+                  f"解碼 {mbit / t_dec:6.1f} Mbit/s, 全部更正: {corrected == words and np.array_equal(decoded, data)}")
+
+
+if __name__ == "__main__":
+    benchmark()
+    print()
+    benchmark_codes()
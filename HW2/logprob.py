@@ -0,0 +1,214 @@
+import math
+import numpy as np
+from entropy_stream import iter_chunks
+
+LN2 = math.log(2)
+
+
+# --- 補償求和 ---
+def _two_sum(a, b):
+    """s = fl(a + b) 以及捨入誤差 e，a + b = s + e (Knuth TwoSum，逐元素)"""
+    s = a + b
+    bb = s - a
+    e = (a - (s - bb)) + (b - bb)
+    return s, e
+
+
+def pairwise_sum(x, axis=None):
+    """
+    兩兩相加的樹狀求和，誤差成長為 O(log N) 而不是 O(N)。
+    與 np.sum 不同，不論 axis 是否為記憶體連續的軸都保證是樹狀順序。
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if axis is None:
+        x = x.ravel()
+        axis = 0
+    x = np.moveaxis(x, axis, 0)
+    while x.shape[0] > 1:
+        if x.shape[0] % 2:
+            x = np.concatenate([x, np.zeros_like(x[:1])])
+        x = x[0::2] + x[1::2]
+    return x[0] if x.shape[0] else np.zeros(x.shape[1:])
+
+
+def compensated_sum(x, axis=None):
+    """
+    補償求和：兩兩相加時以 TwoSum 記下每一步的捨入誤差，最後把誤差加回去。
+    結果約等於以兩倍精度累加後再捨入 (與 math.fsum 同等級)，但全部是向量化運算。
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if axis is None:
+        x = x.ravel()
+        axis = 0
+    x = np.moveaxis(x, axis, 0)
+    plain = np.sum(x, axis=0)
+    errors = np.zeros(x.shape[1:])
+    with np.errstate(invalid="ignore"):
+        while x.shape[0] > 1:
+            if x.shape[0] % 2:
+                x = np.concatenate([x, np.zeros_like(x[:1])])
+            x, e = _two_sum(x[0::2], x[1::2])
+            # 誤差本身很小，以 pairwise 累加就足夠
+            errors = errors + pairwise_sum(e, axis=0)
+        total = (x[0] if x.shape[0] else np.zeros(x.shape[1:])) + errors
+    # 含 inf (例如 log 0 = -inf) 時誤差項沒有意義，直接採用一般加總的結果
+    return np.where(np.isfinite(plain), total, plain)[()]
+
+
+class KahanAccumulator:
+    """
+    跨多段資料累加 (Neumaier 版的 Kahan 求和)：每段先以 compensated_sum 加總，
+    段與段之間再以補償項累加，避免長串流的總和因逐段捨入而漂移。
+    """
+    __slots__ = ("total", "compensation", "count")
+
+    def __init__(self):
+        self.total = 0.0
+        self.compensation = 0.0
+        self.count = 0
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.count += values.size
+        value = float(compensated_sum(values)) if values.ndim else float(values)
+        t = self.total + value
+        if not math.isfinite(t):
+            # 出現 ±inf (例如機率為 0 的符號) 後補償項沒有意義
+            self.total = t
+            return self
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - t) + value
+        else:
+            self.compensation += (value - t) + self.total
+        self.total = t
+        return self
+
+    @property
+    def value(self):
+        return self.total + self.compensation
+
+
+# --- 對數空間運算 (自然對數) ---
+def log_product(p, axis=None, log_input=False):
+    """
+    log(prod p_i) = sum log p_i，以補償求和累加；任一 p_i = 0 時為 -inf。
+    log_input=True 時 p 已是 log p。
+    """
+    if log_input:
+        log_p = np.asarray(p, dtype=np.float64)
+    else:
+        with np.errstate(divide="ignore"):
+            log_p = np.log(np.asarray(p, dtype=np.float64))
+    return compensated_sum(log_p, axis)
+
+
+def logsumexp(a, axis=None, keepdims=False, b=None):
+    """
+    log(sum b_i exp(a_i))，先減去最大值再取 exp，不會上溢或下溢。
+    全部為 -inf 時回傳 -inf；b 為可選的權重 (需為非負)。
+    """
+    a = np.asarray(a, dtype=np.float64)
+    m = np.max(a, axis=axis, keepdims=True)
+    # 整列都是 -inf (或有 +inf) 時改以 0 平移，避免 inf - inf
+    m = np.where(np.isfinite(m), m, 0.0)
+    with np.errstate(divide="ignore"):
+        e = np.exp(a - m)
+        if b is not None:
+            e = e * np.asarray(b, dtype=np.float64)
+        result = np.log(np.sum(e, axis=axis, keepdims=True)) + m
+    if not keepdims:
+        result = np.squeeze(result, axis=axis) if axis is not None else result.reshape(())
+    return result[()] if result.ndim == 0 else result
+
+
+def log_add(a, b):
+    """log(exp(a) + exp(b))，逐元素"""
+    return np.logaddexp(a, b)
+
+
+def log_mixture(log_weights, log_likelihoods, axis=-1):
+    """混合模型的對數概似 log(sum_k w_k p_k(x))，log_weights 沿 axis 廣播"""
+    return logsumexp(np.asarray(log_weights) + np.asarray(log_likelihoods), axis=axis)
+
+
+def to_bits(log_value):
+    """自然對數 -> 以 2 為底"""
+    return np.asarray(log_value) / LN2 if np.ndim(log_value) else log_value / LN2
+
+
+class SequenceLogLikelihood:
+    """
+    逐段累加符號序列的對數概似 sum log P(x_t)。
+    給定每個符號的機率表 probs (長度為字母表大小)，每段只做一次 gather 與一次補償求和，
+    段與段之間以 KahanAccumulator 累加，適合數百萬以上長度的序列。
+    """
+    def __init__(self, probs=None, log_probs=None):
+        if log_probs is None:
+            if probs is None:
+                raise ValueError("必須提供 probs 或 log_probs")
+            with np.errstate(divide="ignore"):
+                log_probs = np.log(np.asarray(probs, dtype=np.float64))
+        self.log_probs = np.asarray(log_probs, dtype=np.float64)
+        self._acc = KahanAccumulator()
+
+    def update(self, symbols):
+        """加入一段符號 (bytes 或整數陣列)"""
+        if isinstance(symbols, (bytes, bytearray, memoryview)):
+            symbols = np.frombuffer(symbols, dtype=np.uint8)
+        self._acc.add(self.log_probs[np.asarray(symbols)])
+        return self
+
+    def update_log_probs(self, log_p):
+        """直接加入一段逐步的 log P(x_t) (例如來自條件模型)"""
+        self._acc.add(log_p)
+        return self
+
+    def consume(self, source, chunk=1 << 22):
+        for block in iter_chunks(source, chunk):
+            self.update(block)
+        return self
+
+    @property
+    def length(self):
+        return self._acc.count
+
+    @property
+    def log_likelihood(self):
+        return self._acc.value
+
+    @property
+    def bits_per_symbol(self):
+        """平均每個符號的負對數概似 (bits)"""
+        return -to_bits(self.log_likelihood) / self.length if self.length else 0.0
+
+
+if __name__ == "__main__":
+    import time
+
+    print("--- logsumexp ---")
+    a = np.array([-1000.0, -1000.0, -1001.0])
+    with np.errstate(divide="ignore"):
+        naive = np.log(np.sum(np.exp(a)))
+    print(f"直接計算 log(sum(exp(a))) = {naive}, logsumexp = {logsumexp(a):.6f}")
+
+    print("\n--- 一千萬個 log p 的求和精度 (與 math.fsum 的精確結果比較) ---")
+    rng = np.random.default_rng(0)
+    x = np.log(rng.random(10_000_000))
+    exact = math.fsum(x)
+    print(f"逐項累加 (cumsum) 誤差: {abs(np.cumsum(x)[-1] - exact):.3e}")
+    print(f"np.sum 誤差:            {abs(np.sum(x) - exact):.3e}")
+    t0 = time.perf_counter()
+    c = compensated_sum(x)
+    dt = time.perf_counter() - t0
+    print(f"compensated_sum 誤差:   {abs(c - exact):.3e} ({dt * 1e3:.0f} ms)")
+
+    print("\n--- 長序列的對數概似 ---")
+    probs = np.array([0.5, 0.25, 0.125, 0.125])
+    seq = rng.choice(4, 50_000_000, p=probs).astype(np.uint8)
+    ll = SequenceLogLikelihood(probs)
+    t0 = time.perf_counter()
+    for start in range(0, seq.size, 1 << 22):
+        ll.update(seq[start:start + (1 << 22)])
+    dt = time.perf_counter() - t0
+    print(f"{ll.length} 個符號: log P = {ll.log_likelihood:.6e} ({ll.bits_per_symbol:.5f} bits/符號，熵 = 1.75)")
+    print(f"耗時 {dt:.2f}s")
@@ -0,0 +1,197 @@
+import numpy as np
+from geometry import Line, Circle
+from point_array import CircleArray
+
+# 與 intersect_line_line 相同的平行判斷門檻
+PARALLEL_EPS = 1e-9
+# pairwise 模式下每次計算的配對數
+BLOCK = 1 << 16
+
+
+# --- 輸入轉換 ---
+def as_line_coefficients(lines):
+    """Line 的 list、形狀 (N, 3) 的 [A, B, C] 陣列或 (A, B, C) 三個陣列 -> 三個 float 陣列"""
+    if isinstance(lines, Line):
+        lines = [lines]
+    if isinstance(lines, tuple) and len(lines) == 3 and not isinstance(lines[0], Line):
+        return tuple(np.asarray(v, dtype=np.float64) for v in lines)
+    if len(lines) and isinstance(lines[0], Line):
+        coef = np.array([(l.A, l.B, l.C) for l in lines], dtype=np.float64)
+    else:
+        coef = np.asarray(lines, dtype=np.float64)
+        if coef.size == 0:
+            coef = coef.reshape(-1, 3)
+    return coef[..., 0], coef[..., 1], coef[..., 2]
+
+
+def as_circle_arrays(circles):
+    """CircleArray、Circle 的 list、形狀 (M, 3) 的 [x, y, r] 陣列或 (x, y, r) 三個陣列 -> 圓心 x、y 與半徑三個 float 陣列"""
+    if isinstance(circles, Circle):
+        circles = [circles]
+    if isinstance(circles, tuple) and len(circles) == 3 and not isinstance(circles[0], Circle):
+        return tuple(np.asarray(v, dtype=np.float64) for v in circles)
+    if isinstance(circles, CircleArray):
+        return circles.centers.x, circles.centers.y, circles.radii
+    if len(circles) and isinstance(circles[0], Circle):
+        data = np.array([(c.center.x, c.center.y, c.radius) for c in circles], dtype=np.float64)
+    else:
+        data = np.asarray(circles, dtype=np.float64)
+        if data.size == 0:
+            data = data.reshape(-1, 3)
+    return data[..., 0], data[..., 1], data[..., 2]
+
+
+def _apply(kernel, first, second, pairwise):
+    """
+    pairwise=False：兩組參數逐元素對應 (依 NumPy 規則廣播)，直接呼叫 kernel。
+    pairwise=True：第一組的每個元素與第二組的每個元素配對，結果形狀為 first.shape + second.shape；
+    分塊計算 (每塊約 BLOCK 對)，中間陣列留在快取中，也不會一次配置 N x M 大小的暫存。
+    """
+    if not pairwise:
+        return kernel(*np.broadcast_arrays(*first, *second))
+    first, second = np.broadcast_arrays(*first), np.broadcast_arrays(*second)
+    shape1, shape2 = first[0].shape, second[0].shape
+    expand = (1,) * len(shape2)
+    flat = [v.reshape((-1,) + expand) for v in first]
+    n1, n2 = flat[0].shape[0], second[0].size
+    if n1 * n2 <= BLOCK:
+        parts = kernel(*np.broadcast_arrays(*flat, *second))
+        return tuple(p.reshape(shape1 + p.shape[1:]) for p in parts)
+    rows = max(1, BLOCK // max(n2, 1))
+    results = None
+    for start in range(0, n1, rows):
+        parts = kernel(*np.broadcast_arrays(*(v[start:start + rows] for v in flat), *second))
+        if results is None:
+            results = [np.empty((n1,) + p.shape[1:], dtype=p.dtype) for p in parts]
+        for r, p in zip(results, parts):
+            r[start:start + rows] = p
+    return tuple(r.reshape(shape1 + r.shape[1:]) for r in results)
+
+
+# --- 批次交點 ---
+def line_line(lines1, lines2, pairwise=False):
+    """
+    intersect_line_line 的向量化版本 (克拉瑪公式，|det| < 1e-9 視為平行)。
+    回傳 (points (..., 2), hit (...))；平行或重合的位置 hit 為 False、座標為 nan。
+    """
+    return _apply(_line_line, as_line_coefficients(lines1), as_line_coefficients(lines2), pairwise)
+
+
+def _line_line(A1, B1, C1, A2, B2, C2):
+    det = A1 * B2 - A2 * B1
+    hit = np.abs(det) >= PARALLEL_EPS
+    safe = np.where(hit, det, 1.0)
+    points = np.empty(det.shape + (2,))
+    points[..., 0] = (C1 * B2 - C2 * B1) / safe
+    points[..., 1] = (A1 * C2 - A2 * C1) / safe
+    points[~hit] = np.nan
+    return points, hit
+
+
+def line_circle(lines, circles, pairwise=False):
+    """
+    intersect_line_circle 的向量化版本：先求圓心到直線的垂足，再沿直線方向偏移 sqrt(r^2 - d^2)。
+    回傳 (points (..., 2, 2), counts (...))；counts 為 0、1 (相切) 或 2，超出 counts 的點為 nan。
+    點的順序與 intersect_line_circle 相同。A = B = 0 的退化直線視為不相交。
+    """
+    return _apply(_line_circle, as_line_coefficients(lines), as_circle_arrays(circles), pairwise)
+
+
+def _line_circle(A, B, C, x, y, r):
+    norm2 = A * A + B * B
+    valid = norm2 > 0
+    norm2 = np.where(valid, norm2, 1.0)
+    # 垂足 = 圓心 + s (A, B)，|s| sqrt(A^2 + B^2) 為圓心到直線的距離
+    s = (C - A * x - B * y) / norm2
+    length = np.sqrt(norm2)
+    d = np.abs(s) * length
+    counts = np.where(valid & (d <= r), np.where(d == r, 1, 2), 0)
+    t = np.sqrt(np.maximum(0.0, r * r - d * d)) / length
+    px, py = x + s * A, y + s * B
+    points = np.empty(counts.shape + (2, 2))
+    points[..., 0, 0], points[..., 0, 1] = px + t * B, py - t * A
+    points[..., 1, 0], points[..., 1, 1] = px - t * B, py + t * A
+    _mask(points, counts)
+    return points, counts
+
+
+def circle_circle(circles1, circles2, pairwise=False):
+    """
+    intersect_circle_circle 的向量化版本 (根軸的幾何法)。
+    回傳 (points (..., 2, 2), counts (...))；分離、內含或同心時 counts 為 0，
+    相切時為 1 (intersect_circle_circle 會回傳兩個相同的點)，超出 counts 的點為 nan。
+    """
+    return _apply(_circle_circle, as_circle_arrays(circles1), as_circle_arrays(circles2), pairwise)
+
+
+def _circle_circle(x1, y1, r1, x2, y2, r2):
+    dx, dy = x2 - x1, y2 - y1
+    d = np.hypot(dx, dy)
+    hit = (d <= r1 + r2) & (d >= np.abs(r1 - r2)) & (d > 0)
+    d = np.where(hit, d, 1.0)
+    a = (r1 * r1 - r2 * r2 + d * d) / (2 * d)
+    h = np.sqrt(np.maximum(0.0, r1 * r1 - a * a))
+    mx, my = x1 + a * dx / d, y1 + a * dy / d
+    ox, oy = h * dy / d, h * dx / d
+    counts = np.where(hit, np.where(h == 0, 1, 2), 0)
+    points = np.empty(counts.shape + (2, 2))
+    points[..., 0, 0], points[..., 0, 1] = mx + ox, my - oy
+    points[..., 1, 0], points[..., 1, 1] = mx - ox, my + oy
+    _mask(points, counts)
+    return points, counts
+
+
+def _mask(points, counts):
+    """超出交點數的位置填 nan"""
+    points[counts < 1, 0] = np.nan
+    points[counts < 2, 1] = np.nan
+
+
+if __name__ == "__main__":
+    import time
+    from geometry import Point, intersect_line_line, intersect_line_circle, intersect_circle_circle
+
+    rng = np.random.default_rng(0)
+
+    # 與逐對的版本比較
+    n = 300
+    lines = [Line(*row) for row in rng.normal(size=(n, 3)).tolist()]
+    circles = [Circle(Point(x, y), r) for x, y, r in zip(*rng.normal(size=(2, n)).tolist(), rng.uniform(0.5, 2, n).tolist())]
+
+    def same(batch_points, count, expected):
+        return count == len(expected) and np.allclose(batch_points[:count], [(p.x, p.y) for p in expected] or np.zeros((0, 2)))
+
+    p_ll, hit_ll = line_line(lines, lines, pairwise=True)
+    p_lc, cnt_lc = line_circle(lines, circles, pairwise=True)
+    p_cc, cnt_cc = circle_circle(circles, circles, pairwise=True)
+    ok = True
+    for i in range(n):
+        for j in range(n):
+            q = intersect_line_line(lines[i], lines[j])
+            ok &= (q is None) == (not hit_ll[i, j]) and (q is None or np.allclose(p_ll[i, j], (q.x, q.y)))
+            ok &= same(p_lc[i, j], cnt_lc[i, j], intersect_line_circle(lines[i], circles[j]))
+            cc = intersect_circle_circle(circles[i], circles[j])
+            ok &= same(p_cc[i, j], cnt_cc[i, j], cc[:cnt_cc[i, j]]) and (cnt_cc[i, j] > 0) == bool(cc)
+    print(f"{n} x {n} 對 (直線-直線、直線-圓、圓-圓) 與逐對函式一致: {ok}")
+
+    # 逐元素模式
+    p, cnt = line_circle(np.array([[0, 1, 3], [0, 1, 5], [0, 1, 6]]), np.array([[0, 0, 5]] * 3))
+    print(f"y = 3, 5, 6 與圓 x^2 + y^2 = 25 的交點數: {cnt.tolist()}")
+
+    print("\n=== 光線投射：直線 x 圓 ===")
+    for n_lines, n_circles in ((1000, 1000), (1000, 10000)):
+        coef = rng.normal(size=(n_lines, 3))
+        circ = np.column_stack([rng.normal(size=(n_circles, 2)), rng.uniform(0.1, 1, n_circles)])
+        t0 = time.perf_counter()
+        pts, cnt = line_circle(coef, circ, pairwise=True)
+        dt = time.perf_counter() - t0
+        m = n_lines * n_circles
+        line_objs = [Line(*row) for row in coef[:100].tolist()]
+        circle_objs = [Circle(Point(x, y), r) for x, y, r in circ[:100].tolist()]
+        t0 = time.perf_counter()
+        for l in line_objs:
+            for c in circle_objs:
+                intersect_line_circle(l, c)
+        t_loop = (time.perf_counter() - t0) * m / 10_000
+        print(f"{n_lines} 條直線 x {n_circles} 個圓 = {m:.0e} 次測試: 批次 {dt:.2f}s "
+              f"({m / dt / 1e6:.1f} M 次/秒)，逐對 (估計) {t_loop:.0f}s，命中 {np.count_nonzero(cnt)} 次")
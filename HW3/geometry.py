@@ -1,4 +1,5 @@
 import math
+from transform import Transform
 
 class Point:
     def __init__(self, x, y):
@@ -38,12 +39,40 @@ class Point:
         new_y = self.x * sin_theta + self.y * cos_theta
         self.x, self.y = new_x, new_y
 
+    # 套用任意仿射變換 (Transform)，立即修改座標
+    def transform(self, t):
+        x, y = t.apply_xy(self.x, self.y)
+        self.x, self.y = float(x), float(y)
+
 class Line:
     # 使用一般式 Ax + By = C
+    # 變換採延遲計算：translate / scale / rotate 只把變換合併進 _pending，
+    # 讀取 A、B、C (例如計算交點) 時才一次套用
     def __init__(self, A, B, C):
-        self.A = A
-        self.B = B
-        self.C = C
+        self._A = A
+        self._B = B
+        self._C = C
+        self._pending = None
+
+    def _flush(self):
+        if self._pending is not None:
+            self._A, self._B, self._C = self._pending.apply_line_coefficients(self._A, self._B, self._C)
+            self._pending = None
+
+    @property
+    def A(self):
+        self._flush()
+        return self._A
+
+    @property
+    def B(self):
+        self._flush()
+        return self._B
+
+    @property
+    def C(self):
+        self._flush()
+        return self._C
 
     def __repr__(self):
         return f"Line({self.A}x + {self.B}y = {self.C})"
@@ -55,46 +84,146 @@ class Line:
         B = p2.x - p1.x
         C = A * p1.x + B * p1.y
         return cls(A, B, C)
-    
-    # 變換：線的變換通常是通過變換其構成的點來實現
-    # 這裡簡化為重新定義，實際應用中會變換定義線的兩個點
+
+    # 變換：點以矩陣 M 變換時，直線係數 (A, B, -C) 以 M 的反轉置矩陣變換 (見 Transform.apply_line)，
+    # 不必先取線上兩點、變換後再重建直線
+    # 不可逆的變換在這裡就丟出 ValueError，而不是延遲到讀取係數時才失敗
+    def transform(self, t):
+        t.check_invertible()
+        pending = t if self._pending is None else self._pending.then(t)
+        pending.check_invertible()
+        self._pending = pending
+        return self
+
+    def translate(self, dx, dy):
+        return self.transform(Transform.translation(dx, dy))
+
+    def scale(self, sx, sy=None):
+        return self.transform(Transform.scaling(sx, sy))
+
+    def rotate(self, angle_degrees):
+        return self.transform(Transform.rotation(angle_degrees))
 
 class Circle:
+    # 變換同樣延遲到讀取 center / radius 時才套用
     def __init__(self, center: Point, radius):
-        self.center = center
-        self.radius = radius
+        self._center = center
+        self._radius = radius
+        self._pending = None
+
+    def _flush(self):
+        if self._pending is not None:
+            t, self._pending = self._pending, None
+            self._center.transform(t)
+            self._radius *= t.similarity_scale()
+
+    @property
+    def center(self):
+        self._flush()
+        return self._center
+
+    @property
+    def radius(self):
+        self._flush()
+        return self._radius
 
     def __repr__(self):
         return f"Circle(Center={self.center}, r={self.radius})"
 
-    # 圓的變換
+    # 圓的變換：只接受旋轉、均勻縮放與平移 (否則圓會變成橢圓)
+    def transform(self, t):
+        t.similarity_scale()
+        self._pending = t if self._pending is None else self._pending.then(t)
+        return self
+
     def translate(self, dx, dy):
-        self.center.translate(dx, dy)
+        return self.transform(Transform.translation(dx, dy))
 
     def scale(self, s):
         # 圓通常只進行均勻縮放
-        self.center.scale(s, s)
-        self.radius *= s
-        
+        return self.transform(Transform.scaling(s, s))
+
     def rotate(self, angle):
         # 圓自轉不變，但圓心位置會繞原點旋轉
-        self.center.rotate(angle)
+        return self.transform(Transform.rotation(angle))
 
 class Triangle:
+    # translate -> scale -> rotate 等連續變換先合併成一個矩陣，讀取頂點時每個點只變換一次
     def __init__(self, p1: Point, p2: Point, p3: Point):
-        self.points = [p1, p2, p3]
+        self._points = [p1, p2, p3]
+        self._pending = None
+
+    @property
+    def points(self):
+        if self._pending is not None:
+            t, self._pending = self._pending, None
+            for p in self._points: p.transform(t)
+        return self._points
 
     def __repr__(self):
         return f"Triangle({self.points[0]}, {self.points[1]}, {self.points[2]})"
 
+    def transform(self, t):
+        self._pending = t if self._pending is None else self._pending.then(t)
+        return self
+
     def translate(self, dx, dy):
-        for p in self.points: p.translate(dx, dy)
+        return self.transform(Transform.translation(dx, dy))
 
     def scale(self, sx, sy):
-        for p in self.points: p.scale(sx, sy)
+        return self.transform(Transform.scaling(sx, sy))
+
+    def rotate(self, angle):
+        return self.transform(Transform.rotation(angle))
+
+class Segment:
+    # 線段以兩端點表示；與 Line 一樣可由兩點建立，變換與 Triangle 相同延遲到讀取端點時才套用
+    def __init__(self, p1: Point, p2: Point):
+        self._points = [p1, p2]
+        self._pending = None
+
+    @classmethod
+    def from_points(cls, p1, p2):
+        return cls(p1, p2)
+
+    @property
+    def points(self):
+        if self._pending is not None:
+            t, self._pending = self._pending, None
+            for p in self._points: p.transform(t)
+        return self._points
+
+    @property
+    def p1(self):
+        return self.points[0]
+
+    @property
+    def p2(self):
+        return self.points[1]
+
+    # 線段所在的直線
+    @property
+    def line(self):
+        return Line.from_points(self.p1, self.p2)
+
+    def length(self):
+        return (self.p2 - self.p1).length()
+
+    def __repr__(self):
+        return f"Segment({self.p1}, {self.p2})"
+
+    def transform(self, t):
+        self._pending = t if self._pending is None else self._pending.then(t)
+        return self
+
+    def translate(self, dx, dy):
+        return self.transform(Transform.translation(dx, dy))
+
+    def scale(self, sx, sy=None):
+        return self.transform(Transform.scaling(sx, sy))
 
     def rotate(self, angle):
-        for p in self.points: p.rotate(angle)
+        return self.transform(Transform.rotation(angle))
 
 # --- 計算幾何演算法 ---
 
@@ -107,6 +236,53 @@ def intersect_line_line(l1: Line, l2: Line):
     y = (l1.A * l2.C - l2.A * l1.C) / det
     return Point(x, y)
 
+def intersect_segment_segment(s1: Segment, s2: Segment):
+    """
+    兩線段的交點：先以 intersect_line_line 求兩條直線的交點，再檢查是否落在兩線段上。
+    平行的判斷與 intersect_line_line 相同 (|det| < 1e-9)；共線 (s2 兩端到 s1 所在直線的距離都在容許誤差內)
+    且重疊時回傳重疊部分的兩個端點。容許誤差為 1e-9 x 座標大小 (至少 1e-9)。
+    """
+    a, b, c, d = s1.p1, s1.p2, s2.p1, s2.p2
+    tol = 1e-9 * max(1.0, *(abs(v) for p in (a, b, c, d) for v in (p.x, p.y)))
+    if distance(a, b) <= tol:
+        # s1 退化成一點
+        if distance(c, d) <= tol:
+            return [a] if distance(a, c) <= tol else []
+        return [a] if _on_segment(a, c, d, tol) else []
+    if distance(c, d) <= tol:
+        return [c] if _on_segment(c, a, b, tol) else []
+
+    ux, uy = b.x - a.x, b.y - a.y
+    n = math.sqrt(ux**2 + uy**2)
+    collinear = (abs(ux * (c.y - a.y) - uy * (c.x - a.x)) <= tol * n and
+                 abs(ux * (d.y - a.y) - uy * (d.x - a.x)) <= tol * n)
+    if not collinear:
+        p = intersect_line_line(s1.line, s2.line)
+        if p is None:
+            return [] # 平行
+        return [p] if _within_box(p, a, b, tol) and _within_box(p, c, d, tol) else []
+
+    # 共線：把 s2 的兩端投影到 s1 上取重疊區間
+    tc = ((c.x - a.x) * ux + (c.y - a.y) * uy) / n**2
+    td = ((d.x - a.x) * ux + (d.y - a.y) * uy) / n**2
+    lo, hi = max(0.0, min(tc, td)), min(1.0, max(tc, td))
+    if lo > hi + tol / n:
+        return []
+    p_lo = Point(a.x + lo * ux, a.y + lo * uy)
+    if (hi - lo) * n <= tol:
+        return [p_lo]
+    return [p_lo, Point(a.x + hi * ux, a.y + hi * uy)]
+
+def _within_box(p, a, b, tol):
+    """ 已知 p 在 a、b 所在的直線上：檢查 p 是否落在 a、b 之間 (含容許誤差) """
+    return (min(a.x, b.x) - tol <= p.x <= max(a.x, b.x) + tol and
+            min(a.y, b.y) - tol <= p.y <= max(a.y, b.y) + tol)
+
+def _on_segment(p, a, b, tol):
+    """ p 到直線 ab 的距離不超過 tol，且落在 a、b 之間 """
+    cross = (b.x - a.x) * (p.y - a.y) - (b.y - a.y) * (p.x - a.x)
+    return abs(cross) <= tol * distance(a, b) and _within_box(p, a, b, tol)
+
 def get_projection_point(line: Line, point: Point):
     """ 計算點到直線的垂足 (Projection) """
     # 幾何解法：垂足是過該點且垂直於原直線的線，與原直線的交點
@@ -178,55 +354,75 @@ def distance(p1, p2):
 
 # --- 主程式驗證區 ---
 
-print("=== 1. 兩直線交點 ===")
-L1 = Line(1, -1, 0) # y = x
-L2 = Line(1, 1, 10) # y = -x + 10
-p_cross = intersect_line_line(L1, L2)
-print(f"L1 與 L2 交點: {p_cross}") # 應為 (5, 5)
-
-print("\n=== 2. 直線與圓交點 ===")
-C1 = Circle(Point(0, 0), 5)
-L3 = Line(0, 1, 3) # y = 3
-p_lc = intersect_line_circle(L3, C1)
-print(f"L3 與 C1 交點: {p_lc}") # 應為 (-4, 3) 和 (4, 3)
-
-print("\n=== 3. 兩圓交點 ===")
-C2 = Circle(Point(3, 0), 4) # 中心(3,0) 半徑4
-p_cc = intersect_circle_circle(C1, C2)
-print(f"C1 與 C2 交點: {p_cc}") 
-
-print("\n=== 4. 畢氏定理驗證 ===")
-# 給定直線 L: 3x + 4y = 0 和線外一點 P(5, 5)
-L_test = Line(3, 4, 0)
-P_out = Point(5, 5)
-# 找出垂足 P_foot
-P_foot = get_projection_point(L_test, P_out)
-print(f"線外一點: {P_out}")
-print(f"垂足: {P_foot}")
-
-# 在直線上隨便找另一點 P_on_line (讓 x=4, 則 12+4y=0 => y=-3)
-P_on_line = Point(4, -3) 
-print(f"線上任一點: {P_on_line}")
-
-# 計算三角形三邊長
-a = distance(P_out, P_foot)       # 股1 (垂線長)
-b = distance(P_foot, P_on_line)   # 股2 (線上點到垂足)
-c = distance(P_out, P_on_line)    # 斜邊 (線外點到線上任一點)
-
-print(f"a (垂距) = {a:.4f}")
-print(f"b (底邊) = {b:.4f}")
-print(f"c (斜邊) = {c:.4f}")
-print(f"驗證: a^2 + b^2 = {a**2 + b**2:.4f}")
-print(f"驗證: c^2       = {c**2:.4f}")
-if abs((a**2 + b**2) - c**2) < 1e-9:
-    print(">> 畢氏定理成立！")
-
-print("\n=== 5. 幾何變換 (平移/旋轉/縮放) ===")
-tri = Triangle(Point(0, 0), Point(1, 0), Point(0, 1))
-print(f"原三角形: {tri}")
-tri.translate(2, 2)
-print(f"平移後(2,2): {tri}")
-tri.scale(2, 2)
-print(f"縮放後(2x): {tri}")
-tri.rotate(90)
-print(f"旋轉後(90度): {tri}")
+if __name__ == "__main__":
+
+    print("=== 1. 兩直線交點 ===")
+    L1 = Line(1, -1, 0) # y = x
+    L2 = Line(1, 1, 10) # y = -x + 10
+    p_cross = intersect_line_line(L1, L2)
+    print(f"L1 與 L2 交點: {p_cross}") # 應為 (5, 5)
+
+    print("\n=== 2. 直線與圓交點 ===")
+    C1 = Circle(Point(0, 0), 5)
+    L3 = Line(0, 1, 3) # y = 3
+    p_lc = intersect_line_circle(L3, C1)
+    print(f"L3 與 C1 交點: {p_lc}") # 應為 (-4, 3) 和 (4, 3)
+
+    print("\n=== 3. 兩圓交點 ===")
+    C2 = Circle(Point(3, 0), 4) # 中心(3,0) 半徑4
+    p_cc = intersect_circle_circle(C1, C2)
+    print(f"C1 與 C2 交點: {p_cc}") 
+
+    print("\n=== 4. 畢氏定理驗證 ===")
+    # 給定直線 L: 3x + 4y = 0 和線外一點 P(5, 5)
+    L_test = Line(3, 4, 0)
+    P_out = Point(5, 5)
+    # 找出垂足 P_foot
+    P_foot = get_projection_point(L_test, P_out)
+    print(f"線外一點: {P_out}")
+    print(f"垂足: {P_foot}")
+
+    # 在直線上隨便找另一點 P_on_line (讓 x=4, 則 12+4y=0 => y=-3)
+    P_on_line = Point(4, -3) 
+    print(f"線上任一點: {P_on_line}")
+
+    # 計算三角形三邊長
+    a = distance(P_out, P_foot)       # 股1 (垂線長)
+    b = distance(P_foot, P_on_line)   # 股2 (線上點到垂足)
+    c = distance(P_out, P_on_line)    # 斜邊 (線外點到線上任一點)
+
+    print(f"a (垂距) = {a:.4f}")
+    print(f"b (底邊) = {b:.4f}")
+    print(f"c (斜邊) = {c:.4f}")
+    print(f"驗證: a^2 + b^2 = {a**2 + b**2:.4f}")
+    print(f"驗證: c^2       = {c**2:.4f}")
+    if abs((a**2 + b**2) - c**2) < 1e-9:
+        print(">> 畢氏定理成立！")
+
+    print("\n=== 5. 幾何變換 (平移/旋轉/縮放) ===")
+    tri = Triangle(Point(0, 0), Point(1, 0), Point(0, 1))
+    print(f"原三角形: {tri}")
+    tri.translate(2, 2)
+    print(f"平移後(2,2): {tri}")
+    tri.scale(2, 2)
+    print(f"縮放後(2x): {tri}")
+    tri.rotate(90)
+    print(f"旋轉後(90度): {tri}")
+
+    print("\n=== 6. 直線的變換 (反轉置矩陣) ===")
+    L4 = Line.from_points(Point(0, 0), Point(1, 1))   # y = x
+    print(f"原直線: {L4}")
+    L4.translate(0, 2).rotate(90)                    # 先平移成 y = x + 2，再旋轉 90 度
+    print(f"平移(0,2)再旋轉90度: {L4}")
+    q = Point(1, 1)
+    q.translate(0, 2)
+    q.rotate(90)
+    print(f"原直線上的點 (1,1) 經同樣變換後為 {q}，代入新直線: "
+          f"{L4.A * q.x + L4.B * q.y:.4f} = {L4.C:.4f}")
+
+    print("\n=== 7. 線段交點 ===")
+    S1 = Segment.from_points(Point(0, 0), Point(4, 4))
+    S2 = Segment.from_points(Point(0, 4), Point(4, 0))
+    S3 = Segment.from_points(Point(2, 2), Point(6, 6))   # 與 S1 共線重疊
+    print(f"S1 與 S2 交點: {intersect_segment_segment(S1, S2)}")   # 應為 (2, 2)
+    print(f"S1 與 S3 重疊部分: {intersect_segment_segment(S1, S3)}") # 應為 (2, 2) 到 (4, 4)
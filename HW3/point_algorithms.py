@@ -0,0 +1,238 @@
+import numpy as np
+from geometry import Point
+from point_array import PointArray
+
+
+def _as_xy(points):
+    """PointArray、Point 的 list 或 (N, 2) 座標 -> 兩個一維 float 陣列 x, y (PointArray 不複製)"""
+    if isinstance(points, PointArray):
+        xy = points.xy
+        return xy[0], xy[1]
+    if len(points) and isinstance(points[0], Point):
+        return np.array([p.x for p in points], dtype=np.float64), np.array([p.y for p in points], dtype=np.float64)
+    xy = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return xy[:, 0], xy[:, 1]
+
+
+# --- 凸包 ---
+def _extreme_filter(x, y, idx, directions):
+    """
+    Akl–Toussaint 前處理：在 directions 個均分的方向上各取最遠的點，它們圍成的凸多邊形內部的點
+    不可能在凸包上，以向量化運算剔除，回傳 idx 中剩下的點。
+    """
+    px, py = x[idx], y[idx]
+    theta = 2 * np.pi * np.arange(directions) / directions
+    # 方向角遞增，極點因此依逆時針順序排列；去掉重複的頂點
+    extremes = [int(np.argmax(c * px + s * py)) for c, s in zip(np.cos(theta), np.sin(theta))]
+    poly = [k for i, k in enumerate(extremes) if k != extremes[i - 1]]
+    if len(poly) < 3:
+        return idx
+    inside = np.ones(idx.size, dtype=bool)
+    for a, b in zip(poly, poly[1:] + poly[:1]):
+        ex, ey = px[b] - px[a], py[b] - py[a]
+        # 嚴格在每條邊的左側才算內部；邊上的點保留
+        inside &= ex * (py - py[a]) - ey * (px - px[a]) > 0
+    return idx[~inside]
+
+
+def convex_hull(points):
+    """
+    凸包 (Andrew 單調鏈)：回傳凸包頂點的索引，逆時針排列，由 (x, y) 字典序最小的點開始，
+    不含落在邊上的共線點。先以 _extreme_filter 剔除大部分內部點，只對剩下的點排序並掃描，
+    整體為 O(n) 的向量化過濾加上 O(m log m) (m 為剩下的點數)。
+    """
+    x, y = _as_xy(points)
+    if x.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.arange(x.size)
+    if x.size > 64:
+        # 先以 8 個方向的多邊形過濾全部的點，再以 64 個方向過濾剩下的點 (例如圓盤中約 1/10)
+        candidates = _extreme_filter(x, y, candidates, 8)
+        candidates = _extreme_filter(x, y, candidates, 64)
+    order = candidates[np.lexsort((y[candidates], x[candidates]))]
+    xs, ys, idx = x[order].tolist(), y[order].tolist(), order.tolist()
+
+    def chain(seq):
+        hull = []
+        for k in seq:
+            while len(hull) >= 2:
+                o, a = hull[-2], hull[-1]
+                if (xs[a] - xs[o]) * (ys[k] - ys[o]) - (ys[a] - ys[o]) * (xs[k] - xs[o]) > 0:
+                    break
+                hull.pop()
+            hull.append(k)
+        return hull
+
+    lower = chain(range(len(xs)))
+    upper = chain(range(len(xs) - 1, -1, -1))
+    hull = lower[:-1] + upper[:-1]
+    if not hull:
+        # 所有點重合
+        hull = [0]
+    elif len(hull) == 2 and xs[hull[0]] == xs[hull[1]] and ys[hull[0]] == ys[hull[1]]:
+        hull = hull[:1]
+    return np.array([idx[k] for k in hull], dtype=np.int64)
+
+
+# --- 最遠點對 ---
+def farthest_pair(points):
+    """
+    最遠點對 (點集的直徑)：回傳 (i, j, 距離)。
+    最遠的兩點必在凸包上；以旋轉卡尺 (rotating calipers) 沿凸包走一圈，
+    每條邊對應的最遠頂點 (對蹠點) 單調前進，凸包有 h 個頂點時為 O(h)。
+    """
+    x, y = _as_xy(points)
+    if x.size < 2:
+        raise ValueError("至少需要兩個點")
+    hull = convex_hull(points)
+    h = hull.size
+    if h == 1:
+        # 所有點重合
+        return 0, 1, 0.0
+    hx, hy = x[hull].tolist(), y[hull].tolist()
+
+    def dist2(a, b):
+        return (hx[a] - hx[b]) ** 2 + (hy[a] - hy[b]) ** 2
+
+    def area2(a, b, c):
+        return abs((hx[b] - hx[a]) * (hy[c] - hy[a]) - (hy[b] - hy[a]) * (hx[c] - hx[a]))
+
+    best, bi, bj = dist2(0, 1), 0, 1
+    j = 1
+    for i in range(h):
+        i2 = (i + 1) % h
+        # 對蹠點：離邊 (i, i+1) 最遠的頂點，三角形面積增加時就往前走
+        while area2(i, i2, (j + 1) % h) > area2(i, i2, j):
+            j = (j + 1) % h
+        for a in (i, i2):
+            d = dist2(a, j)
+            if d > best:
+                best, bi, bj = d, a, j
+    i, j = sorted((int(hull[bi]), int(hull[bj])))
+    return i, j, float(np.sqrt(best))
+
+
+# --- 最近點對 ---
+def _grid_pairs(sorted_keys, order, offset):
+    """
+    每個點與「鍵值為 key + offset 的格子」中所有點配對 (以 searchsorted 找出該格子在排序後的範圍)。
+    查詢也依鍵值排序，searchsorted 因此是循序存取。回傳兩個索引陣列 (對應原始點的編號)。
+    """
+    queries = sorted_keys + offset
+    lo = np.searchsorted(sorted_keys, queries, side="left")
+    hi = np.searchsorted(sorted_keys, queries, side="right")
+    counts = hi - lo
+    total = int(counts.sum())
+    owner = np.repeat(order, counts)
+    pos = np.repeat(lo, counts) + (np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts))
+    return owner, order[pos]
+
+
+def _compress(cells):
+    """格子座標壓縮成 0..2n：相鄰的格子仍相鄰，中間的空隙縮成一格，避免鍵值溢位"""
+    values, inverse = np.unique(cells, return_inverse=True)
+    ranks = np.concatenate([[0], np.cumsum(np.minimum(np.diff(values), 2))])
+    return ranks[inverse]
+
+
+def closest_pair(points):
+    """
+    最近點對 (格子雜湊)：回傳 (i, j, 距離)，i < j。
+    1. 依 x 排序後相鄰兩點距離的最小值 d0 (以及依 y 排序的) 是答案的上界。
+    2. 以邊長 d0 的格子分割平面，最近點對必定落在同一格或相鄰的格子；
+       每個點只需與自己的格子以及右方、上方共 4 個相鄰格子中的點比較 (另外 4 個方向由對方負責)。
+    全部為排序與向量化運算，一般輸入為 O(n log n)；d0 遠大於答案時每格的點數會變多。
+    """
+    x, y = _as_xy(points)
+    n = x.size
+    if n < 2:
+        raise ValueError("至少需要兩個點")
+
+    best, bi, bj = np.inf, 0, 1
+    for coord in (x, y):
+        order = np.argsort(coord, kind="stable")
+        d2 = np.diff(x[order]) ** 2 + np.diff(y[order]) ** 2
+        k = int(np.argmin(d2))
+        if d2[k] < best:
+            best, bi, bj = float(d2[k]), int(order[k]), int(order[k + 1])
+    if best == 0.0:
+        return min(bi, bj), max(bi, bj), 0.0
+
+    cell = np.sqrt(best)
+    ix = np.floor((x - x.min()) / cell).astype(np.int64)
+    iy = np.floor((y - y.min()) / cell).astype(np.int64)
+    if (int(ix.max()) + 2) * (int(iy.max()) + 2) > 2 ** 62:
+        ix, iy = _compress(ix), _compress(iy)
+    stride = int(iy.max()) + 3
+    keys = (ix + 1) * stride + (iy + 1)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    del keys, ix, iy
+
+    # 同一格：只取排序後位置在自己之後的點；相鄰格：(0, 1)、(1, -1)、(1, 0)、(1, 1)
+    for offset in (0, 1, stride - 1, stride, stride + 1):
+        a, b = _grid_pairs(sorted_keys, order, offset)
+        if offset == 0:
+            keep = a < b
+            a, b = a[keep], b[keep]
+        if a.size == 0:
+            continue
+        d2 = (x[a] - x[b]) ** 2 + (y[a] - y[b]) ** 2
+        k = int(np.argmin(d2))
+        if d2[k] < best:
+            best, bi, bj = float(d2[k]), int(a[k]), int(b[k])
+    return min(bi, bj), max(bi, bj), float(np.sqrt(best))
+
+
+if __name__ == "__main__":
+    import time
+    from geometry import distance
+
+    rng = np.random.default_rng(0)
+
+    # 與逐對迴圈比較 (geometry.distance 的雙重迴圈)
+    n = 1500
+    pts = PointArray(rng.random((n, 2)))
+    objs = pts.to_points()
+    t0 = time.perf_counter()
+    d_min, d_max, p_min, p_max = np.inf, 0.0, None, None
+    for i in range(n):
+        for j in range(i + 1, n):
+            d = distance(objs[i], objs[j])
+            if d < d_min:
+                d_min, p_min = d, (i, j)
+            if d > d_max:
+                d_max, p_max = d, (i, j)
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cp, fp = closest_pair(pts), farthest_pair(pts)
+    t_fast = time.perf_counter() - t0
+    print(f"{n} 個點: 雙重迴圈 {t_loop:.2f}s, 格子雜湊 + 旋轉卡尺 {t_fast * 1e3:.1f} ms")
+    print(f"  最近點對 {cp[:2]} (迴圈 {p_min})，最遠點對 {fp[:2]} (迴圈 {p_max})，"
+          f"一致: {cp[:2] == p_min and fp[:2] == p_max}")
+
+    # 凸包：正方形與格點上的共線點
+    square = PointArray([(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (1, 1), (0, 2), (1, 2)])
+    print(f"正方形 (邊上有共線點) 的凸包: {convex_hull(square).tolist()}")
+
+    print("\n=== 規模 (均勻分佈於正方形 / 圓盤) ===")
+    for n in (10 ** 5, 10 ** 6, 10 ** 7):
+        coords = rng.random((n, 2))
+        r, theta = np.sqrt(rng.random(n)), rng.random(n) * 2 * np.pi
+        disk = PointArray(r * np.cos(theta), r * np.sin(theta))
+        square = PointArray(coords)
+        del coords, r, theta
+        t0 = time.perf_counter()
+        hull = convex_hull(square)
+        t_hull = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        hull_disk = convex_hull(disk)
+        t_hull_disk = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        cp = closest_pair(square)
+        t_cp = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fp = farthest_pair(disk)
+        t_fp = time.perf_counter() - t0
+        print(f"n = {n:>8}: 凸包 {t_hull:.2f}s (h = {hull.size}) / 圓盤 {t_hull_disk:.2f}s (h = {hull_disk.size}), "
+              f"最近點對 {t_cp:.2f}s (d = {cp[2]:.2e}), 圓盤最遠點對 {t_fp:.2f}s (d = {fp[2]:.6f})")
@@ -0,0 +1,281 @@
+import numpy as np
+from geometry import Point, Circle, Triangle
+from transform import Transform, translation_matrix, scale_matrix, rotation_matrix
+
+# 原地變換時每次處理的點數 (暫存區大小固定，不隨點數成長)
+BLOCK = 1 << 16
+
+
+class PointArray:
+    """
+    大量點的陣列，以形狀 (2, N) 的 float64 陣列儲存 (第 0 列為所有 x、第 1 列為所有 y，各自連續)。
+    平移、縮放、旋轉都化為 3x3 齊次矩陣，並延遲計算：連續的變換只把矩陣相乘合併起來，
+    直到讀取座標 (xy / x / y / 取元素) 時才對所有點做一次矩陣乘法 (原地分塊進行)。
+    也可以用 out= 把 (含待處理變換的) 結果寫到另一個同長度的 PointArray，自己保持不變。
+    """
+    __slots__ = ("_xy", "_pending")
+
+    def __init__(self, x, y=None):
+        if y is None:
+            # 傳入 (N, 2) 座標或 Point 的 list
+            if len(x) and isinstance(x[0], Point):
+                x, y = [p.x for p in x], [p.y for p in x]
+            else:
+                xy = np.asarray(x, dtype=np.float64).reshape(-1, 2)
+                x, y = xy[:, 0], xy[:, 1]
+        self._xy = np.empty((2, len(x)))
+        self._xy[0] = x
+        self._xy[1] = y
+        self._pending = None
+
+    @classmethod
+    def _wrap(cls, xy):
+        obj = object.__new__(cls)
+        obj._xy = xy
+        obj._pending = None
+        return obj
+
+    @classmethod
+    def empty(cls, n):
+        return cls._wrap(np.empty((2, n)))
+
+    @property
+    def xy(self):
+        self.flush()
+        return self._xy
+
+    @property
+    def x(self):
+        return self.xy[0]
+
+    @property
+    def y(self):
+        return self.xy[1]
+
+    def __len__(self):
+        return self._xy.shape[1]
+
+    def __repr__(self):
+        n = len(self)
+        if n <= 6:
+            return f"PointArray({', '.join(repr(p) for p in self.to_points())})"
+        return f"PointArray(n={n})"
+
+    def __getitem__(self, index):
+        xy = self.xy
+        if isinstance(index, (int, np.integer)):
+            return Point(float(xy[0, index]), float(xy[1, index]))
+        return PointArray._wrap(xy[:, index])
+
+    def to_points(self):
+        xy = self.xy
+        return [Point(x, y) for x, y in zip(xy[0].tolist(), xy[1].tolist())]
+
+    def copy(self):
+        return PointArray._wrap(self.xy.copy())
+
+    # --- 變換 ---
+    @staticmethod
+    def _transform_into(matrix, src, dst):
+        """dst = M[:2, :2] @ src + M[:2, 2]；純平移時只做加法。src 與 dst 可為同一陣列 (分塊處理)"""
+        linear, offset = matrix[:2, :2], matrix[:2, 2:]
+        if np.array_equal(linear, np.eye(2)):
+            np.add(src, offset, out=dst)
+            return
+        n = src.shape[1]
+        scratch = np.empty((2, min(n, BLOCK)))
+        for start in range(0, n, BLOCK):
+            tmp = scratch[:, :min(BLOCK, n - start)]
+            np.matmul(linear, src[:, start:start + BLOCK], out=tmp)
+            np.add(tmp, offset, out=dst[:, start:start + BLOCK])
+
+    def flush(self):
+        """立即套用待處理的變換"""
+        if self._pending is not None:
+            matrix, self._pending = self._pending, None
+            self._transform_into(matrix, self._xy, self._xy)
+        return self
+
+    def apply(self, matrix, out=None):
+        """
+        套用 3x3 齊次矩陣 (或 Transform)。out 為 None 時只合併到待處理的變換並回傳 self；
+        給 out 時立即把結果寫入 out 並回傳 out。
+        """
+        if isinstance(matrix, Transform):
+            matrix = matrix.matrix
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if self._pending is not None:
+            matrix = matrix @ self._pending
+        if out is None:
+            self._pending = matrix
+            return self
+        if len(out) != len(self):
+            raise ValueError(f"out 的長度必須是 {len(self)}，實際為 {len(out)}")
+        self._transform_into(matrix, self._xy, out._xy)
+        out._pending = None
+        return out
+
+    transform = apply
+
+    def translate(self, dx, dy, out=None):
+        return self.apply(translation_matrix(dx, dy), out)
+
+    def scale(self, sx, sy=None, out=None):
+        return self.apply(scale_matrix(sx, sy), out)
+
+    def rotate(self, angle_degrees, out=None):
+        return self.apply(rotation_matrix(angle_degrees), out)
+
+
+class CircleArray:
+    """
+    大量的圓：圓心為 PointArray，半徑為一維陣列。
+    變換同樣延遲：圓心的變換由 PointArray 合併，半徑的縮放倍率累乘成一個純量，讀取 radii 時才套用。
+    """
+    __slots__ = ("centers", "_radii", "_radius_scale")
+
+    def __init__(self, centers, radii):
+        self.centers = centers if isinstance(centers, PointArray) else PointArray(centers)
+        self._radii = np.array(radii, dtype=np.float64).reshape(-1)
+        self._radius_scale = 1.0
+        if self._radii.size != len(self.centers):
+            raise ValueError("圓心與半徑的數量必須相同")
+
+    @classmethod
+    def from_circles(cls, circles):
+        return cls(PointArray([c.center for c in circles]), [c.radius for c in circles])
+
+    @property
+    def radii(self):
+        if self._radius_scale != 1.0:
+            self._radii *= self._radius_scale
+            self._radius_scale = 1.0
+        return self._radii
+
+    def __len__(self):
+        return self._radii.size
+
+    def __repr__(self):
+        return f"CircleArray(n={len(self)})"
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Circle(self.centers[index], float(self.radii[index]))
+        obj = object.__new__(CircleArray)
+        obj.centers = self.centers[index]
+        obj._radii = self.radii[index]
+        obj._radius_scale = 1.0
+        return obj
+
+    def to_circles(self):
+        return [Circle(c, r) for c, r in zip(self.centers.to_points(), self.radii.tolist())]
+
+    def transform(self, t):
+        """只接受旋轉、均勻縮放與平移 (見 Transform.similarity_scale)"""
+        self._radius_scale *= t.similarity_scale()
+        self.centers.apply(t.matrix)
+        return self
+
+    def translate(self, dx, dy):
+        self.centers.translate(dx, dy)
+        return self
+
+    def scale(self, s):
+        # 與 Circle 相同只做均勻縮放，半徑取絕對值
+        self.centers.scale(s, s)
+        self._radius_scale *= abs(s)
+        return self
+
+    def rotate(self, angle):
+        self.centers.rotate(angle)
+        return self
+
+
+class TriangleArray:
+    """
+    大量的三角形：3N 個頂點存成一個 PointArray (依三角形順序，每 3 個一組)，
+    變換時所有頂點一次完成。
+    """
+    __slots__ = ("vertices",)
+
+    def __init__(self, vertices):
+        self.vertices = vertices if isinstance(vertices, PointArray) else PointArray(vertices)
+        if len(self.vertices) % 3:
+            raise ValueError("頂點數必須是 3 的倍數")
+
+    @classmethod
+    def from_triangles(cls, triangles):
+        return cls(PointArray([p for t in triangles for p in t.points]))
+
+    def __len__(self):
+        return len(self.vertices) // 3
+
+    def __repr__(self):
+        return f"TriangleArray(n={len(self)})"
+
+    def __getitem__(self, index):
+        return Triangle(*(self.vertices[3 * index + k] for k in range(3)))
+
+    def to_triangles(self):
+        points = self.vertices.to_points()
+        return [Triangle(*points[i:i + 3]) for i in range(0, len(points), 3)]
+
+    def transform(self, t):
+        self.vertices.apply(t.matrix)
+        return self
+
+    def translate(self, dx, dy):
+        self.vertices.translate(dx, dy)
+        return self
+
+    def scale(self, sx, sy):
+        self.vertices.scale(sx, sy)
+        return self
+
+    def rotate(self, angle):
+        self.vertices.rotate(angle)
+        return self
+
+
+if __name__ == "__main__":
+    import time
+
+    tris = TriangleArray.from_triangles([Triangle(Point(0, 0), Point(1, 0), Point(0, 1))])
+    tris.translate(2, 2).scale(2, 2).rotate(90)
+    print(f"三角形 (平移 -> 縮放 -> 旋轉): {tris[0]}")
+
+    n = 1_000_000
+    rng = np.random.default_rng(0)
+    coords = rng.random((n, 2))
+
+    m = n // 10
+    points = [Point(x, y) for x, y in coords[:m].tolist()]
+    t0 = time.perf_counter()
+    for p in points:
+        p.translate(1, 2)
+        p.scale(2, 3)
+        p.rotate(30)
+    t_obj = (time.perf_counter() - t0) * (n / m)
+
+    arr = PointArray(coords)
+    t0 = time.perf_counter()
+    arr.translate(1, 2).scale(2, 3).rotate(30)   # 只合併矩陣
+    arr.flush()                                   # 所有點只變換一次
+    t_arr = time.perf_counter() - t0
+
+    eager = PointArray(coords)
+    t0 = time.perf_counter()
+    eager.translate(1, 2).flush().scale(2, 3).flush().rotate(30).flush()
+    t_eager = time.perf_counter() - t0
+
+    out = PointArray.empty(n)
+    src = PointArray(coords)
+    t0 = time.perf_counter()
+    src.rotate(30, out=out)
+    t_out = time.perf_counter() - t0
+
+    print(f"{n} 個點 平移+縮放+旋轉: Point 物件 (估計) {t_obj:.2f}s, PointArray {t_arr * 1e3:.1f} ms "
+          f"({t_obj / t_arr:.0f}x)")
+    print(f"每步立即套用 (3 次掃過所有點): {t_eager * 1e3:.1f} ms")
+    print(f"旋轉寫入 out=: {t_out * 1e3:.1f} ms")
+    print(f"結果一致: {np.allclose([[p.x for p in points], [p.y for p in points]], arr.xy[:, :m])}")
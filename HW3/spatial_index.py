@@ -0,0 +1,331 @@
+import math
+import numpy as np
+from geometry import Point, Line, Circle
+from point_array import CircleArray
+from batch_intersect import circle_circle, line_circle
+
+# 索引外 (新插入、尚未進網格) 的圓超過這個比例時重建網格
+REBUILD_FRACTION = 0.1
+REBUILD_MIN = 1024
+# 外接正方形覆蓋超過這麼多格子的「大圓」不登記到網格，改放在索引外的清單中直接比對
+LARGE_CELLS = 64
+
+
+def _cell_keys(ix, iy):
+    """格子座標 (ix, iy) -> 單一 int64 鍵值 (依 ix 再依 iy 排序)"""
+    return (ix.astype(np.int64) << 32) + (iy.astype(np.int64) + (1 << 31))
+
+
+class CircleIndex:
+    """
+    大量圓的均勻網格索引。每個圓依外接正方形登記在它覆蓋的所有格子中，
+    網格以「排序過的 (格子鍵值, 圓編號)」兩個陣列表示，建立與查詢都是向量化運算。
+    支援逐一插入 / 刪除：新插入的圓先放在索引外的小清單 (查詢時直接比對)，
+    累積到一定數量才重建網格；刪除只標記，查詢時略過。
+    覆蓋超過 LARGE_CELLS 個格子的大圓也留在索引外 (否則一個大圓就要登記 (2r / cell_size)^2 個格子)。
+    圓的編號 (id) 為插入順序，刪除後不會重用。
+    """
+    def __init__(self, centers=None, radii=None, cell_size=None):
+        self._cx = np.zeros(0)
+        self._cy = np.zeros(0)
+        self._r = np.zeros(0)
+        self._alive = np.zeros(0, dtype=bool)
+        self._n = 0
+        self.cell_size = cell_size
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._indexed = 0          # 編號 < _indexed 的圓已在網格中 (大圓除外)
+        self._large = np.zeros(0, dtype=np.int64)
+        # 網格中有圓的格子座標範圍 (ix_min, ix_max, iy_min, iy_max)
+        self._bounds = None
+        if centers is not None:
+            if isinstance(centers, CircleArray):
+                centers, radii = centers.centers.xy.T, centers.radii
+            centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+            self.insert_many(centers[:, 0], centers[:, 1], radii)
+            self.rebuild()
+
+    # --- 儲存 ---
+    def _reserve(self, n):
+        capacity = self._cx.size
+        if self._n + n <= capacity:
+            return
+        capacity = max(self._n + n, 2 * capacity, 16)
+        for name in ("_cx", "_cy", "_r", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def __len__(self):
+        return int(np.count_nonzero(self._alive[:self._n]))
+
+    def insert_many(self, xs, ys, radii):
+        """插入多個圓，回傳它們的 id 陣列"""
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), xs.shape)
+        n = xs.size
+        self._reserve(n)
+        sl = slice(self._n, self._n + n)
+        self._cx[sl], self._cy[sl], self._r[sl] = xs, ys, radii
+        self._alive[sl] = True
+        ids = np.arange(self._n, self._n + n)
+        self._n += n
+        if self._n - self._indexed > max(REBUILD_MIN, REBUILD_FRACTION * self._indexed):
+            self.rebuild()
+        return ids
+
+    def insert(self, circle):
+        """插入一個 Circle，回傳 id"""
+        return int(self.insert_many([circle.center.x], [circle.center.y], [circle.radius])[0])
+
+    def delete(self, ids):
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        if ids.size and (ids.min() < 0 or ids.max() >= self._n):
+            raise IndexError("id 超出範圍")
+        self._alive[ids] = False
+
+    def circle(self, i):
+        return Circle(Point(float(self._cx[i]), float(self._cy[i])), float(self._r[i]))
+
+    # --- 網格 ---
+    def _cell_counts(self, ids):
+        """每個圓外接正方形覆蓋的格子數 (浮點數，極大的圓也不會溢位)"""
+        cs = self.cell_size
+        x, y, r = self._cx[ids], self._cy[ids], self._r[ids]
+        nx = np.floor((x + r) / cs) - np.floor((x - r) / cs) + 1
+        ny = np.floor((y + r) / cs) - np.floor((y - r) / cs) + 1
+        return nx * ny
+
+    def _cells(self, ids):
+        """
+        每個圓外接正方形覆蓋的格子，攤平成 (格子鍵值, 圓 id) 兩個陣列。
+        """
+        cs = self.cell_size
+        x, y, r = self._cx[ids], self._cy[ids], self._r[ids]
+        ix0, ix1 = np.floor((x - r) / cs).astype(np.int64), np.floor((x + r) / cs).astype(np.int64)
+        iy0, iy1 = np.floor((y - r) / cs).astype(np.int64), np.floor((y + r) / cs).astype(np.int64)
+        nx, ny = ix1 - ix0 + 1, iy1 - iy0 + 1
+        per = nx * ny
+        owner = np.repeat(np.arange(ids.size), per)
+        # 每個圓內部的第 k 個格子：k = a * ny + b
+        k = np.arange(per.sum()) - np.repeat(np.cumsum(per) - per, per)
+        ny_o = ny[owner]
+        ix = ix0[owner] + k // ny_o
+        iy = iy0[owner] + k % ny_o
+        return _cell_keys(ix, iy), ids[owner]
+
+    def rebuild(self):
+        """把所有存活的圓重新登記到網格"""
+        ids = np.flatnonzero(self._alive[:self._n])
+        if self.cell_size is None:
+            # 預設格子邊長為平均直徑，每個圓大約覆蓋 4 個格子
+            self.cell_size = float(2 * self._r[ids].mean()) if ids.size and self._r[ids].mean() > 0 else 1.0
+        large = self._cell_counts(ids) > LARGE_CELLS
+        self._large = ids[large]
+        keys, owners = self._cells(ids[~large])
+        order = np.argsort(keys, kind="stable")
+        self._keys, self._ids = keys[order], owners[order]
+        self._indexed = self._n
+        if self._keys.size:
+            ix, iy = self._keys >> 32, (self._keys & 0xFFFFFFFF) - (1 << 31)
+            self._bounds = (int(ix.min()), int(ix.max()), int(iy.min()), int(iy.max()))
+        else:
+            self._bounds = None
+
+    # --- 查詢 ---
+    def _candidates_in_box(self, x0, y0, x1, y1):
+        """
+        外接矩形與 [x0, x1] x [y0, y1] 相交的格子中登記的圓，加上索引外的圓。
+        只列舉有圓的格子範圍內的格子；列舉的格子數比網格中登記的項目還多時 (查詢範圍很大)，
+        改為對所有圓的外接矩形做一次向量化比對。
+        """
+        if self._bounds is None:
+            return self._candidates_for_keys(np.zeros(0, dtype=np.int64))
+        cs = self.cell_size
+        bx0, bx1, by0, by1 = self._bounds
+        ix0, ix1 = max(math.floor(x0 / cs), bx0), min(math.floor(x1 / cs), bx1)
+        iy0, iy1 = max(math.floor(y0 / cs), by0), min(math.floor(y1 / cs), by1)
+        if ix0 > ix1 or iy0 > iy1:
+            return self._candidates_for_keys(np.zeros(0, dtype=np.int64))
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > self._keys.size:
+            return self._scan_box(x0, y0, x1, y1)
+        ix = np.arange(ix0, ix1 + 1)
+        iy = np.arange(iy0, iy1 + 1)
+        keys = _cell_keys(np.repeat(ix, iy.size), np.tile(iy, ix.size))
+        return self._candidates_for_keys(keys)
+
+    def _scan_box(self, x0, y0, x1, y1):
+        """不經過網格：所有存活的圓中外接矩形與 [x0, x1] x [y0, y1] 相交的"""
+        n = self._n
+        cx, cy, r = self._cx[:n], self._cy[:n], self._r[:n]
+        hit = self._alive[:n] & (cx - r <= x1) & (cx + r >= x0) & (cy - r <= y1) & (cy + r >= y0)
+        return np.flatnonzero(hit)
+
+    def _candidates_for_keys(self, keys):
+        lo = np.searchsorted(self._keys, keys, side="left")
+        hi = np.searchsorted(self._keys, keys, side="right")
+        counts = hi - lo
+        pos = np.repeat(lo, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+        ids = np.concatenate([self._ids[pos], np.arange(self._indexed, self._n), self._large])
+        ids = np.unique(ids)
+        return ids[self._alive[ids]]
+
+    def query(self, circle):
+        """與給定圓的圓周相交 (含相切) 的圓的 id"""
+        return self.intersections(circle)[0]
+
+    def intersections(self, circle):
+        """
+        給定圓與索引中所有圓的交點。
+        回傳 (ids (M,), points (M, 2, 2), counts (M,))，只包含 counts > 0 的圓。
+        """
+        x, y, r = circle.center.x, circle.center.y, circle.radius
+        ids = self._candidates_in_box(x - r, y - r, x + r, y + r)
+        points, counts = circle_circle((x, y, r), (self._cx[ids], self._cy[ids], self._r[ids]))
+        hit = counts > 0
+        return ids[hit], points[hit], counts[hit]
+
+    def line_intersections(self, line: Line):
+        """
+        直線與索引中所有圓的交點：沿著直線走過網格 (只走有圓的範圍)，只對這些格子中的圓做精確計算。
+        回傳 (ids, points (M, 2, 2), counts)。
+        """
+        if self._n > self._indexed:
+            self.rebuild()
+        A, B, C = line.A, line.B, line.C
+        if self._keys.size == 0:
+            ids = self._candidates_for_keys(np.zeros(0, dtype=np.int64))
+            points, counts = line_circle((A, B, C), (self._cx[ids], self._cy[ids], self._r[ids]))
+            hit = counts > 0
+            return ids[hit], points[hit], counts[hit]
+        cs = self.cell_size
+        ix_all = self._keys >> 32
+        iy_all = (self._keys & 0xFFFFFFFF) - (1 << 31)
+        if abs(B) >= abs(A):
+            # 斜率 <= 1：逐欄 (ix) 找出直線經過的 iy 範圍
+            ix = np.arange(ix_all.min(), ix_all.max() + 1)
+            xa, xb = ix * cs, (ix + 1) * cs
+            ya, yb = (C - A * xa) / B, (C - A * xb) / B
+            lo = np.floor(np.minimum(ya, yb) / cs).astype(np.int64)
+            hi = np.floor(np.maximum(ya, yb) / cs).astype(np.int64)
+            lo, hi = np.maximum(lo, iy_all.min()), np.minimum(hi, iy_all.max())
+            major, lo_minor, count = ix, lo, np.maximum(hi - lo + 1, 0)
+            keys_of = lambda a, b: _cell_keys(a, b)
+        else:
+            iy = np.arange(iy_all.min(), iy_all.max() + 1)
+            ya, yb = iy * cs, (iy + 1) * cs
+            xa, xb = (C - B * ya) / A, (C - B * yb) / A
+            lo = np.floor(np.minimum(xa, xb) / cs).astype(np.int64)
+            hi = np.floor(np.maximum(xa, xb) / cs).astype(np.int64)
+            lo, hi = np.maximum(lo, ix_all.min()), np.minimum(hi, ix_all.max())
+            major, lo_minor, count = iy, lo, np.maximum(hi - lo + 1, 0)
+            keys_of = lambda a, b: _cell_keys(b, a)
+        step = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        keys = keys_of(np.repeat(major, count), np.repeat(lo_minor, count) + step)
+        ids = self._candidates_for_keys(keys)
+        points, counts = line_circle((A, B, C), (self._cx[ids], self._cy[ids], self._r[ids]))
+        hit = counts > 0
+        return ids[hit], points[hit], counts[hit]
+
+    def all_pairs(self):
+        """
+        所有圓周相交 (含相切) 的圓對，回傳 (M, 2) 的 id 陣列 (每列 i < j)。
+        同一格子中的圓兩兩配對為候選；兩個圓可能同時出現在好幾個格子，
+        只在「兩個外接矩形交集的左下角」所在的格子保留，因此不需要再去除重複。
+        """
+        if self._n > self._indexed or np.any(~self._alive[self._ids]) or np.any(~self._alive[self._large]):
+            self.rebuild()
+        keys, ids = self._keys, self._ids
+        n = keys.size
+        if n == 0:
+            return self._large_pairs()
+        # 每個位置所屬群組 (同一格子) 的結尾
+        boundary = np.flatnonzero(np.diff(keys)) + 1
+        ends = np.repeat(np.append(boundary, n), np.diff(np.concatenate([[0], boundary, [n]])))
+        partners = ends - np.arange(n) - 1
+        i_pos = np.repeat(np.arange(n), partners)
+        j_pos = i_pos + 1 + (np.arange(partners.sum()) - np.repeat(np.cumsum(partners) - partners, partners))
+        a, b = ids[i_pos], ids[j_pos]
+
+        cs = self.cell_size
+        cx, cy, r = self._cx, self._cy, self._r
+        x0 = np.maximum(cx[a] - r[a], cx[b] - r[b])
+        y0 = np.maximum(cy[a] - r[a], cy[b] - r[b])
+        x1 = np.minimum(cx[a] + r[a], cx[b] + r[b])
+        y1 = np.minimum(cy[a] + r[a], cy[b] + r[b])
+        home = _cell_keys(np.floor(x0 / cs).astype(np.int64), np.floor(y0 / cs).astype(np.int64))
+        keep = (x0 <= x1) & (y0 <= y1) & (home == keys[i_pos])
+        a, b = a[keep], b[keep]
+
+        # 精確判斷：|r1 - r2| <= d <= r1 + r2
+        d = np.hypot(cx[a] - cx[b], cy[a] - cy[b])
+        hit = (d <= r[a] + r[b]) & (d >= np.abs(r[a] - r[b])) & (d > 0)
+        pairs = np.stack([np.minimum(a[hit], b[hit]), np.maximum(a[hit], b[hit])], axis=1)
+        if self._large.size:
+            pairs = np.concatenate([pairs, self._large_pairs()])
+        return pairs
+
+    def _large_pairs(self):
+        """大圓 (不在網格中) 參與的相交圓對：每個大圓對所有圓做一次向量化比對"""
+        cx, cy, r = self._cx, self._cy, self._r
+        is_large = np.zeros(self._n, dtype=bool)
+        is_large[self._large] = True
+        result = [np.zeros((0, 2), dtype=np.int64)]
+        for i in self._large.tolist():
+            b = self._scan_box(cx[i] - r[i], cy[i] - r[i], cx[i] + r[i], cy[i] + r[i])
+            # 兩個大圓的配對只由編號較小的一方產生
+            b = b[(b != i) & ~(is_large[b] & (b < i))]
+            d = np.hypot(cx[b] - cx[i], cy[b] - cy[i])
+            b = b[(d <= r[b] + r[i]) & (d >= np.abs(r[b] - r[i])) & (d > 0)]
+            result.append(np.stack([np.minimum(b, i), np.maximum(b, i)], axis=1))
+        return np.concatenate(result)
+
+    def all_intersections(self):
+        """所有圓對的交點：回傳 (pairs (M, 2), points (M, 2, 2), counts (M,))，points 與 counts 同 batch_intersect.circle_circle"""
+        pairs = self.all_pairs()
+        a, b = pairs[:, 0], pairs[:, 1]
+        points, counts = circle_circle((self._cx[a], self._cy[a], self._r[a]),
+                                       (self._cx[b], self._cy[b], self._r[b]))
+        return pairs, points, counts
+
+
+if __name__ == "__main__":
+    import time
+    from geometry import intersect_circle_circle
+
+    rng = np.random.default_rng(0)
+
+    # 小規模：與逐對呼叫 intersect_circle_circle 的結果比較
+    n = 2000
+    centers = rng.random((n, 2)) * 100
+    radii = rng.uniform(0.5, 2.0, n)
+    index = CircleIndex(centers, radii)
+    circles = [index.circle(i) for i in range(n)]
+    t0 = time.perf_counter()
+    brute = {(i, j) for i in range(n) for j in range(i + 1, n) if intersect_circle_circle(circles[i], circles[j])}
+    t_brute = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    pairs = index.all_pairs()
+    t_index = time.perf_counter() - t0
+    print(f"{n} 個圓: 逐對 O(n^2) {t_brute:.2f}s, 網格索引 {t_index * 1e3:.1f} ms, "
+          f"相交圓對 {len(pairs)} 組, 與逐對結果一致: {set(map(tuple, pairs.tolist())) == brute}")
+
+    # 大規模
+    for n in (100_000, 1_000_000):
+        side = np.sqrt(n) * 4
+        index = CircleIndex(rng.random((n, 2)) * side, rng.uniform(0.5, 2.0, n))
+        t0 = time.perf_counter()
+        pairs, points, counts = index.all_intersections()
+        dt = time.perf_counter() - t0
+        print(f"{n} 個圓: 全部交點 {dt:.2f}s, 相交圓對 {len(pairs)} 組, 交點 {counts.sum()} 個")
+
+    # 增量插入 / 刪除
+    new_id = index.insert(Circle(Point(100, 100), 10))
+    ids, pts, cnt = index.intersections(index.circle(new_id))
+    print(f"插入新圓 #{new_id}: 與 {len(ids)} 個圓相交，交點 {cnt.sum()} 個")
+    index.delete(ids[:len(ids) // 2])
+    print(f"刪除其中 {len(ids) // 2} 個後: 與 {len(index.query(index.circle(new_id)))} 個圓相交")
+    ids, pts, cnt = index.line_intersections(Line(1, -1, 0))
+    print(f"直線 y = x 穿過 {len(ids)} 個圓")
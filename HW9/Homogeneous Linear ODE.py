@@ -1,11 +1,53 @@
+import os
+import sys
 import numpy as np
 from collections import Counter
 
+# 批次求根 (polyroots.batch_roots) 放在上一層目錄
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polyroots import batch_roots
+
+def _characteristic(coefficients):
+    """
+    與 np.roots 相同的前處理：去掉首項的 0，末尾的 k 個 0 代表 k 個恰為 0 的根，
+    剩下的多項式才需要解特徵值。回傳 (剩下的係數, k)。
+    """
+    c = np.trim_zeros(np.asarray(coefficients, dtype=float), "f")
+    if c.size < 2:
+        raise ValueError("特徵多項式至少要是一次")
+    reduced = np.trim_zeros(c, "b")
+    return reduced, c.size - reduced.size
+
+def _roots_many(polys):
+    """同次數的多項式疊起來交給 batch_roots (每一階只解一次特徵值)，再補上恰為 0 的根"""
+    results = [None] * len(polys)
+    by_degree = {}
+    for i, (c, _) in enumerate(polys):
+        by_degree.setdefault(c.size, []).append(i)
+    for size, index in by_degree.items():
+        if size > 1:
+            roots = batch_roots(np.array([polys[i][0] for i in index]))
+        else:
+            roots = np.zeros((len(index), 0), dtype=complex)
+        for i, r in zip(index, roots):
+            results[i] = np.concatenate([r, np.zeros(polys[i][1], dtype=complex)])
+    return results
+
 def solve_ode_general(coefficients):
     # 1. 直接求解數值根
     # numpy 算出來是什麼，我們就用什麼，保留所有誤差
-    roots = np.roots(coefficients)
-    
+    # batch_roots 與 np.roots 解同一個伴隨矩陣的特徵值，根的數值完全相同
+    roots = _roots_many([_characteristic(coefficients)])[0]
+    return _format_solution(roots)
+
+def solve_ode_general_batch(coefficient_list):
+    """
+    一次求解多個方程，回傳與輸入同順序的通解字串；
+    同階的特徵多項式疊成一個 (N, d, d) 的特徵值問題一起解。
+    """
+    return [_format_solution(r) for r in _roots_many([_characteristic(c) for c in coefficient_list])]
+
+def _format_solution(roots):
     # 2. 統計重數 (只針對完全相等的數字)
     # 注意：這裡不進行任何 round 或容差處理
     # [1, -4, 4] 的根通常是精確的 2.0, 2.0，所以 Counter 會合併它們
@@ -97,3 +139,17 @@ if __name__ == "__main__":
     coeffs5 = [1, -6, 12, -8]
     print(f"方程係數: {coeffs5}")
     print(solve_ode_general(coeffs5))
+
+    # 批次求解：與逐一呼叫的結果相同
+    import time
+    print("\n--- 批次求解 ---")
+    rng = np.random.default_rng(0)
+    many = [rng.integers(-9, 10, rng.integers(3, 7)).tolist() for _ in range(20_000)]
+    many = [c for c in many if c[0] != 0]
+    t0 = time.perf_counter()
+    batch = solve_ode_general_batch(many)
+    t_batch = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    single = [solve_ode_general(c) for c in many]
+    t_single = time.perf_counter() - t0
+    print(f"{len(many)} 個方程: 批次 {t_batch:.2f}s，逐一 {t_single:.2f}s，結果一致: {batch == single}")
@@ -0,0 +1,129 @@
+import time
+import numpy as np
+from quadratic import solve_quadratic
+
+
+def _horner(coeffs, x):
+    """以 Horner 法計算多項式 (降冪係數，形狀 (N, k)) 在 x (形狀 (N, m)) 的值"""
+    y = np.zeros_like(x)
+    # 退化的列 (首項為 0、nan 或 inf 的根) 的值本來就是 nan / inf，不另外發出 RuntimeWarning
+    with np.errstate(invalid="ignore", over="ignore"):
+        for i in range(coeffs.shape[1]):
+            y = y * x + coeffs[:, i, None]
+    return y
+
+
+def polish(coeffs, roots, steps=2):
+    """
+    對所有根同時做 steps 次 Newton 迭代 x <- x - P(x)/P'(x)。
+    P'(x) == 0 (重根) 或迭代後殘差變大的根保持不變。
+    """
+    coeffs = np.asarray(coeffs)
+    deg = coeffs.shape[1] - 1
+    dcoeffs = coeffs[:, :-1] * np.arange(deg, 0, -1)
+    residual = np.abs(_horner(coeffs, roots))
+    for _ in range(steps):
+        dp = _horner(dcoeffs, roots)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = _horner(coeffs, roots) / dp
+        candidate = roots - np.where(dp != 0, step, 0)
+        new_residual = np.abs(_horner(coeffs, candidate))
+        better = np.isfinite(candidate) & (new_residual < residual)
+        roots = np.where(better, candidate, roots)
+        residual = np.where(better, new_residual, residual)
+    return roots
+
+
+def solve_cubic(a, b, c, d, newton_steps=2):
+    """
+    批次解 a x^3 + b x^2 + c x + d = 0，回傳 (roots, residuals)，形狀皆為 (N, 3) 複數陣列。
+
+    先化為缺項三次式 t^3 + p t + q = 0 (x = t - b/3a)，依判別式 Δ = (q/2)^2 + (p/3)^3 用遮罩分派：
+      Δ > 0 (一實根兩共軛複根) 或 p == 0：Cardano 公式，取不會相消的那個立方根
+      Δ <= 0 (三實根)：三角函數解
+    最後整批做 newton_steps 次 Newton 修正。
+    a == 0 的列退化為二次方程，第三個根為 nan。
+    """
+    a = np.atleast_1d(np.asarray(a, dtype=float))
+    b = np.atleast_1d(np.asarray(b, dtype=float))
+    c = np.atleast_1d(np.asarray(c, dtype=float))
+    d = np.atleast_1d(np.asarray(d, dtype=float))
+    a, b, c, d = np.broadcast_arrays(a, b, c, d)
+    n = a.size
+    a, b, c, d = a.ravel(), b.ravel(), c.ravel(), d.ravel()
+
+    roots = np.full((n, 3), np.nan, dtype=complex)
+    cubic = a != 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        B, C, D = b / a, c / a, d / a
+        p = C - B * B / 3
+        q = 2 * B**3 / 27 - B * C / 3 + D
+        disc = (q / 2) ** 2 + (p / 3) ** 3
+        shift = -B / 3
+
+        # --- Cardano: 一實根 + 一對共軛複根 ---
+        cardano = cubic & ((disc > 0) | (p == 0))
+        if cardano.any():
+            qc, pc, dc = q[cardano], p[cardano], disc[cardano]
+            sign_q = np.where(qc < 0, -1.0, 1.0)
+            u = np.cbrt(-qc / 2 - sign_q * np.sqrt(np.maximum(dc, 0)))
+            v = np.where(u != 0, -pc / (3 * u), 0.0)
+            real = u + v
+            imag = np.sqrt(3) / 2 * (u - v)
+            s = shift[cardano]
+            roots[cardano, 0] = real + s
+            roots[cardano, 1] = -real / 2 + s + 1j * imag
+            roots[cardano, 2] = -real / 2 + s - 1j * imag
+
+        # --- 三角函數解: 三實根 ---
+        trig = cubic & ~cardano
+        if trig.any():
+            qt, pt = q[trig], p[trig]
+            m = 2 * np.sqrt(-pt / 3)
+            theta = np.arccos(np.clip(3 * qt / (pt * m), -1, 1)) / 3
+            k = np.arange(3)
+            t = m[:, None] * np.cos(theta[:, None] - 2 * np.pi * k / 3)
+            roots[trig] = t + shift[trig, None]
+
+    # --- a == 0: 退化為二次方程 ---
+    quadratic = ~cubic
+    if quadratic.any():
+        roots[quadratic, :2], _ = solve_quadratic(b[quadratic], c[quadratic], d[quadratic])
+
+    coeffs = np.column_stack([a, b, c, d])
+    if newton_steps and cubic.any():
+        roots[cubic] = polish(coeffs[cubic], roots[cubic], newton_steps)
+    residuals = _horner(coeffs, roots)
+    return roots, residuals
+
+
+def benchmark(n=100_000):
+    """比較逐個呼叫 np.roots 與批次閉式解的速度與殘差"""
+    rng = np.random.default_rng(0)
+    coeffs = rng.uniform(-10, 10, (n, 4))
+
+    m = n // 10
+    t0 = time.perf_counter()
+    ref = np.array([np.roots(row) for row in coeffs[:m]])
+    t_np = (time.perf_counter() - t0) * (n / m)
+
+    t0 = time.perf_counter()
+    roots, residuals = solve_cubic(*coeffs.T)
+    t_batch = time.perf_counter() - t0
+
+    def relative_residual(c, x):
+        # 以 Σ|c_i||x|^i 正規化，首項係數很小時根會很大，絕對殘差沒有意義
+        scale = _horner(np.abs(c), np.abs(x)).real
+        return np.max(np.abs(_horner(c, x)) / scale)
+
+    print(f"逐個 np.roots (估計): {t_np:.3f}s, 最大相對殘差 {relative_residual(coeffs[:m], ref.astype(complex)):.2e}")
+    print(f"批次閉式解 + Newton:  {t_batch:.3f}s, 最大相對殘差 {relative_residual(coeffs, roots):.2e}")
+
+
+if __name__ == "__main__":
+    roots, residuals = solve_cubic([1, 1, 1, 1, 0], [-6, 0, 0, -3, 1], [11, 0, 1, 3, -3], [-6, 0, 1, -1, 2])
+    for r, e in zip(roots, residuals):
+        print(np.round(r, 12), np.abs(e).max())
+    print()
+    benchmark()
@@ -0,0 +1,194 @@
+import time
+import warnings
+import numpy as np
+
+
+def _as_descending(coeffs, order):
+    """把係數整理成 (N, d+1) 的降冪 float/complex 陣列"""
+    coeffs = np.atleast_2d(np.asarray(coeffs))
+    if not np.iscomplexobj(coeffs):
+        coeffs = coeffs.astype(float)
+    if order == "ascending":
+        coeffs = coeffs[:, ::-1]
+    elif order != "descending":
+        raise ValueError(f"order 必須是 'ascending' 或 'descending'，收到 {order!r}")
+    if coeffs.shape[1] < 2:
+        raise ValueError("多項式至少要是一次")
+    zero_lead = np.flatnonzero(coeffs[:, 0] == 0)
+    if zero_lead.size:
+        raise ValueError(f"首項係數為 0，所有多項式必須同次數 (第 {zero_lead[:10].tolist()} 列)")
+    return coeffs
+
+
+def companion_roots(coeffs, order="descending"):
+    """
+    把 N 個同次數多項式的伴隨矩陣疊成 (N, d, d)，一次呼叫 np.linalg.eigvals 求所有根。
+    回傳 (N, d) 複數陣列。
+    """
+    coeffs = _as_descending(coeffs, order)
+    n, d = coeffs.shape[0], coeffs.shape[1] - 1
+    monic = coeffs[:, 1:] / coeffs[:, :1]
+    companion = np.zeros((n, d, d), dtype=monic.dtype)
+    companion[:, 0, :] = -monic
+    idx = np.arange(d - 1)
+    companion[:, idx + 1, idx] = 1
+    return np.linalg.eigvals(companion).astype(complex)
+
+
+def _initial_guess(coeffs):
+    """Aberth 初始值：以根的幾何平均大小為半徑、根的平均值為圓心的圓上等分點"""
+    n, d = coeffs.shape[0], coeffs.shape[1] - 1
+    center = -coeffs[:, 1] / (d * coeffs[:, 0])
+    radius = np.abs(coeffs[:, -1] / coeffs[:, 0]) ** (1 / d)
+    radius = np.where(radius > 0, radius, 1.0) + np.abs(center)
+    angles = 2 * np.pi * np.arange(d) / d + 0.4
+    return center[:, None] + radius[:, None] * np.exp(1j * angles)
+
+
+def _spread_duplicates(z, rel=1e-3):
+    """
+    把同一列中重合 (相對差 <= 1e-12) 的初始值往不同方向推開 rel * max(|z|, 1)。
+    Aberth 的修正量含 1 / (z_i - z_j)，重合的點永遠分不開。
+    """
+    scale = np.maximum(np.abs(z), 1.0)
+    close = np.abs(z[:, :, None] - z[:, None, :]) <= 1e-12 * np.maximum(scale[:, :, None], scale[:, None, :])
+    # 只看排在自己前面的點：每組重合的點保留第一個不動
+    dup = np.any(np.tril(close, k=-1), axis=2)
+    if not dup.any():
+        return z
+    d = z.shape[1]
+    direction = np.exp(1j * (2 * np.pi * np.arange(d) / d + 0.4))
+    return np.where(dup, z + rel * scale * direction, z)
+
+
+def aberth_roots(coeffs, order="descending", warm_start=None, tol=1e-14, maxiter=100, return_converged=False):
+    """
+    向量化 Aberth-Ehrlich 迭代，同時求 N 個同次數多項式的所有根，回傳 (N, d) 複數陣列。
+
+    warm_start 為前一次的根 (N, d)；係數只有小幅變動時通常幾次迭代就收斂，
+    比每次重新解特徵值快得多。warm_start 中重合的值會先被推開 (見 _spread_duplicates)。
+    已收斂的列不再參與後續迭代。
+    return_converged=True 時回傳 (roots, converged)，converged 為 (N,) 布林陣列，
+    呼叫端可以對未收斂的列改用 companion_roots；否則 maxiter 次內有列未收斂時發出 RuntimeWarning。
+    """
+    coeffs = _as_descending(coeffs, order).astype(complex)
+    n, d = coeffs.shape[0], coeffs.shape[1] - 1
+    dcoeffs = coeffs[:, :-1] * np.arange(d, 0, -1)
+    if warm_start is None:
+        z = _initial_guess(coeffs)
+    else:
+        z = _spread_duplicates(np.array(warm_start, dtype=complex).reshape(n, d))
+
+    active = np.arange(n)
+    eye = np.eye(d, dtype=bool)
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+        za, ca, da = z[active], coeffs[active], dcoeffs[active]
+        p = np.zeros_like(za)
+        for k in range(d + 1):
+            p = p * za + ca[:, k, None]
+        dp = np.zeros_like(za)
+        for k in range(d):
+            dp = dp * za + da[:, k, None]
+
+        diff = za[:, :, None] - za[:, None, :]
+        diff[:, eye] = np.inf
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w = p / dp
+            correction = w / (1 - w * (1 / diff).sum(axis=2))
+        correction = np.where(np.isfinite(correction), correction, 0)
+        # p(z) == 0 代表已經是根
+        correction = np.where(p == 0, 0, correction)
+        za = za - correction
+        z[active] = za
+
+        scale = np.maximum(np.abs(za), 1.0)
+        converged = np.all(np.abs(correction) <= tol * scale, axis=1)
+        # 兩個近似根重合時 1 / diff 為 inf、修正量被壓成 0 (重合在某個根上時 p = 0 也一樣)，
+        # 無法判斷其餘的根是否找齊，一律視為未收斂，交給呼叫端改用 companion_roots
+        stuck = np.any(diff == 0, axis=(1, 2))
+        converged &= ~stuck
+        active = active[~converged]
+
+    converged = np.ones(n, dtype=bool)
+    converged[active] = False
+    if return_converged:
+        return z, converged
+    if active.size:
+        warnings.warn(f"Aberth 迭代在 {maxiter} 次內有 {active.size} 列未收斂 (第 {active[:10].tolist()} 列)",
+                      RuntimeWarning, stacklevel=2)
+    return z
+
+
+def batch_roots(coeffs, order="descending", method="eig", warm_start=None):
+    """
+    N 個同次數多項式的根，coeffs 形狀 (N, d+1)，回傳 (N, d) 複數陣列。
+
+    order: "descending" (NumPy 的 c_n, ..., c_0) 或 "ascending" (4.py 的 c_0, ..., c_n)
+    method: "eig" 為疊起來的伴隨矩陣特徵值 (穩定)，"aberth" 為向量化 Aberth-Ehrlich 迭代。
+    給定 warm_start 時一律使用 Aberth 並以它為初始值；未收斂的列改以伴隨矩陣特徵值求解。
+    """
+    if warm_start is not None or method == "aberth":
+        roots, converged = aberth_roots(coeffs, order, warm_start=warm_start, return_converged=True)
+        if not converged.all():
+            failed = ~converged
+            roots[failed] = companion_roots(_as_descending(coeffs, order)[failed])
+        return roots
+    if method == "eig":
+        return companion_roots(coeffs, order)
+    raise ValueError(f"未知的 method: {method!r}")
+
+
+def benchmark(n=20_000, degree=6):
+    """比較逐個 np.roots、疊起來的特徵值、Aberth 冷啟動與熱啟動"""
+    rng = np.random.default_rng(0)
+    coeffs = rng.uniform(-10, 10, (n, degree + 1))
+    perturbed = coeffs * (1 + 1e-6 * rng.standard_normal(coeffs.shape))
+
+    t0 = time.perf_counter()
+    for row in coeffs:
+        np.roots(row)
+    print(f"逐個 np.roots:        {time.perf_counter() - t0:.3f}s")
+
+    t0 = time.perf_counter()
+    roots = companion_roots(coeffs)
+    print(f"疊起來的 eigvals:     {time.perf_counter() - t0:.3f}s")
+
+    t0 = time.perf_counter()
+    aberth = aberth_roots(coeffs)
+    print(f"Aberth (冷啟動):      {time.perf_counter() - t0:.3f}s")
+
+    t0 = time.perf_counter()
+    warm = aberth_roots(perturbed, warm_start=roots)
+    print(f"Aberth (熱啟動):      {time.perf_counter() - t0:.3f}s")
+
+    def max_residual(c, z):
+        p = np.zeros_like(z)
+        scale = np.zeros(z.shape)
+        for k in range(c.shape[1]):
+            p = p * z + c[:, k, None]
+            scale = scale * np.abs(z) + np.abs(c[:, k, None])
+        return np.max(np.abs(p) / scale)
+
+    print(f"最大相對殘差: eig {max_residual(coeffs, roots):.1e}, "
+          f"aberth {max_residual(coeffs, aberth):.1e}, 熱啟動 {max_residual(perturbed, warm):.1e}")
+
+
+def check_repeated_warm_start():
+    """warm_start 含重複值 (且恰好是根) 時，不能把未分開的點當成收斂的結果"""
+    coeffs = np.array([[1, -3, 3, -1], [1, 0, 0, -1.]])  # (x-1)^3 與 x^3 - 1
+    warm = np.ones((2, 3))
+    roots, converged = aberth_roots(coeffs, warm_start=warm, return_converged=True)
+    expected = companion_roots(coeffs)
+    fixed = batch_roots(coeffs, warm_start=warm)
+    # 三重根的數值誤差約 eps^(1/3)
+    ok = all(np.allclose(np.sort_complex(a), np.sort_complex(b), atol=1e-4) for a, b in zip(fixed, expected))
+    print(f"重複的 warm_start: converged = {converged.tolist()}，batch_roots 與特徵值一致: {ok}")
+    assert not converged[0] or np.allclose(np.sort_complex(roots[0]), np.sort_complex(expected[0]), atol=1e-4)
+    assert ok
+
+
+if __name__ == "__main__":
+    benchmark()
+    check_repeated_warm_start()
@@ -0,0 +1,263 @@
+import math
+import time
+import numpy as np
+
+# Gauss-Kronrod 7-15 點節點與權重 (取自 QUADPACK qk15)
+# _XGK[i] 為 [0, 1] 上的正節點，最後一個是中心點 0
+_XGK = np.array([
+    0.991455371120812639206854697526329,
+    0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926,
+    0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013,
+    0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245,
+    0.000000000000000000000000000000000,
+])
+_WGK = np.array([
+    0.022935322010529224963732008058970,
+    0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518,
+    0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550,
+    0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649,
+    0.209482141084727828012999174891714,
+])
+# 7 點 Gauss 權重，對應 _XGK[1], _XGK[3], _XGK[5], _XGK[7]
+_WG = np.array([
+    0.129484966168869693270611432679082,
+    0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975,
+    0.417959183673469387755102040816327,
+])
+
+# 展開成 [-1, 1] 上完整的 15 個節點 (由左至右)
+NODES = np.concatenate([-_XGK[:-1], _XGK[::-1]])
+KRONROD_WEIGHTS = np.concatenate([_WGK[:-1], _WGK[::-1]])
+GAUSS_WEIGHTS = np.zeros(15)
+GAUSS_WEIGHTS[[1, 3, 5]] = _WG[:3]
+GAUSS_WEIGHTS[7] = _WG[3]
+GAUSS_WEIGHTS[[9, 11, 13]] = _WG[2::-1]
+
+
+def _evaluate(f, x, vectorized):
+    """在節點陣列 x 上計算 f，vectorized=True 時一次把整個陣列交給 f"""
+    if vectorized:
+        y = np.asarray(f(x), dtype=float)
+        if y.shape != x.shape:
+            y = np.broadcast_to(y, x.shape)
+        return y
+    flat = x.ravel()
+    return np.array([f(float(t)) for t in flat], dtype=float).reshape(x.shape)
+
+
+def _kronrod_panels(f, lo, hi, vectorized):
+    """對每個子區間 [lo[i], hi[i]] 同時套用 K15 與 G7 規則，回傳 (kronrod, gauss)"""
+    center = 0.5 * (lo + hi)
+    half = 0.5 * (hi - lo)
+    x = center[:, None] + half[:, None] * NODES
+    y = _evaluate(f, x, vectorized)
+    return half * (y @ KRONROD_WEIGHTS), half * (y @ GAUSS_WEIGHTS)
+
+
+def quad(f, a, b, tol=1e-10, rtol=1e-10, vectorized=False, limit=2000):
+    """
+    自適應 Gauss-Kronrod (G7/K15) 數值積分。
+    回傳 (積分值, 誤差估計)。
+
+    每一輪把所有尚未收斂的子區間的節點一次算完，
+    誤差 |K15 - G7| 超過該區間分配到的容許誤差就對半切開。
+    vectorized=True 表示 f 可以直接接受 NumPy 陣列，整輪只呼叫 f 一次。
+    limit 為子區間總數上限，超過時停止細分並把剩餘誤差計入回傳的誤差估計。
+    """
+    if a == b:
+        return 0.0, 0.0
+    sign = 1.0
+    if a > b:
+        a, b = b, a
+        sign = -1.0
+
+    width = b - a
+    lo = np.array([a], dtype=float)
+    hi = np.array([b], dtype=float)
+    total = 0.0
+    total_err = 0.0
+    budget = None
+    n_intervals = 1
+
+    while lo.size:
+        center = 0.5 * (lo + hi)
+        half = 0.5 * (hi - lo)
+        kronrod, gauss = _kronrod_panels(f, lo, hi, vectorized)
+        err = np.abs(kronrod - gauss)
+
+        if budget is None:
+            # 以第一輪的估計值決定整體容許誤差
+            budget = max(tol, rtol * abs(kronrod.sum()))
+
+        # 各子區間依寬度比例分配容許誤差
+        done = err <= budget * (2 * half) / width
+        # 區間已無法再細分 (浮點數解析度) 也視為完成
+        done |= half <= 4 * np.finfo(float).eps * np.maximum(np.abs(center), 1.0)
+        if n_intervals + np.count_nonzero(~done) > limit:
+            done[:] = True
+
+        total += kronrod[done].sum()
+        total_err += err[done].sum()
+
+        lo, hi, center = lo[~done], hi[~done], center[~done]
+        n_intervals += lo.size
+        lo, hi = np.concatenate([lo, center]), np.concatenate([center, hi])
+
+    return sign * float(total), float(total_err)
+
+
+class CumulativeIntegral:
+    """
+    累積積分表 F(x) = ∫_a^x f(t) dt。
+
+    在步長 step 的等距格點上，每一格用 K15 規則積分後以 np.cumsum 累加，
+    查詢時利用格點上的 F 與 F' = f 做三次 Hermite 插值，每次查詢只需 O(1)。
+    查詢超出目前格點範圍時會自動往左/右延伸 (每次至少加倍)，不會重算既有的格子。
+    """
+    def __init__(self, f, a=0.0, step=1 / 256, n=256, vectorized=False):
+        self.f = f
+        self.a = float(a)
+        self.step = float(step)
+        self.vectorized = vectorized
+        self.error = 0.0
+        # _x[0] = a + _offset * step，_F 與 _y 分別為格點上的 F 與 f
+        self._offset = 0
+        self._x = self.a + self.step * np.arange(n + 1)
+        self._F = np.zeros(n + 1)
+        self._y = _evaluate(f, self._x, vectorized)
+        self._F[1:] = np.cumsum(self._panels(self._x[:-1], self._x[1:]))
+
+    def _panels(self, lo, hi):
+        kronrod, gauss = _kronrod_panels(self.f, lo, hi, self.vectorized)
+        self.error += float(np.abs(kronrod - gauss).sum())
+        return kronrod
+
+    @property
+    def lower(self):
+        return self._x[0]
+
+    @property
+    def upper(self):
+        return self._x[-1]
+
+    def _extend_right(self, x_max):
+        n_old = self._x.size - 1
+        n_new = max(int(math.ceil((x_max - self.upper) / self.step)), n_old)
+        start = self._offset + n_old
+        x = self.a + self.step * np.arange(start + 1, start + n_new + 1)
+        lo = np.concatenate([self._x[-1:], x[:-1]])
+        F = self._F[-1] + np.cumsum(self._panels(lo, x))
+        self._x = np.concatenate([self._x, x])
+        self._F = np.concatenate([self._F, F])
+        self._y = np.concatenate([self._y, _evaluate(self.f, x, self.vectorized)])
+
+    def _extend_left(self, x_min):
+        n_old = self._x.size - 1
+        n_new = max(int(math.ceil((self.lower - x_min) / self.step)), n_old)
+        self._offset -= n_new
+        x = self.a + self.step * np.arange(self._offset, self._offset + n_new)
+        hi = np.concatenate([x[1:], self._x[:1]])
+        # 由右往左累減：F(x_i) = F(x_{i+1}) - ∫_{x_i}^{x_{i+1}} f
+        F = self._F[0] - np.cumsum(self._panels(x, hi)[::-1])[::-1]
+        self._x = np.concatenate([x, self._x])
+        self._F = np.concatenate([F, self._F])
+        self._y = np.concatenate([_evaluate(self.f, x, self.vectorized), self._y])
+
+    def _locate(self, x):
+        x_min, x_max = np.min(x), np.max(x)
+        if x_min < self.lower:
+            self._extend_left(x_min)
+        if x_max > self.upper:
+            self._extend_right(x_max)
+        i = np.clip(np.floor((x - self.lower) / self.step).astype(np.intp), 0, self._x.size - 2)
+        t = (x - self._x[i]) / self.step
+        return i, t
+
+    def __call__(self, x):
+        """F(x)，x 可以是純量或陣列"""
+        x_arr = np.asarray(x, dtype=float)
+        i, t = self._locate(x_arr)
+        t2 = t * t
+        t3 = t2 * t
+        value = ((2 * t3 - 3 * t2 + 1) * self._F[i]
+                 + (t3 - 2 * t2 + t) * self.step * self._y[i]
+                 + (-2 * t3 + 3 * t2) * self._F[i + 1]
+                 + (t3 - t2) * self.step * self._y[i + 1])
+        return float(value) if value.ndim == 0 else value
+
+    def derivative(self, x):
+        """F'(x)，即 Hermite 插值式的導數 (近似 f(x))"""
+        x_arr = np.asarray(x, dtype=float)
+        i, t = self._locate(x_arr)
+        t2 = t * t
+        value = ((6 * t2 - 6 * t) * (self._F[i] - self._F[i + 1]) / self.step
+                 + (3 * t2 - 4 * t + 1) * self._y[i]
+                 + (3 * t2 - 2 * t) * self._y[i + 1])
+        return float(value) if value.ndim == 0 else value
+
+
+def fixed_step_integral(f, a, b, h=0.00001):
+    """1.py 原本的固定步長矩形法，保留作為效能比較的基準"""
+    x = a
+    area = 0
+    while x < b:
+        area += f(x) * h
+        x += h
+    return area
+
+
+class _CountingFunction:
+    """包裝被積函數並計算呼叫/取值次數"""
+    def __init__(self, f):
+        self.f = f
+        self.calls = 0
+        self.points = 0
+
+    def __call__(self, x):
+        self.calls += 1
+        self.points += np.size(x)
+        return self.f(x)
+
+
+def benchmark(f, a, b, exact=None):
+    """比較固定步長迴圈與自適應積分的取值次數、耗時與誤差"""
+    rows = []
+
+    g = _CountingFunction(f)
+    t0 = time.perf_counter()
+    value = fixed_step_integral(g, a, b)
+    rows.append(("fixed step h=1e-5", value, None, g.calls, g.points, time.perf_counter() - t0))
+
+    g = _CountingFunction(f)
+    t0 = time.perf_counter()
+    value, err = quad(g, a, b)
+    rows.append(("quad (scalar f)", value, err, g.calls, g.points, time.perf_counter() - t0))
+
+    g = _CountingFunction(f)
+    t0 = time.perf_counter()
+    value, err = quad(g, a, b, vectorized=True)
+    rows.append(("quad (vectorized f)", value, err, g.calls, g.points, time.perf_counter() - t0))
+
+    print(f"{'method':<22}{'value':>22}{'err est':>12}{'true err':>12}{'calls':>10}{'points':>10}{'time(s)':>10}")
+    for name, value, err, calls, points, elapsed in rows:
+        err_str = f"{err:.1e}" if err is not None else "-"
+        true_err = f"{abs(value - exact):.1e}" if exact is not None else "-"
+        print(f"{name:<22}{value:>22.15f}{err_str:>12}{true_err:>12}{calls:>10}{points:>10}{elapsed:>10.4f}")
+
+
+if __name__ == "__main__":
+    print("=== x^3 在 [0, 2] ===")
+    benchmark(lambda x: x**3, 0, 2, exact=4.0)
+
+    print("\n=== sin(x) 在 [0, pi] ===")
+    benchmark(np.sin, 0, math.pi, exact=2.0)
+
+    print("\n=== exp(-x^2) 在 [-3, 3] ===")
+    benchmark(lambda x: np.exp(-x**2), -3, 3, exact=math.sqrt(math.pi) * math.erf(3))